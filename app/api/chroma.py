@@ -1,17 +1,34 @@
 # app/api/chroma.py
 
-from fastapi import APIRouter, Body
-from app.services.chroma_service import search_similar_questions
-from app.models.search_model import ChromaRequest, ChromaResponse
+from fastapi import APIRouter, Body, HTTPException
+from typing import Dict, Optional
+from app.services.chroma_service import search_similar_questions, search_similar_questions_batch, search_flight
+from app.models.search_model import ChromaRequest, ChromaResponse, ChromaBatchRequest, ChromaBatchResponse
+from app.core.metrics import metrics
+from app.core.vector_utils import get_embedding_cache, get_retrieval_engine
 
 router = APIRouter()
 
+FILTER_ERROR_RESPONSE = {
+    422: {"description": "filters 값이 데이터셋의 어떤 기업명/경력/직무에도 대응되지 않음 (detail.unresolvedFilters)"}
+}
+
+def _check_filters(filters: Optional[Dict[str, str]]):
+    # 대응되는 값이 없는 필터로 검색하면 항상 빈 결과이므로, 정상 응답 대신 어떤 필터가 문제인지 알려줌
+    unresolved = get_retrieval_engine().unresolved_filters(filters)
+    if unresolved:
+        raise HTTPException(
+            status_code=422,
+            detail={"message": "필터 값에 해당하는 질문이 없습니다.", "unresolvedFilters": unresolved},
+        )
+
 @router.post(
     "/search",
     summary="유사 질문 검색",
-    description="질문을 입력하면 Chroma DB를 통해 유사한 질문 3개를 검색하여 반환합니다.",
+    description="질문을 입력하면 Chroma DB를 통해 유사한 질문 3개를 검색하여 반환합니다. filters로 기업명, 경력, 직무를 지정하면 해당 질문 중에서만 검색하고, diversify를 true로 주면 서로 비슷한 질문을 걸러냅니다.",
     response_model=ChromaResponse,
     responses={
+        **FILTER_ERROR_RESPONSE,
         200: {
             "description": "유사 질문 목록 반환",
             "content": {
@@ -38,7 +55,50 @@ router = APIRouter()
     }
 )
 def search_chroma(req: ChromaRequest = Body(..., example={
-    "query": "갈등을 해결한 경험이 있나요?"
+    "query": "갈등을 해결한 경험이 있나요?",
+    "filters": {"company": "현대모비스", "career": "신입"}
 })):
-    result = search_similar_questions(req.query)
-    return ChromaResponse(results=result)
\ No newline at end of file
+    filters = req.filters.as_dict() if req.filters else None
+    _check_filters(filters)
+    result = search_similar_questions(req.query, k=req.k, filters=filters, diversify=req.diversify)
+    return ChromaResponse(results=result)
+
+@router.post(
+    "/search-batch",
+    summary="유사 질문 일괄 검색",
+    description="여러 질문을 한 번에 임베딩하여 각 질문마다 유사한 질문 k개를 입력 순서대로 반환합니다. "
+                "k는 SEARCH_MAX_K, 질문 수는 SEARCH_MAX_BATCH_QUERIES까지 받으며 넘으면 422를 반환합니다.",
+    response_model=ChromaBatchResponse,
+    responses=FILTER_ERROR_RESPONSE,
+)
+def search_chroma_batch(req: ChromaBatchRequest = Body(..., example={
+    "queries": ["카카오", "백엔드 개발자"],
+    "k": 3
+})):
+    filters = req.filters.as_dict() if req.filters else None
+    _check_filters(filters)
+    results = search_similar_questions_batch(req.queries, k=req.k, filters=[filters] * len(req.queries),
+                                             diversify=req.diversify)
+    return ChromaBatchResponse(results=results)
+
+@router.get(
+    "/status",
+    summary="검색 엔진 상태",
+    description="공유 검색 엔진의 로드 여부, 임베딩 워커 풀 상태와 콜드/웜 지연 시간 지표를 반환합니다.",
+)
+def get_engine_status():
+    engine = get_retrieval_engine()
+    pool = engine.pool
+    timings = [
+        t for t in metrics.snapshot()["timings"]
+        if t["name"].startswith("retrieval_")
+    ]
+    return {
+        "started": engine.started,
+        "model": engine.model_name,
+        "backend": engine.backend_kind,
+        "timings": timings,
+        "singleflight": search_flight.stats(),
+        "embedding_cache": get_embedding_cache().stats(),
+        "embedding_executor": pool.stats() if pool is not None else {"kind": engine.executor},
+    }
@@ -0,0 +1,28 @@
+# app/api/health.py
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from app.core.jobs import job_manager
+from app.core.startup import startup_state
+
+router = APIRouter()
+
+@router.get(
+    "/healthz",
+    summary="liveness 확인",
+    description="프로세스가 요청을 받을 수 있으면 항상 200을 반환합니다. 검색 엔진 워밍업 여부와 무관합니다.",
+)
+def get_liveness():
+    return {"status": "ok"}
+
+@router.get(
+    "/readyz",
+    summary="readiness 확인",
+    description="임베딩 모델과 벡터 인덱스 로드가 끝나 모든 API를 바로 처리할 수 있으면 200, 워밍업 중이거나 실패했으면 503을 반환합니다. "
+                "lazy 모드는 시작 과정이 끝나면 200이며, 첫 검색 전까지는 본문의 engine이 not_loaded입니다.",
+    responses={503: {"description": "워밍업 중(warming_up) 또는 워밍업 실패(failed)"}},
+)
+def get_readiness():
+    status = startup_state.status()
+    ready = startup_state.ready and job_manager.started
+    return JSONResponse(status, status_code=200 if ready else 503)
@@ -1,37 +1,91 @@
 # app/api/interview/route.py
 
-from fastapi import APIRouter, Body
-from pydantic import BaseModel
-from typing import List, Dict
-from app.services.chroma_service import search_similar_questions
-from app.services.gpt_service import get_chat_response
+import time
+from fastapi import APIRouter, Body, Header
+from fastapi.responses import StreamingResponse
+from typing import Awaitable, Callable, List, Dict, Optional
+from app.models.interview_model import (AnswerAnalysisRequest, FollowUpRequest, InterviewQasRequest, ResumeBatchRequest,
+                                        ResumeRequest)
+from app.services.gpt_service import get_chat_response, stream_chat_response
+from app.services.interview_service import analyze_resume_item, analyze_resume_items, generate_qas
 from app.services.perplexity_service import search_perplexity_summary
+from app.core.config import settings
+from app.core.deadline import Deadline
+from app.core.metrics import metrics
+from app.core.response_cache import bypass_requested
+from app.core.sse import LineBuffer, sse_event
 from app.prompts.resume_analyze_prompts import generate_resume_analysis_prompt
 from app.prompts.analyze_answer_prompts import analyze_answer_prompt
 from app.prompts.follow_up_prompts import generate_follow_up_prompt
-from app.prompts.interview_qas_prompts import generate_interview_qas_prompt
 
 router = APIRouter()
 
-class ResumeRequest(BaseModel):
-    question: str
-    resume: str
-    company: str
-    position: str
+def _deadline(value: Optional[str]) -> Deadline:
+    """
+    요청 마감 시간입니다. X-Request-Timeout 헤더(초)로 REQUEST_DEADLINE_SECONDS보다 짧게 지정할 수 있습니다.
+    """
+    seconds = settings.REQUEST_DEADLINE_SECONDS
+    try:
+        if value is not None and float(value) > 0:
+            seconds = min(seconds, float(value))
+    except ValueError:
+        pass
+    return Deadline(seconds)
 
-class AnswerAnalysisRequest(BaseModel):
-    question: str
-    answer: str
-    resume: str
+SSE_RESPONSES = {
+    200: {
+        "description": "토큰(token), 완성된 줄(line), 최종 결과(done) 이벤트 스트림. GPT 호출이 실패하거나 중간에 끊기면 done 대신 error 이벤트로 끝납니다.",
+        "content": {
+            "text/event-stream": {
+                "example": 'event: line\ndata: {"line": "**질문 충실도**: 질문의 핵심 의도를 잘 파악했어요."}\n\n'
+            }
+        }
+    }
+}
+
+def _stream_gpt(endpoint: str, build_prompt: Callable[[], Awaitable[str]],
+                build_result: Callable[[str], dict], failure: dict, deadline: Deadline) -> StreamingResponse:
+    """
+    GPT 응답을 SSE로 전달합니다.
+    token 이벤트로 토큰을 그대로 보내고, 줄이 완성될 때마다 line 이벤트를 보내며,
+    마지막에 일반 엔드포인트와 같은 형태의 결과를 done 이벤트로 보냅니다.
+    GPT 스트림이 중간에 끊기거나 deadline이 지나면 받은 부분까지로 결과를 만들지 않고 error 이벤트로 끝냅니다.
+    """
+    async def events():
+        start = time.perf_counter()
+        prompt = await build_prompt()
 
-class FollowUpRequest(BaseModel):
-    question: str
-    answer: str
+        buffer = LineBuffer()
+        chunks = []
+        failed = False
+        try:
+            async for delta in stream_chat_response(prompt, model="gpt-4o", deadline=deadline):
+                if not chunks:
+                    metrics.observe("sse_first_token_seconds", time.perf_counter() - start, {"endpoint": endpoint})
+                chunks.append(delta)
+                yield sse_event({"text": delta}, event="token")
 
-class InterviewQasRequest(BaseModel):
-    company: str
-    position: str
-    resumeContent: str
+                for line in buffer.feed(delta):
+                    if line.strip():
+                        yield sse_event({"line": line.strip()}, event="line")
+        except Exception:
+            failed = True
+            metrics.inc("sse_stream_errors_total", labels={"endpoint": endpoint})
+
+        for line in buffer.flush():
+            if line.strip():
+                yield sse_event({"line": line.strip()}, event="line")
+
+        if failed or not chunks:
+            yield sse_event(failure, event="error")
+            return
+        yield sse_event(build_result("".join(chunks)), event="done")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @router.post(
     "/analyze-resume",
@@ -62,28 +116,91 @@ async def analyze_resume(req: ResumeRequest = Body(..., example={
     "resume": "저는 카카오의 사용자 중심 철학에 깊이 공감하여 지원하게 되었습니다...",
     "company": "카카오",
     "position": "백엔드 개발자"
-})):
-    # 1. 기업 정보 요약 검색
-    company_summary = search_perplexity_summary(req.company)
-
-    # 2. 프롬프트 생성
-    prompt = generate_resume_analysis_prompt(
+}), x_cache_bypass: Optional[str] = Header(None), x_request_timeout: Optional[str] = Header(None)):
+    return await analyze_resume_item(
         question=req.question,
         resume=req.resume,
         company=req.company,
         position=req.position,
-        company_summary=company_summary
+        bypass_cache=bypass_requested(x_cache_bypass),
+        deadline=_deadline(x_request_timeout)
     )
 
-    # 3. GPT 응답
-    response = get_chat_response(prompt, model="gpt-4o", mode="text")
+@router.post(
+    "/analyze-resume-batch",
+    summary="자기소개서 문항 일괄 분석",
+    description="같은 기업/직무에 지원하는 자기소개서 문항 여러 개를 한 번에 분석합니다. 기업 정보 요약은 한 번만 검색하고, 문항별 분석은 동시에 실행하여 입력 순서대로 반환합니다.",
+    responses={
+        200: {
+            "description": "문항별 피드백 목록 반환 (실패한 문항은 실패 문구 반환)",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "results": [
+                            {
+                                "question": "지원 동기와 입사 후 포부를 작성해주세요.",
+                                "feedback": [
+                                    "**질문 충실도**: 질문의 핵심 의도에 맞춰 구체적인 동기를 잘 설명해주셨어요.",
+                                    "**종합 피드백**: 입사 후 포부를 좀 더 분명히 드러내면 좋을 것 같아요."
+                                ]
+                            },
+                            {
+                                "question": "협업 경험을 작성해주세요.",
+                                "feedback": ["GPT 분석에 실패했습니다."]
+                            }
+                        ]
+                    }
+                }
+            }
+        }
+    }
+)
+async def analyze_resume_batch(req: ResumeBatchRequest = Body(..., example={
+    "company": "카카오",
+    "position": "백엔드 개발자",
+    "items": [
+        {"question": "지원 동기와 입사 후 포부를 작성해주세요.", "resume": "저는 카카오의 사용자 중심 철학에 깊이 공감하여..."},
+        {"question": "협업 경험을 작성해주세요.", "resume": "팀 프로젝트에서 API 설계를 맡아..."}
+    ]
+}), x_cache_bypass: Optional[str] = Header(None), x_request_timeout: Optional[str] = Header(None)):
+    results = await analyze_resume_items(
+        [item.model_dump() for item in req.items],
+        company=req.company,
+        position=req.position,
+        bypass_cache=bypass_requested(x_cache_bypass),
+        deadline=_deadline(x_request_timeout)
+    )
+    return {"results": results}
 
-    if not response or not isinstance(response, str):
-        return {"feedback": ["GPT 분석에 실패했습니다."]}
+@router.post(
+    "/analyze-resume/stream",
+    summary="자기소개서 분석 (스트리밍)",
+    description="/analyze-resume와 같은 분석을 SSE로 스트리밍합니다. 각 피드백 항목은 줄이 완성되는 즉시 line 이벤트로 전달됩니다.",
+    response_class=StreamingResponse,
+    responses=SSE_RESPONSES
+)
+async def analyze_resume_stream(req: ResumeRequest = Body(..., example={
+    "question": "지원 동기와 입사 후 포부를 작성해주세요.",
+    "resume": "저는 카카오의 사용자 중심 철학에 깊이 공감하여 지원하게 되었습니다...",
+    "company": "카카오",
+    "position": "백엔드 개발자"
+}), x_request_timeout: Optional[str] = Header(None)):
+    deadline = _deadline(x_request_timeout)
 
-    # 4. 줄 단위 피드백 파싱
-    feedback = [line.strip() for line in response.split("\n") if line.strip()]
-    return {"feedback": feedback}
+    async def build_prompt():
+        company_summary = await search_perplexity_summary(req.company, deadline=deadline)
+        return generate_resume_analysis_prompt(
+            question=req.question,
+            resume=req.resume,
+            company=req.company,
+            position=req.position,
+            company_summary=company_summary
+        )
+
+    def build_result(response: str):
+        return {"feedback": [line.strip() for line in response.split("\n") if line.strip()]}
+
+    return _stream_gpt("analyze-resume", build_prompt, build_result, {"feedback": ["GPT 분석에 실패했습니다."]}, deadline)
 
 @router.post(
     "/analyze-answer",
@@ -107,15 +224,35 @@ async def analyze_answer(req: AnswerAnalysisRequest = Body(..., example={
     "question": "어려운 상황에서 갈등을 해결한 경험이 있나요?",
     "answer": "저는 동아리 프로젝트에서 일정이 지연된 팀원과 갈등을 겪은 적 있습니다...",
     "resume": "저는 다양한 협업 프로젝트를 통해 갈등 조정 능력을 키웠습니다..."
-})):
+}), x_cache_bypass: Optional[str] = Header(None), x_request_timeout: Optional[str] = Header(None)):
     prompt = analyze_answer_prompt(req.question, req.answer, req.resume)
-    response = get_chat_response(prompt, model="gpt-4o", mode="text")
+    response = await get_chat_response(prompt, model="gpt-4o", mode="text",
+                                       endpoint="analyze-answer", bypass_cache=bypass_requested(x_cache_bypass),
+                                       deadline=_deadline(x_request_timeout))
 
     if not response or not isinstance(response, str):
         return {"message": "답변 분석 실패"}
 
     return {"analysis": response}
 
+@router.post(
+    "/analyze-answer/stream",
+    summary="면접 답변 분석 (스트리밍)",
+    description="/analyze-answer와 같은 분석을 SSE로 스트리밍합니다.",
+    response_class=StreamingResponse,
+    responses=SSE_RESPONSES
+)
+async def analyze_answer_stream(req: AnswerAnalysisRequest = Body(..., example={
+    "question": "어려운 상황에서 갈등을 해결한 경험이 있나요?",
+    "answer": "저는 동아리 프로젝트에서 일정이 지연된 팀원과 갈등을 겪은 적 있습니다...",
+    "resume": "저는 다양한 협업 프로젝트를 통해 갈등 조정 능력을 키웠습니다..."
+}), x_request_timeout: Optional[str] = Header(None)):
+    async def build_prompt():
+        return analyze_answer_prompt(req.question, req.answer, req.resume)
+
+    return _stream_gpt("analyze-answer", build_prompt, lambda response: {"analysis": response}, {"message": "답변 분석 실패"},
+                       _deadline(x_request_timeout))
+
 @router.post(
     "/follow-up",
     summary="추가 면접 질문 생성",
@@ -137,9 +274,11 @@ async def analyze_answer(req: AnswerAnalysisRequest = Body(..., example={
 async def generate_follow_up(req: FollowUpRequest = Body(..., example={
     "question": "갈등을 해결한 경험이 있나요?",
     "answer": "네, 저는 프로젝트에서..."
-})):
+}), x_cache_bypass: Optional[str] = Header(None), x_request_timeout: Optional[str] = Header(None)):
     prompt = generate_follow_up_prompt(req.question, req.answer)
-    response = get_chat_response(prompt, model="gpt-4o", mode="text")
+    response = await get_chat_response(prompt, model="gpt-4o", mode="text",
+                                       endpoint="follow-up", bypass_cache=bypass_requested(x_cache_bypass),
+                                       deadline=_deadline(x_request_timeout))
 
     if not response or not isinstance(response, str):
         return {"message": "추가 질문 생성 실패"}
@@ -147,6 +286,26 @@ async def generate_follow_up(req: FollowUpRequest = Body(..., example={
     follow_ups = [line for line in response.split("\n") if line.strip()]
     return {"followUps": follow_ups}
 
+@router.post(
+    "/follow-up/stream",
+    summary="추가 면접 질문 생성 (스트리밍)",
+    description="/follow-up과 같은 추가 질문 생성을 SSE로 스트리밍합니다.",
+    response_class=StreamingResponse,
+    responses=SSE_RESPONSES
+)
+async def generate_follow_up_stream(req: FollowUpRequest = Body(..., example={
+    "question": "갈등을 해결한 경험이 있나요?",
+    "answer": "네, 저는 프로젝트에서..."
+}), x_request_timeout: Optional[str] = Header(None)):
+    async def build_prompt():
+        return generate_follow_up_prompt(req.question, req.answer)
+
+    def build_result(response: str):
+        return {"followUps": [line for line in response.split("\n") if line.strip()]}
+
+    return _stream_gpt("follow-up", build_prompt, build_result, {"message": "추가 질문 생성 실패"},
+                       _deadline(x_request_timeout))
+
 @router.post(
     "/generate-qas",
     summary="면접 질문 생성",
@@ -172,28 +331,11 @@ async def generate_interview_questions(req: InterviewQasRequest = Body(..., exam
     "company": "네이버",
     "position": "백엔드 개발자",
     "resumeContent": "저는 대규모 트래픽 처리를 위한 백엔드 시스템 설계를 경험했습니다..."
-})):
-    # 1. 기업 + 직무로 Perplexity 요약 검색
-    search_query = f"{req.company} {req.position}"
-    pplx_summary = search_perplexity_summary(search_query)
-
-    # 2. Chroma에서 기업, 직무 관련 질문 가져오기
-    company_questions = search_similar_questions(req.company)
-    position_questions = search_similar_questions(req.position)
-
-    company_q_text = "\n".join([q["content"] for q in company_questions])
-    position_q_text = "\n".join([q["content"] for q in position_questions])
-
-    chroma_examples = f"[기업: {req.company}] 관련 질문들:\n{company_q_text}\n\n[직무: {req.position}] 관련 질문들:\n{position_q_text}"
-
-    # 3. 요약 결과와 자기소개서 내용을 합쳐 프롬프트 생성
-    prompt = generate_interview_qas_prompt(pplx_summary, req.resumeContent, chroma_examples)
-    
-    # 4. GPT로 질문 생성
-    response = get_chat_response(prompt, model="gpt-4o", mode="text")
-
-    if not response or not isinstance(response, str):
-        return {"message": "질문 생성 실패"}
-
-    questions = [line for line in response.split("\n") if line.strip()]
-    return {"questions": questions}
+}), x_cache_bypass: Optional[str] = Header(None), x_request_timeout: Optional[str] = Header(None)):
+    return await generate_qas(
+        company=req.company,
+        position=req.position,
+        resume_content=req.resumeContent,
+        bypass_cache=bypass_requested(x_cache_bypass),
+        deadline=_deadline(x_request_timeout)
+    )
@@ -0,0 +1,101 @@
+# app/api/jobs.py
+
+from fastapi import APIRouter, Body, Header, HTTPException, Query
+from fastapi.responses import JSONResponse
+from typing import Optional
+from app.core.config import settings
+from app.core.jobs import QueueFullError, job_manager
+from app.core.response_cache import bypass_requested
+from app.models.interview_model import InterviewQasRequest, ResumeRequest
+from app.models.job_model import JobStatusResponse, JobSubmitResponse
+from app.services.interview_service import analyze_resume_item, generate_qas
+
+router = APIRouter()
+
+JOB_SUBMIT_RESPONSES = {
+    202: {"description": "작업 접수 완료. jobId로 결과를 조회합니다."},
+    429: {"description": "대기열이 가득 참. Retry-After 헤더의 시간(초) 후 다시 요청합니다."},
+}
+
+async def _submit(kind: str, func, **kwargs) -> JSONResponse:
+    try:
+        job = await job_manager.submit(kind, func, **kwargs)
+    except QueueFullError as e:
+        return JSONResponse(
+            status_code=429,
+            content={"detail": str(e)},
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    return JSONResponse(
+        status_code=202,
+        content=JobSubmitResponse(jobId=job.id, status=job.status).model_dump(),
+        headers={"Location": f"/jobs/{job.id}"},
+    )
+
+@router.post(
+    "/analyze-resume",
+    summary="자기소개서 분석 작업 등록",
+    description="/interview/analyze-resume와 같은 분석을 비동기 작업으로 등록하고 jobId를 바로 반환합니다.",
+    status_code=202,
+    response_model=JobSubmitResponse,
+    responses=JOB_SUBMIT_RESPONSES
+)
+async def submit_analyze_resume(req: ResumeRequest = Body(..., example={
+    "question": "지원 동기를 작성해주세요.",
+    "resume": "저는 사용자 중심의 서비스를 만들고 싶어 카카오에 지원하게 되었습니다...",
+    "company": "카카오",
+    "position": "백엔드 개발자"
+}), x_cache_bypass: Optional[str] = Header(None)):
+    return await _submit(
+        "analyze-resume",
+        analyze_resume_item,
+        question=req.question,
+        resume=req.resume,
+        company=req.company,
+        position=req.position,
+        bypass_cache=bypass_requested(x_cache_bypass)
+    )
+
+@router.post(
+    "/generate-qas",
+    summary="예상 면접 질문 생성 작업 등록",
+    description="/interview/generate-qas와 같은 질문 생성을 비동기 작업으로 등록하고 jobId를 바로 반환합니다.",
+    status_code=202,
+    response_model=JobSubmitResponse,
+    responses=JOB_SUBMIT_RESPONSES
+)
+async def submit_generate_qas(req: InterviewQasRequest = Body(..., example={
+    "company": "카카오",
+    "position": "백엔드 개발자",
+    "resumeContent": "저는 대규모 트래픽 처리를 위한 백엔드 시스템 설계를 경험했습니다..."
+}), x_cache_bypass: Optional[str] = Header(None)):
+    return await _submit(
+        "generate-qas",
+        generate_qas,
+        company=req.company,
+        position=req.position,
+        resume_content=req.resumeContent,
+        bypass_cache=bypass_requested(x_cache_bypass)
+    )
+
+@router.get(
+    "/status",
+    summary="작업 대기열 상태",
+    description="이 uvicorn 워커의 작업 워커 수, 대기열 길이, 상태별 작업 수를 반환합니다."
+)
+async def get_jobs_status():
+    return job_manager.stats()
+
+@router.get(
+    "/{job_id}",
+    summary="작업 결과 조회",
+    description="작업 상태(queued, running, done, failed)와 결과를 반환합니다. wait를 주면 작업이 끝날 때까지 최대 wait초 기다린 뒤 응답합니다(롱 폴링).",
+    response_model=JobStatusResponse,
+    responses={404: {"description": "없는 작업이거나 보관 시간이 지나 삭제된 작업"}}
+)
+async def get_job(job_id: str, wait: float = Query(0, ge=0, description="최대 대기 시간(초)")):
+    # 다른 uvicorn 워커가 접수한 작업은 작업 저장소(JOB_STORE)에서 조회
+    job = await job_manager.lookup(job_id, min(wait, settings.JOB_MAX_WAIT_SECONDS))
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return job
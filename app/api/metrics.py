@@ -0,0 +1,16 @@
+# app/api/metrics.py
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.core.metrics import metrics
+
+router = APIRouter()
+
+@router.get(
+    "",
+    summary="Prometheus 지표",
+    description="카운터, 게이지, 단계별 지연 시간 히스토그램(span_seconds, http_request_seconds 등), 업스트림 토큰 사용량, 캐시 적중률, 이벤트 루프 지연을 Prometheus 텍스트 형식으로 반환합니다.",
+    response_class=PlainTextResponse,
+)
+def get_metrics():
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -30,8 +30,8 @@ class PerplexitySummaryResponse(BaseModel):
         }
     }
 )
-def get_perplexity_summary(req: PerplexitySummaryRequest = Body(..., example={
+async def get_perplexity_summary(req: PerplexitySummaryRequest = Body(..., example={
     "query": "네이버 백엔드 개발자"
 })):
-    summary = search_perplexity_summary(req.query)
+    summary = await search_perplexity_summary(req.query)
     return PerplexitySummaryResponse(summary=summary)
@@ -0,0 +1,156 @@
+# app/core/cache.py
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+from app.core.config import settings
+from app.core.metrics import metrics
+
+class TTLCache:
+    """
+    TTL 만료와 LRU 크기 제한을 함께 적용하는 스레드 안전 캐시입니다.
+    persist_path를 지정하면 JSON 파일로 저장해 재시작 후에도 유지됩니다.
+    파일 저장은 변경 후 save_delay초 동안 모아 백그라운드 스레드에서 한 번에 하며, 종료 시 close()로 남은 변경을 저장합니다.
+    다른 캐시의 저장소로 쓸 때처럼 지표를 바깥에서 따로 남기면 record_metrics=False로 cache_* 지표를 끕니다.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float, persist_path: Optional[str] = None,
+                 save_delay: float = settings.CACHE_SAVE_DELAY_SECONDS, record_metrics: bool = True):
+        self.name = name
+        self.record_metrics = record_metrics
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.persist_path = persist_path
+        self.save_delay = save_delay
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # 파일 쓰기 순서를 지키기 위한 잠금 (_lock은 스냅샷을 뜨는 동안만 잡음)
+        self._save_lock = threading.Lock()
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._dirty = False
+        self._timer: Optional[threading.Timer] = None
+        if persist_path:
+            self._load()
+            atexit.register(self.close)
+
+    def get(self, key: str) -> Optional[Any]:
+        labels = {"cache": self.name}
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] <= time.time():
+                del self._data[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                if self.record_metrics:
+                    metrics.inc("cache_misses_total", labels=labels)
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            if self.record_metrics:
+                metrics.inc("cache_hits_total", labels=labels)
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """
+        ttl을 주면 이 항목만 기본 ttl 대신 그 시간(초) 뒤에 만료됩니다.
+        """
+        labels = {"cache": self.name}
+        with self._lock:
+            self._data[key] = (time.time() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                if self.record_metrics:
+                    metrics.inc("cache_evictions_total", labels=labels)
+            if self.record_metrics:
+                metrics.set_gauge("cache_entries", len(self._data), labels)
+            if self.persist_path:
+                self._schedule_save()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+            if self.persist_path:
+                self._schedule_save()
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            if self.persist_path:
+                self._schedule_save()
+
+    def flush(self):
+        """
+        저장 대기 중인 변경이 있으면 바로 파일에 씁니다.
+        """
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                self._dirty = False
+                self._timer = None
+                items = [[k, exp, v] for k, (exp, v) in self._data.items()]
+            try:
+                self._save(items)
+            except OSError as e:
+                print(f"⚠️ {self.name} 캐시 파일을 저장하지 못했습니다: {e}")
+
+    def close(self):
+        with self._lock:
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        self.flush()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def _load(self):
+        if not os.path.exists(self.persist_path):
+            return
+        try:
+            with open(self.persist_path, encoding="utf-8") as f:
+                items = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ {self.name} 캐시 파일을 읽지 못했습니다: {e}")
+            return
+
+        now = time.time()
+        for key, expires_at, value in items[-self.maxsize:]:
+            if expires_at > now:
+                self._data[key] = (expires_at, value)
+
+    def _schedule_save(self):
+        # _lock을 잡은 상태에서 호출. 이미 저장이 예약되어 있으면 그때 함께 저장됨
+        self._dirty = True
+        if self._timer is None:
+            self._timer = threading.Timer(self.save_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _save(self, items: list):
+        # 임시 파일에 쓴 뒤 교체하여 쓰기 도중 종료되어도 파일이 깨지지 않도록 함
+        directory = os.path.dirname(self.persist_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.persist_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(items, f, ensure_ascii=False)
+        os.replace(tmp_path, self.persist_path)
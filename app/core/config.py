@@ -8,6 +8,130 @@ load_dotenv()
 class Settings:
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     PERPLEXITY_API_KEY = os.getenv("PERPLEXITY_API_KEY")
-    # 추가 가능: CHROMA_DB_PATH 등
 
-settings = Settings()
\ No newline at end of file
+    # 벡터 검색
+    VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "chroma")  # chroma | numpy
+    CHROMA_DB_PATH = os.getenv("CHROMA_DB_PATH", "./db")
+    NUMPY_INDEX_DIR = os.getenv("NUMPY_INDEX_DIR", "./db_numpy")
+    # 검색 방식 (vector | hybrid) - hybrid는 문자 n-gram BM25 순위를 벡터 순위와 RRF로 합침
+    RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "hybrid")
+    # 재순위화(RRF, MMR)를 위해 k의 몇 배까지 후보를 가져올지, RRF 상수, MMR 관련도 가중치
+    RETRIEVAL_FETCH_MULTIPLIER = int(os.getenv("RETRIEVAL_FETCH_MULTIPLIER", "4"))
+    RRF_K = int(os.getenv("RRF_K", "60"))
+    MMR_LAMBDA = float(os.getenv("MMR_LAMBDA", "0.7"))
+    # /interview/generate-qas 프롬프트에 넣는 질문 예시를 MMR로 서로 겹치지 않게 고를지 여부
+    QAS_EXAMPLES_MMR = os.getenv("QAS_EXAMPLES_MMR", "true").lower() == "true"
+    # /chroma/search 요청 한도 (검색어당 최대 결과 수, /chroma/search-batch 한 번에 보낼 수 있는 검색어 수)
+    SEARCH_MAX_K = int(os.getenv("SEARCH_MAX_K", "20"))
+    SEARCH_MAX_BATCH_QUERIES = int(os.getenv("SEARCH_MAX_BATCH_QUERIES", "32"))
+    # 임베딩 캐시 (메모리 LRU 크기, SQLite 파일 경로 - 비우면 디스크 캐시 사용 안 함)
+    EMBED_CACHE_MEMORY_SIZE = int(os.getenv("EMBED_CACHE_MEMORY_SIZE", "4096"))
+    EMBED_CACHE_PATH = os.getenv("EMBED_CACHE_PATH", "./db_cache/embeddings.sqlite")
+    # ingest로 교체된 NumPy 스냅샷을 확인하는 주기(초)
+    INDEX_RELOAD_INTERVAL_SECONDS = float(os.getenv("INDEX_RELOAD_INTERVAL_SECONDS", "30"))
+    EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "paraphrase-multilingual-MiniLM-L12-v2")
+    # 임베딩 백엔드 (torch | onnx | hash) - onnx는 embedding_backends export로 만든 모델, hash는 벤치마크용
+    EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+    ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", "./models/onnx-minilm")
+    ONNX_QUANTIZED = os.getenv("ONNX_QUANTIZED", "true").lower() == "true"
+    ONNX_INTRA_OP_THREADS = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))
+    # 동시에 들어온 단건 검색어를 모으는 시간(ms)과 최대 배치 크기 (0이면 모으지 않음)
+    EMBED_BATCH_WINDOW_MS = float(os.getenv("EMBED_BATCH_WINDOW_MS", "5"))
+    EMBED_MAX_BATCH = int(os.getenv("EMBED_MAX_BATCH", "32"))
+    # ingest 시 중복 질문 제거 여부, 같은 질문으로 볼 임베딩 코사인 유사도(1이면 완전 중복만 제거), 유사도 계산 블록 크기(행)
+    DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "true").lower() == "true"
+    DEDUP_SIMILARITY_THRESHOLD = float(os.getenv("DEDUP_SIMILARITY_THRESHOLD", "0.95"))
+    DEDUP_BLOCK_SIZE = int(os.getenv("DEDUP_BLOCK_SIZE", "1024"))
+    # 검색 임베딩 실행기 (thread | process | inline) - thread/process는 전용 워커 풀에서 encode
+    EMBED_EXECUTOR = os.getenv("EMBED_EXECUTOR", "thread")
+    # 임베딩 워커 수와 워커당 연산 스레드 수 (0이면 코어 수에 맞춰 자동)
+    EMBED_WORKERS = int(os.getenv("EMBED_WORKERS", "0"))
+    EMBED_THREADS_PER_WORKER = int(os.getenv("EMBED_THREADS_PER_WORKER", "0"))
+    # 워커 풀 대기열 크기(chunk 수)와 자리가 날 때까지 기다리는 최대 시간(초)
+    EMBED_QUEUE_SIZE = int(os.getenv("EMBED_QUEUE_SIZE", "64"))
+    EMBED_QUEUE_TIMEOUT_SECONDS = float(os.getenv("EMBED_QUEUE_TIMEOUT_SECONDS", "10"))
+
+    # 업스트림 HTTP 클라이언트 (로컬 스텁 서버로 바꿔 테스트 가능)
+    OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+    PERPLEXITY_BASE_URL = os.getenv("PERPLEXITY_BASE_URL", "https://api.perplexity.ai")
+    OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "16"))
+    PERPLEXITY_MAX_CONCURRENCY = int(os.getenv("PERPLEXITY_MAX_CONCURRENCY", "8"))
+    UPSTREAM_MAX_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "32"))
+    UPSTREAM_TIMEOUT_SECONDS = float(os.getenv("UPSTREAM_TIMEOUT_SECONDS", "60"))
+    UPSTREAM_CONNECT_TIMEOUT_SECONDS = float(os.getenv("UPSTREAM_CONNECT_TIMEOUT_SECONDS", "5"))
+    # 호스트별 분당 요청 수 / 분당 토큰 수 제한 (0이면 제한 없음)
+    OPENAI_RPM = float(os.getenv("OPENAI_RPM", "0"))
+    OPENAI_TPM = float(os.getenv("OPENAI_TPM", "0"))
+    PERPLEXITY_RPM = float(os.getenv("PERPLEXITY_RPM", "0"))
+    PERPLEXITY_TPM = float(os.getenv("PERPLEXITY_TPM", "0"))
+    # 429와 일시적인 오류 재시도 (최대 횟수, 첫 요청부터의 재시도 마감 시간, 백오프 기본 간격)
+    UPSTREAM_MAX_RETRIES = int(os.getenv("UPSTREAM_MAX_RETRIES", "3"))
+    UPSTREAM_RETRY_DEADLINE_SECONDS = float(os.getenv("UPSTREAM_RETRY_DEADLINE_SECONDS", "30"))
+    UPSTREAM_BACKOFF_BASE_SECONDS = float(os.getenv("UPSTREAM_BACKOFF_BASE_SECONDS", "0.5"))
+    # 프롬프트 토큰 수 계산 (tiktoken | heuristic) - tiktoken이 없으면 어림값 사용
+    TOKENIZER = os.getenv("TOKENIZER", "tiktoken")
+    TOKENIZER_ENCODING = os.getenv("TOKENIZER_ENCODING", "o200k_base")
+    # 프롬프트 구간별 토큰 예산 (자기소개서, 면접 답변, Perplexity 요약, Chroma 질문 예시)과 가변 구간 전체 예산
+    PROMPT_RESUME_TOKENS = int(os.getenv("PROMPT_RESUME_TOKENS", "2000"))
+    PROMPT_ANSWER_TOKENS = int(os.getenv("PROMPT_ANSWER_TOKENS", "1500"))
+    PROMPT_SUMMARY_TOKENS = int(os.getenv("PROMPT_SUMMARY_TOKENS", "700"))
+    PROMPT_EXAMPLES_TOKENS = int(os.getenv("PROMPT_EXAMPLES_TOKENS", "500"))
+    PROMPT_TOTAL_TOKENS = int(os.getenv("PROMPT_TOTAL_TOKENS", "3500"))
+    # 요청별 마감 시간 (X-Request-Timeout 헤더로 더 짧게 지정 가능)
+    REQUEST_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", "60"))
+    # 헤지 요청: 첫 시도가 최근 지연 시간의 HEDGE_PERCENTILE 값 안에 끝나지 않으면 한 번 더 호출 (0이면 사용 안 함)
+    HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "0"))
+    HEDGE_BUDGET_RATIO = float(os.getenv("HEDGE_BUDGET_RATIO", "0.05"))
+    HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+
+    # /interview/generate-qas 단계별 타임아웃
+    PPLX_STAGE_TIMEOUT_SECONDS = float(os.getenv("PPLX_STAGE_TIMEOUT_SECONDS", "8"))
+    CHROMA_STAGE_TIMEOUT_SECONDS = float(os.getenv("CHROMA_STAGE_TIMEOUT_SECONDS", "3"))
+    # /interview/analyze-resume-batch 에서 동시에 실행할 문항별 GPT 분석 수
+    RESUME_BATCH_CONCURRENCY = int(os.getenv("RESUME_BATCH_CONCURRENCY", "4"))
+    # /interview/analyze-resume-batch 한 번에 받을 수 있는 문항 수 (넘으면 422)
+    RESUME_BATCH_MAX_ITEMS = int(os.getenv("RESUME_BATCH_MAX_ITEMS", "10"))
+
+    # Perplexity 요약 캐시 (PPLX_CACHE_PATH를 비우면 메모리에만 저장)
+    PPLX_CACHE_TTL_SECONDS = float(os.getenv("PPLX_CACHE_TTL_SECONDS", "86400"))
+    PPLX_CACHE_MAXSIZE = int(os.getenv("PPLX_CACHE_MAXSIZE", "256"))
+    PPLX_CACHE_PATH = os.getenv("PPLX_CACHE_PATH", "")
+    # 파일로 저장하는 캐시가 변경을 모았다가 저장하기까지 기다리는 시간(초)
+    CACHE_SAVE_DELAY_SECONDS = float(os.getenv("CACHE_SAVE_DELAY_SECONDS", "1"))
+
+    # GPT 응답 캐시 (GPT_CACHE_ENDPOINTS에 쉼표로 나열한 엔드포인트만 적용, 예: analyze-resume,analyze-answer)
+    GPT_CACHE_ENDPOINTS = os.getenv("GPT_CACHE_ENDPOINTS", "")
+    GPT_CACHE_STORE = os.getenv("GPT_CACHE_STORE", "memory")  # memory | sqlite
+    GPT_CACHE_PATH = os.getenv("GPT_CACHE_PATH", "./db_cache/gpt_responses.sqlite")
+    GPT_CACHE_TTL_SECONDS = float(os.getenv("GPT_CACHE_TTL_SECONDS", "86400"))
+    GPT_CACHE_MAXSIZE = int(os.getenv("GPT_CACHE_MAXSIZE", "1024"))
+
+    # 비동기 작업 API (/jobs) - 워커 수, 대기열 크기, 끝난 작업 보관 시간, 롱 폴링 최대 대기 시간, 작업 하나의 마감 시간(초)
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+    JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+    JOB_TTL_SECONDS = float(os.getenv("JOB_TTL_SECONDS", "600"))
+    JOB_MAX_WAIT_SECONDS = float(os.getenv("JOB_MAX_WAIT_SECONDS", "30"))
+    JOB_TIMEOUT_SECONDS = float(os.getenv("JOB_TIMEOUT_SECONDS", "120"))
+    # 작업 상태 저장소 (sqlite: 같은 파일을 여는 uvicorn 워커끼리 공유 | memory: 단일 워커에서만 사용 가능)
+    JOB_STORE = os.getenv("JOB_STORE", "sqlite")
+    JOB_STORE_PATH = os.getenv("JOB_STORE_PATH", "./db_cache/jobs.sqlite")
+
+    # 검색 엔진 워밍업 방식 (background: 서버를 먼저 띄우고 백그라운드 로드 | blocking: 로드 후 요청 수신 | lazy: 첫 검색 때 로드)
+    STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "background")
+
+    # 관측: 응답에 단계별 소요 시간(Server-Timing 헤더)을 붙일지, 이벤트 루프 지연 측정 주기(초, 0이면 측정 안 함)
+    SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+    LOOP_LAG_INTERVAL_SECONDS = float(os.getenv("LOOP_LAG_INTERVAL_SECONDS", "0.1"))
+
+    # 면접 질문 크롤러 (fetcher: selenium | http | fixture, 동시에 가져올 페이지 수, 재개용 체크포인트 파일)
+    CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH")
+    CRAWLER_FETCHER = os.getenv("CRAWLER_FETCHER", "selenium")
+    CRAWLER_CONCURRENCY = int(os.getenv("CRAWLER_CONCURRENCY", "4"))
+    CRAWLER_CHECKPOINT_PATH = os.getenv("CRAWLER_CHECKPOINT_PATH", "./db_cache/crawler_checkpoint.json")
+    CRAWLER_URL_TEMPLATE = os.getenv(
+        "CRAWLER_URL_TEMPLATE",
+        "https://www.jobkorea.co.kr/starter/Review/view?FavorCo_Stat=0&schTxt=LG&OrderBy=0&Page=1&C_Idx=8"
+        "&Half_Year_Type_Code=0&Ctgr_Code=5&VPage={page}",
+    )
+
+settings = Settings()
@@ -0,0 +1,41 @@
+# app/core/deadline.py
+
+import asyncio
+import time
+from typing import Optional
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """
+    요청에 주어진 마감 시간이 지나 업스트림 호출을 더 진행하지 않을 때 발생합니다.
+    """
+
+class Deadline:
+    """
+    요청 하나에 주어진 마감 시각입니다. 라우터에서 만들어 서비스와 업스트림 호출까지 그대로 전달하며,
+    각 호출은 남은 시간만큼만 기다립니다.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def timeout(self, default: Optional[float] = None) -> float:
+        """
+        default(기본 타임아웃)와 남은 시간 중 짧은 쪽을 반환합니다.
+        """
+        remaining = self.remaining()
+        return remaining if default is None else min(default, remaining)
+
+    def check(self, what: str = "요청"):
+        if self.expired:
+            raise DeadlineExceeded(f"{what} 마감 시간({self.seconds}s)이 지났습니다.")
+
+def timeout_for(deadline: Optional[Deadline], default: Optional[float] = None) -> Optional[float]:
+    return default if deadline is None else deadline.timeout(default)
@@ -0,0 +1,312 @@
+# app/core/dedup.py
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import time
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.normalize import normalize_query, normalize_text
+
+# 병합한 메타데이터 필드 (클러스터에 속한 행들의 값을 MERGED_SEPARATOR로 이어 "<필드>목록"에 저장)
+MERGED_FIELDS = ("기업명", "경력", "직무")
+MERGED_SEPARATOR = " | "
+DUPLICATE_COUNT_FIELD = "중복수"
+# 합쳐진 행들에 실제로 있던 (기업명, 경력, 직무) 조합 (필드 여러 개로 거를 때 없던 조합이 맞춰지지 않도록)
+COMBINATION_FIELD = "조합목록"
+COMBINATION_SEPARATOR = " / "
+DEDUP_STATE_FILE = "dedup_state.npz"
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+def merged_field(field: str) -> str:
+    return f"{field}목록"
+
+def split_merged(value: str) -> List[str]:
+    return [part for part in value.split(MERGED_SEPARATOR) if part]
+
+def split_combinations(value: str) -> List[Tuple[str, ...]]:
+    combinations = [tuple(part.split(COMBINATION_SEPARATOR)) for part in split_merged(value)]
+    return [combination for combination in combinations if len(combination) == len(MERGED_FIELDS)]
+
+def question_key(question: str) -> str:
+    """
+    공백, 대소문자, 문장 부호만 다른 질문이 같은 값이 되도록 정규화한 해시입니다.
+    """
+    text = _NON_WORD.sub("", normalize_query(question))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+class DedupReport:
+    def __init__(self):
+        self.rows = 0
+        self.exact_duplicates = 0
+        self.near_duplicates = 0
+        self.clusters = 0
+        self.pairs = 0
+        self.seconds = 0.0
+
+    @property
+    def kept(self) -> int:
+        return self.rows - self.exact_duplicates - self.near_duplicates
+
+    @property
+    def reduction(self) -> float:
+        return 1 - self.kept / self.rows if self.rows else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "kept": self.kept,
+            "exact_duplicates": self.exact_duplicates,
+            "near_duplicates": self.near_duplicates,
+            "clusters": self.clusters,
+            "pairs": self.pairs,
+            "reduction": round(self.reduction, 4),
+            "seconds": round(self.seconds, 3),
+        }
+
+    def __str__(self):
+        return (
+            f"{self.rows}행 -> {self.kept}행 ({self.reduction:.1%} 감소, 완전 중복 {self.exact_duplicates}, "
+            f"유사 중복 {self.near_duplicates}, 병합된 클러스터 {self.clusters}, {self.seconds:.1f}초)"
+        )
+
+class UnionFind:
+    def __init__(self, size: int):
+        self.parent = np.arange(size)
+        self.size = np.ones(size, dtype=np.int64)
+
+    def find(self, i: int) -> int:
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        # 경로 압축
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+
+    def union(self, a: int, b: int) -> bool:
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        return True
+
+def similar_pairs(vectors: np.ndarray, threshold: float, block_size: int = 1024):
+    """
+    L2 정규화된 vectors에서 코사인 유사도가 threshold 이상인 (i, j) 쌍(i < j)을 block_size 행씩 나눈
+    행렬곱으로 찾습니다. 한 번에 block_size x N 크기의 유사도만 메모리에 둡니다.
+    """
+    size = len(vectors)
+    for start in range(0, size, block_size):
+        end = min(start + block_size, size)
+        # 대각선 위쪽(j > i)만 계산
+        sims = vectors[start:end] @ vectors[start:].T
+        rows, cols = np.nonzero(np.triu(sims >= threshold, k=1))
+        for i, j in zip(rows + start, cols + start):
+            yield int(i), int(j)
+
+def cluster(vectors: np.ndarray, threshold: float, block_size: int = 1024, report: Optional[DedupReport] = None) -> np.ndarray:
+    """
+    유사도가 threshold 이상인 쌍을 union-find로 묶어 행마다 클러스터 번호(대표 행 번호)를 반환합니다.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = vectors / np.maximum(norms, 1e-12)
+
+    union_find = UnionFind(len(vectors))
+    for i, j in similar_pairs(vectors, threshold, block_size):
+        if report is not None:
+            report.pairs += 1
+        union_find.union(i, j)
+    return np.asarray([union_find.find(i) for i in range(len(vectors))], dtype=np.int64)
+
+def similar_pairs_to(vectors: np.ndarray, targets: List[int], threshold: float, block_size: int = 1024):
+    """
+    targets 행과 나머지 모든 행 사이에서 유사도가 threshold 이상인 쌍을 찾습니다. targets끼리의 쌍은 한 번만 반환합니다.
+    """
+    target_set = set(targets)
+    for start in range(0, len(targets), block_size):
+        block = targets[start:start + block_size]
+        sims = vectors[block] @ vectors.T
+        rows, cols = np.nonzero(sims >= threshold)
+        for i, j in zip(rows, cols):
+            i, j = block[i], int(j)
+            if i != j and (j not in target_set or i < j):
+                yield min(i, j), max(i, j)
+
+class DedupState:
+    """
+    지난 중복 제거에서 계산한 질문 키별 임베딩과 클러스터를 저장해 둡니다.
+    증분 ingest는 새 질문만 임베딩해 기존 질문과 비교하므로, CSV 전체를 다시 임베딩하거나 N x N 유사도를 다시 계산하지 않습니다.
+    CSV에서 빠진 질문은 상태에서도 빠지지만 남은 클러스터는 나뉘지 않으므로, 처음부터 다시 묶으려면 init_chroma로 다시 만드세요.
+    """
+
+    def __init__(self, path: str, model_name: str, threshold: float, load: bool = True):
+        self.path = path
+        self.model_name = model_name
+        self.threshold = threshold
+        self.keys: List[str] = []
+        self.vectors = np.empty((0, 0), dtype=np.float32)
+        self.labels = np.empty(0, dtype=np.int64)
+        if load and path and os.path.exists(path):
+            try:
+                with np.load(path) as data:
+                    info = json.loads(str(data["info"]))
+                    # 모델이나 임계값이 바뀌면 이전 결과를 쓰지 않고 다시 계산
+                    if info["model_name"] == model_name and info["threshold"] == threshold:
+                        self.keys = [str(key) for key in data["keys"]]
+                        self.vectors = data["vectors"]
+                        self.labels = data["labels"]
+            except Exception as e:
+                print(f"⚠️ 중복 제거 상태 로드 실패, 전체를 다시 계산합니다: {e}")
+
+    def cluster(self, keys: List[str], texts: List[str], embedder, block_size: int,
+                report: Optional[DedupReport] = None) -> np.ndarray:
+        """
+        기존 키는 저장된 벡터와 클러스터를 그대로 쓰고, 새 키만 임베딩해 전체와 비교한 뒤 keys 순서의 클러스터 번호를 반환합니다.
+        """
+        known = {key: i for i, key in enumerate(self.keys)}
+        new = [i for i, key in enumerate(keys) if key not in known]
+
+        dim = self.vectors.shape[1] if len(self.keys) else 0
+        vectors = np.empty((len(keys), dim), dtype=np.float32)
+        if new:
+            encoded = np.asarray(embedder.encode([texts[i] for i in new]), dtype=np.float32)
+            if not len(self.keys):
+                vectors = np.empty((len(keys), encoded.shape[1]), dtype=np.float32)
+            vectors[new] = encoded / np.maximum(np.linalg.norm(encoded, axis=1, keepdims=True), 1e-12)
+
+        union_find = UnionFind(len(keys))
+        roots: Dict[int, int] = {}
+        for i, key in enumerate(keys):
+            if key in known:
+                vectors[i] = self.vectors[known[key]]
+                # 기존 클러스터는 그대로 다시 묶음
+                label = int(self.labels[known[key]])
+                union_find.union(roots.setdefault(label, i), i)
+
+        for i, j in similar_pairs_to(vectors, new, self.threshold, block_size):
+            if report is not None:
+                report.pairs += 1
+            union_find.union(i, j)
+
+        labels = np.asarray([union_find.find(i) for i in range(len(keys))], dtype=np.int64)
+        self.keys, self.vectors, self.labels = list(keys), vectors, labels
+        return labels
+
+    def save(self):
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        info = json.dumps({"model_name": self.model_name, "threshold": self.threshold})
+        tmp_path = self.path + ".tmp.npz"
+        np.savez(tmp_path, keys=np.asarray(self.keys, dtype=str), vectors=self.vectors, labels=self.labels,
+                 info=np.asarray(info))
+        os.replace(tmp_path, self.path)
+
+def _merge(rows: List[Dict[str, str]]) -> Dict[str, str]:
+    """
+    가장 많이 나온 질문(같으면 먼저 나온 질문)의 첫 행을 대표로 두고, 나머지 행의 메타데이터를 합칩니다.
+    """
+    counts: Dict[str, int] = {}
+    for row in rows:
+        key = question_key(row["질문"])
+        counts[key] = counts.get(key, 0) + 1
+    best = max(counts.values())
+    canonical = dict(next(row for row in rows if counts[question_key(row["질문"])] == best))
+    if len(rows) == 1:
+        return canonical
+
+    for field in MERGED_FIELDS:
+        values = list(dict.fromkeys(row[field] for row in rows if row[field]))
+        if len(values) > 1:
+            canonical[merged_field(field)] = MERGED_SEPARATOR.join(values)
+    combinations = list(dict.fromkeys(COMBINATION_SEPARATOR.join(row[field] for field in MERGED_FIELDS) for row in rows))
+    if len(combinations) > 1:
+        canonical[COMBINATION_FIELD] = MERGED_SEPARATOR.join(combinations)
+    canonical[DUPLICATE_COUNT_FIELD] = str(len(rows))
+    return canonical
+
+def dedup_rows(rows: List[Dict[str, str]], embedder=None, threshold: float = settings.DEDUP_SIMILARITY_THRESHOLD,
+               block_size: int = settings.DEDUP_BLOCK_SIZE,
+               state: Optional[DedupState] = None) -> Tuple[List[Dict[str, str]], DedupReport]:
+    """
+    1. 정규화한 질문이 같은 행을 묶고 (완전 중복)
+    2. embedder가 주어지고 threshold가 1 미만이면 서로 다른 질문을 임베딩해 유사도가 threshold 이상인 것끼리 묶어 (유사 중복)
+    클러스터마다 대표 행 하나만 남깁니다. 대표 행에는 묶인 행들의 기업명/경력/직무가 "<필드>목록"으로 합쳐집니다.
+    결과는 각 클러스터가 처음 나온 순서를 따릅니다.
+    state가 주어지면 지난 결과에 없던 질문만 임베딩해 비교하고, 결과를 state에 반영합니다. (저장은 호출한 쪽에서 state.save())
+    """
+    start = time.perf_counter()
+    report = DedupReport()
+    report.rows = len(rows)
+
+    groups: Dict[str, List[Dict[str, str]]] = {}
+    for row in rows:
+        groups.setdefault(question_key(row["질문"]), []).append(row)
+    keys = list(groups)
+    report.exact_duplicates = len(rows) - len(keys)
+
+    labels = np.arange(len(keys))
+    if embedder is not None and threshold < 1 and len(keys) > 1:
+        texts = [normalize_text(groups[key][0]["질문"]) for key in keys]
+        if state is not None and state.threshold == threshold:
+            labels = state.cluster(keys, texts, embedder, block_size, report)
+        else:
+            labels = cluster(embedder.encode(texts), threshold, block_size, report)
+
+    clusters: Dict[int, List[Dict[str, str]]] = {}
+    for key, label in zip(keys, labels):
+        clusters.setdefault(int(label), []).extend(groups[key])
+    report.near_duplicates = len(keys) - len(clusters)
+    report.clusters = sum(1 for members in clusters.values() if len(members) > 1)
+
+    # keys가 처음 나온 순서이므로 클러스터도 처음 나온 순서, 클러스터 안의 행은 CSV 순서로 되돌린 뒤 병합
+    order = {id(row): i for i, row in enumerate(rows)}
+    merged = [_merge(sorted(members, key=lambda row: order[id(row)])) for members in clusters.values()]
+
+    report.seconds = time.perf_counter() - start
+    return merged, report
+
+def write_csv(filename: str, rows: List[Dict[str, str]]):
+    from app.core.ingest import CSV_COLUMNS
+
+    columns = CSV_COLUMNS + [merged_field(field) for field in MERGED_FIELDS] + [COMBINATION_FIELD, DUPLICATE_COUNT_FIELD]
+    with open(filename, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file, quotechar='"', quoting=csv.QUOTE_ALL)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([row.get(column, "") for column in columns])
+
+# CLI 실행용 (python -m app.core.dedup) - 저장소는 바꾸지 않고 중복 제거 결과만 확인
+if __name__ == "__main__":
+    from app.core.ingest import iter_csv_rows
+
+    parser = argparse.ArgumentParser(description="면접 질문 중복 제거 미리보기")
+    parser.add_argument("--csv", default="dataset_question.csv")
+    parser.add_argument("--threshold", type=float, default=settings.DEDUP_SIMILARITY_THRESHOLD)
+    parser.add_argument("--exact-only", action="store_true", help="임베딩 없이 완전 중복만 제거")
+    parser.add_argument("--output", help="대표 행만 남긴 CSV를 저장할 경로")
+    args = parser.parse_args()
+
+    embedder = None
+    if not args.exact_only:
+        from app.core.vector_utils import create_embedder
+        embedder = create_embedder(settings.EMBEDDING_MODEL_NAME)
+
+    rows = [row for row in iter_csv_rows(args.csv) if row["질문"].strip()]
+    merged, report = dedup_rows(rows, embedder, threshold=args.threshold)
+    print(f"✅ 중복 제거: {report}")
+    if args.output:
+        write_csv(args.output, merged)
+        print(f"   저장: {args.output}")
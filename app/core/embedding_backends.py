@@ -0,0 +1,265 @@
+# app/core/embedding_backends.py
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import time
+import zlib
+import numpy as np
+from abc import ABC, abstractmethod
+from typing import List
+from app.core.config import settings
+
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_QUANTIZED_MODEL_FILE = "model.int8.onnx"
+ONNX_CONFIG_FILE = "encoder_config.json"
+ONNX_TOKENIZER_FILE = "tokenizer.json"
+
+class Encoder(ABC):
+    """
+    임베딩 백엔드 공통 인터페이스입니다. encode는 (문장 수, 차원) float32 행렬을 반환하고,
+    LangChain 저장소에서 쓸 수 있도록 embed_documents/embed_query를 함께 제공합니다.
+    """
+
+    backend = "base"
+
+    @abstractmethod
+    def encode(self, texts: List[str]) -> np.ndarray:
+        ...
+
+    def embed_documents(self, texts):
+        return self.encode(texts).tolist()
+
+    def embed_query(self, text):
+        return self.encode([text])[0].tolist()
+
+class OnnxEncoder(Encoder):
+    """
+    ONNX Runtime으로 내보낸 SentenceTransformer(Transformer + mean pooling)입니다.
+    PyTorch와 transformers를 불러오지 않고 tokenizers의 tokenizer.json만 쓰므로 import 시간과 워커당 메모리가 줄어듭니다.
+    """
+
+    backend = "onnx"
+
+    def __init__(self, model_dir: str, quantized: bool = True, intra_op_threads: int = 0,
+                 show_progress_bar: bool = False, batch_size: int = 32):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_path = os.path.join(model_dir, ONNX_QUANTIZED_MODEL_FILE if quantized else ONNX_MODEL_FILE)
+        tokenizer_path = os.path.join(model_dir, ONNX_TOKENIZER_FILE)
+        for path in (model_path, tokenizer_path):
+            if not os.path.exists(path):
+                raise FileNotFoundError(
+                    f"{path}가 없습니다. python -m app.core.embedding_backends export 로 먼저 생성해주세요."
+                )
+        with open(os.path.join(model_dir, ONNX_CONFIG_FILE), encoding="utf-8") as f:
+            config = json.load(f)
+
+        options = ort.SessionOptions()
+        if intra_op_threads > 0:
+            options.intra_op_num_threads = intra_op_threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        self.session = ort.InferenceSession(model_path, sess_options=options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.max_seq_length = config["max_seq_length"]
+        self.tokenizer = Tokenizer.from_file(tokenizer_path)
+        self.tokenizer.enable_truncation(max_length=self.max_seq_length)
+        if self.tokenizer.padding is None:
+            # 배치 안에서 가장 긴 문장 길이에 맞춰 패딩
+            pad_token = config.get("pad_token") or "[PAD]"
+            self.tokenizer.enable_padding(pad_id=self.tokenizer.token_to_id(pad_token) or 0, pad_token=pad_token)
+        self.batch_size = batch_size
+        self.show_progress_bar = show_progress_bar
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        outputs = []
+        total = len(texts)
+        for i in range(0, total, self.batch_size):
+            outputs.append(self._encode_batch(texts[i:i + self.batch_size]))
+            if self.show_progress_bar:
+                print(f"\r임베딩 {min(i + self.batch_size, total)}/{total}", end="", flush=True)
+        if self.show_progress_bar and total:
+            print()
+        if not outputs:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.concatenate(outputs).astype(np.float32, copy=False)
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        tokens = {
+            "input_ids": np.asarray([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.asarray([e.attention_mask for e in encodings], dtype=np.int64),
+            "token_type_ids": np.asarray([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        feeds = {name: tokens[name] for name in self.input_names if name in tokens}
+        hidden = self.session.run(None, feeds)[0]
+
+        # SentenceTransformer와 같은 mean pooling (패딩 토큰 제외)
+        mask = tokens["attention_mask"][..., None].astype(np.float32)
+        return (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+class HashEncoder(Encoder):
+    """
+    문자 n-gram을 고정 차원에 해싱한 벡터입니다. 모델 없이 결정적으로 동작하므로
+    오프라인 벤치마크(bench)에서 검색/인덱스 경로만 측정할 때 사용합니다.
+    """
+
+    backend = "hash"
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        from app.core.lexical_index import char_ngrams
+
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for gram in char_ngrams(text):
+                vectors[i, zlib.crc32(gram.encode("utf-8")) % self.dim] += 1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+def create_encoder(kind: str = settings.EMBEDDING_BACKEND, model_name: str = settings.EMBEDDING_MODEL_NAME,
+                   show_progress_bar: bool = False, threads: int = 0) -> Encoder:
+    """
+    threads는 ONNX_INTRA_OP_THREADS를 지정하지 않았을 때 쓸 ONNX 연산 스레드 수입니다. (0이면 런타임 기본값)
+    """
+    if kind == "torch":
+        from app.core.vector_utils import LangChainSentenceTransformer
+        return LangChainSentenceTransformer(model_name, show_progress_bar=show_progress_bar)
+    if kind == "onnx":
+        return OnnxEncoder(
+            settings.ONNX_MODEL_DIR,
+            quantized=settings.ONNX_QUANTIZED,
+            intra_op_threads=settings.ONNX_INTRA_OP_THREADS or threads,
+            show_progress_bar=show_progress_bar,
+        )
+    if kind == "hash":
+        return HashEncoder()
+    raise ValueError(f"지원하지 않는 임베딩 백엔드입니다: {kind}")
+
+def encoder_cache_name(kind: str, model_name: str) -> str:
+    """
+    임베딩 캐시 키에 쓰는 이름입니다. 양자화 모델은 결과가 조금 다르므로 따로 캐시합니다.
+    """
+    if kind == "onnx":
+        return f"{model_name}:onnx-{'int8' if settings.ONNX_QUANTIZED else 'fp32'}"
+    if kind == "hash":
+        return "hash"
+    return model_name
+
+def export_onnx(model_name: str = settings.EMBEDDING_MODEL_NAME, model_dir: str = settings.ONNX_MODEL_DIR):
+    """
+    SentenceTransformer의 Transformer 부분을 ONNX로 내보내고 int8 동적 양자화 모델을 함께 만듭니다.
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+
+    os.makedirs(model_dir, exist_ok=True)
+    model = SentenceTransformer(model_name, device="cpu")
+    transformer = model[0].auto_model.eval()
+    tokenizer = model.tokenizer
+    if not tokenizer.is_fast:
+        raise ValueError(f"{model_name}의 토크나이저는 {ONNX_TOKENIZER_FILE}로 저장할 수 없습니다. (fast tokenizer 필요)")
+
+    dummy = tokenizer(["임베딩 내보내기용 예시 문장입니다."], return_tensors="pt")
+    model_path = os.path.join(model_dir, ONNX_MODEL_FILE)
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            (dummy["input_ids"], dummy["attention_mask"]),
+            model_path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "last_hidden_state": {0: "batch", 1: "sequence"},
+            },
+            opset_version=14,
+        )
+    quantize_dynamic(model_path, os.path.join(model_dir, ONNX_QUANTIZED_MODEL_FILE), weight_type=QuantType.QInt8)
+
+    # 서빙에서는 tokenizers로 tokenizer.json만 읽음
+    tokenizer.backend_tokenizer.save(os.path.join(model_dir, ONNX_TOKENIZER_FILE))
+    with open(os.path.join(model_dir, ONNX_CONFIG_FILE), "w", encoding="utf-8") as f:
+        json.dump({"model": model_name, "max_seq_length": model.max_seq_length, "pad_token": tokenizer.pad_token},
+                  f, ensure_ascii=False)
+    print(f"✅ ONNX 모델 내보내기 완료: {model_dir}")
+
+def _load_texts(csv_filename: str, limit: int = 0) -> List[str]:
+    from app.core.ingest import format_document, iter_csv_rows
+
+    texts = [format_document(row)[0] for row in iter_csv_rows(csv_filename) if row["질문"].strip()]
+    return texts[:limit] if limit else texts
+
+def _profile(kind: str, texts: List[str], queue):
+    # 별도 프로세스에서 실행하여 백엔드별 import 시간과 RSS를 따로 측정
+    start = time.perf_counter()
+    encoder = create_encoder(kind)
+    load_seconds = time.perf_counter() - start
+
+    single = []
+    for text in texts[:50]:
+        start = time.perf_counter()
+        encoder.encode([text])
+        single.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    vectors = encoder.encode(texts)
+    batch_seconds = time.perf_counter() - start
+
+    queue.put({
+        "backend": kind,
+        "load_seconds": load_seconds,
+        "single_p50_ms": float(np.percentile(single, 50) * 1000),
+        "single_p95_ms": float(np.percentile(single, 95) * 1000),
+        "batch_per_second": len(texts) / batch_seconds,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "vectors": vectors,
+    })
+
+def parity(csv_filename: str = "dataset_question.csv", limit: int = 0):
+    """
+    데이터셋 문장에 대해 torch와 ONNX 백엔드 임베딩의 코사인 유사도, 지연 시간, RSS를 비교합니다.
+    """
+    texts = _load_texts(csv_filename, limit)
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for kind in ("torch", "onnx"):
+        queue = context.Queue()
+        process = context.Process(target=_profile, args=(kind, texts, queue))
+        process.start()
+        results[kind] = queue.get()
+        process.join()
+
+    a, b = results["torch"].pop("vectors"), results["onnx"].pop("vectors")
+    cosine = (a * b).sum(axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+    print(f"문장 수: {len(texts)}")
+    print(f"코사인 유사도 (torch vs onnx): 평균 {cosine.mean():.4f}, 최소 {cosine.min():.4f}, 하위 1% {np.percentile(cosine, 1):.4f}")
+    for stats in results.values():
+        print(
+            f"[{stats['backend']}] 로드 {stats['load_seconds']:.2f}s, 단건 p50 {stats['single_p50_ms']:.1f}ms "
+            f"p95 {stats['single_p95_ms']:.1f}ms, 배치 {stats['batch_per_second']:.0f}건/s, 최대 RSS {stats['max_rss_mb']:.0f}MB"
+        )
+
+# CLI 실행용 (python -m app.core.embedding_backends export | parity)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="임베딩 백엔드 도구")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("export", help="ONNX(int8) 모델 내보내기")
+    parity_parser = sub.add_parser("parity", help="torch/ONNX 임베딩 일치도와 성능 비교")
+    parity_parser.add_argument("--csv", default="dataset_question.csv")
+    parity_parser.add_argument("--limit", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == "export":
+        export_onnx()
+    else:
+        parity(args.csv, args.limit)
@@ -0,0 +1,190 @@
+# app/core/embedding_cache.py
+
+import atexit
+import hashlib
+import os
+import sqlite3
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.normalize import normalize_text
+
+class EmbeddingCache:
+    """
+    (모델 이름, 정규화된 문장) 해시를 키로 임베딩 벡터를 저장하는 2단계 캐시입니다.
+    메모리 LRU를 먼저 보고, 없으면 SQLite 파일(float32 BLOB)을 조회합니다.
+    새 벡터는 바로 메모리에 넣고, 파일 쓰기는 save_delay초 동안 모아 백그라운드 스레드에서 한 번의 트랜잭션으로 합니다.
+    종료 시 close()로 남은 벡터를 저장합니다.
+    """
+
+    def __init__(self, memory_size: int, path: Optional[str] = None,
+                 save_delay: float = settings.CACHE_SAVE_DELAY_SECONDS):
+        self.memory_size = memory_size
+        self.path = path
+        self.save_delay = save_delay
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+        self._lock = threading.Lock()
+        # 파일 쓰기 순서를 지키기 위한 잠금 (_lock은 대기 목록을 넘겨받는 동안만 잡음)
+        self._save_lock = threading.Lock()
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        # 아직 파일에 쓰지 않은 벡터
+        self._pending: Dict[str, np.ndarray] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._conn = None
+        # 백그라운드 저장 전용 연결 (WAL이라 쓰는 동안에도 _conn으로 조회 가능)
+        self._writer = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+            self._conn.commit()
+            self._writer = sqlite3.connect(path, check_same_thread=False)
+            atexit.register(self.close)
+
+    @staticmethod
+    def key(model_name: str, text: str) -> str:
+        return hashlib.sha1(f"{model_name}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+                elif key in self._pending:
+                    # 메모리에서 밀려났지만 아직 파일에 쓰기 전인 벡터
+                    found[key] = self._pending[key]
+            memory_hits = len(found)
+
+            missing = [key for key in keys if key not in found]
+            if missing and self._conn is not None:
+                for i in range(0, len(missing), 500):
+                    chunk = missing[i:i + 500]
+                    rows = self._conn.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                    ).fetchall()
+                    for key, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float32)
+                        found[key] = vector
+                        self._remember(key, vector)
+            disk_hits = len(found) - memory_hits
+
+            self.hits["memory"] += memory_hits
+            self.hits["disk"] += disk_hits
+            self.misses += len(keys) - len(found)
+
+        metrics.inc("embedding_cache_hits_total", memory_hits, {"tier": "memory"})
+        metrics.inc("embedding_cache_hits_total", disk_hits, {"tier": "disk"})
+        metrics.inc("embedding_cache_misses_total", len(keys) - len(found))
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]):
+        with self._lock:
+            for key, vector in items.items():
+                vector = np.asarray(vector, dtype=np.float32)
+                self._remember(key, vector)
+                if self._conn is not None:
+                    self._pending[key] = vector
+            if self._pending:
+                self._schedule_save()
+
+    def flush(self):
+        """
+        저장 대기 중인 벡터가 있으면 바로 파일에 씁니다.
+        """
+        with self._save_lock:
+            with self._lock:
+                pending = dict(self._pending)
+                self._timer = None
+            if not pending or self._writer is None:
+                return
+            try:
+                self._writer.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    [(key, vector.tobytes()) for key, vector in pending.items()],
+                )
+                self._writer.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ 임베딩 캐시 파일을 저장하지 못했습니다: {e}")
+                return
+            # 저장하는 동안 다시 들어온 벡터는 남겨 둠
+            with self._lock:
+                for key, vector in pending.items():
+                    if self._pending.get(key) is vector:
+                        del self._pending[key]
+
+    def stats(self) -> dict:
+        total = sum(self.hits.values()) + self.misses
+        return {
+            "memory_size": len(self._memory),
+            "hits": dict(self.hits),
+            "misses": self.misses,
+            "hit_rate": sum(self.hits.values()) / total if total else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        self.flush()
+        with self._save_lock, self._lock:
+            for conn in (self._conn, self._writer):
+                if conn is not None:
+                    conn.close()
+            self._conn = self._writer = None
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _schedule_save(self):
+        # _lock을 잡은 상태에서 호출. 이미 저장이 예약되어 있으면 그때 함께 저장됨
+        if self._timer is None:
+            self._timer = threading.Timer(self.save_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+class CachedEmbedder:
+    """
+    임베딩 모델 앞에 EmbeddingCache를 두어 캐시에 없는 문장만 한 번의 encode로 계산합니다.
+    """
+
+    def __init__(self, embedder, model_name: str, cache: EmbeddingCache):
+        self.embedder = embedder
+        self.model_name = model_name
+        self.cache = cache
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        keys = [EmbeddingCache.key(self.model_name, text) for text in texts]
+        found = self.cache.get_many(keys)
+
+        # 캐시에 없는 문장은 중복을 제거하여 한 번에 인코딩
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+        if missing:
+            vectors = self.embedder.encode(list(missing.values()))
+            computed = dict(zip(missing, vectors))
+            self.cache.put_many(computed)
+            found.update(computed)
+
+        return np.stack([found[key] for key in keys]).astype(np.float32, copy=False)
+
+    def embed_documents(self, texts):
+        return self.encode(texts).tolist()
+
+    def embed_query(self, text):
+        return self.encode([text])[0].tolist()
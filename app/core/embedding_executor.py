@@ -0,0 +1,188 @@
+# app/core/embedding_executor.py
+
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import numpy as np
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional
+from app.core.config import settings
+from app.core.embedding_backends import Encoder, create_encoder
+from app.core.metrics import metrics
+
+EXECUTOR_KINDS = ("thread", "process", "inline")
+
+class EmbeddingQueueFullError(RuntimeError):
+    """
+    임베딩 대기열이 가득 차 queue_timeout 안에 자리가 나지 않았을 때 발생합니다.
+    """
+
+def resolve_workers(workers: int = settings.EMBED_WORKERS) -> int:
+    # 0이면 코어 수의 절반(최대 4)을 사용
+    if workers > 0:
+        return workers
+    return max(1, min(4, (os.cpu_count() or 1) // 2))
+
+def resolve_threads(workers: int, threads: int = settings.EMBED_THREADS_PER_WORKER) -> int:
+    """
+    워커 하나가 쓰는 연산 스레드(torch/ONNX intra-op) 수입니다. 0이면 코어를 워커 수로 나눠
+    워커들이 동시에 encode해도 코어 수보다 많은 스레드가 경쟁하지 않도록 합니다.
+    """
+    if threads > 0:
+        return threads
+    return max(1, (os.cpu_count() or 1) // workers)
+
+def limit_torch_threads(threads: int):
+    # torch를 이미 불러온 프로세스에서만 적용 (torch를 새로 import하지 않음)
+    torch = sys.modules.get("torch")
+    if torch is not None and threads > 0:
+        torch.set_num_threads(threads)
+
+# process 모드의 자식 프로세스가 사용하는 모델 (자식마다 initializer에서 로드)
+_process_encoder: Optional[Encoder] = None
+
+def _init_process_worker(backend: str, model_name: str, threads: int):
+    global _process_encoder
+    _process_encoder = create_encoder(backend, model_name, threads=threads)
+    limit_torch_threads(threads)
+
+def _timed_encode(texts: List[str], encoder: Optional[Encoder] = None):
+    # 대기 시간을 재기 위해 시작 시각(wall clock)을 함께 반환 - 프로세스가 달라도 비교 가능
+    encoder = encoder or _process_encoder
+    started_at = time.time()
+    vectors = encoder.encode(texts)
+    return np.asarray(vectors, dtype=np.float32), started_at, time.time() - started_at
+
+class PooledEncoder(Encoder):
+    """
+    임베딩 encode를 전용 워커 풀에서 실행합니다. 호출한 스레드는 결과를 기다리기만 하므로
+    여러 요청의 encode가 코어 수만큼 병렬로 진행되고, 큰 배치는 chunk_size씩 나눠 여러 워커가 나눠 처리합니다.
+
+    - thread: 같은 모델을 여러 스레드가 공유합니다. torch/ONNX 연산 중에는 GIL이 풀리므로 코어를 나눠 씁니다.
+    - process: spawn으로 띄운 자식 프로세스마다 initializer에서 모델을 새로 로드합니다.
+      torch/ONNX Runtime의 스레드 풀은 fork 후 자식에서 멈출 수 있으므로 부모의 모델을 물려받지 않습니다.
+
+    대기 중이거나 실행 중인 chunk가 queue_size개를 넘으면 queue_timeout초까지 기다린 뒤 EmbeddingQueueFullError를 던집니다.
+    """
+
+    def __init__(self, encoder: Optional[Encoder], kind: str = "thread", workers: int = 2, queue_size: int = 64,
+                 queue_timeout: float = 10, chunk_size: int = 32, threads: int = 1,
+                 backend: Optional[str] = None, model_name: Optional[str] = None):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"지원하지 않는 임베딩 실행기입니다: {kind}")
+        if kind == "thread" and encoder is None:
+            raise ValueError("thread 모드에는 encoder가 필요합니다.")
+        if kind == "process" and (backend is None or model_name is None):
+            raise ValueError("process 모드에는 자식 프로세스에서 로드할 backend와 model_name이 필요합니다.")
+        self.encoder = encoder
+        self.backend = backend or encoder.backend
+        self.kind = kind
+        self.workers = workers
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.chunk_size = chunk_size
+        self._slots = threading.BoundedSemaphore(queue_size)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._labels = {"executor": kind}
+
+        self._executor: Executor
+        if kind == "process":
+            self._executor = ProcessPoolExecutor(
+                workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_process_worker,
+                initargs=(backend, model_name, threads),
+            )
+        else:
+            limit_torch_threads(threads)
+            self._executor = ThreadPoolExecutor(workers, thread_name_prefix="embed")
+        metrics.set_gauge("embed_executor_workers", workers, self._labels)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        futures = []
+        try:
+            for i in range(0, len(texts), self.chunk_size):
+                futures.append(self._submit(texts[i:i + self.chunk_size]))
+            return np.concatenate([future.result()[0] for future in futures])
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    def _submit(self, texts: List[str]) -> Future:
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            metrics.inc("embed_executor_rejected_total", labels=self._labels)
+            raise EmbeddingQueueFullError(f"임베딩 대기열이 가득 찼습니다 ({self.queue_size}개).")
+
+        submitted_at = time.time()
+        self._update_pending(1)
+        try:
+            encoder = self.encoder if self.kind == "thread" else None
+            future = self._executor.submit(_timed_encode, texts, encoder)
+        except BaseException:
+            self._release()
+            raise
+
+        def _done(done: Future):
+            self._release()
+            if done.cancelled() or done.exception() is not None:
+                metrics.inc("embed_executor_errors_total", labels=self._labels)
+                return
+            _, started_at, seconds = done.result()
+            metrics.observe("embed_executor_queue_wait_seconds", max(0.0, started_at - submitted_at), self._labels)
+            metrics.observe("embed_executor_run_seconds", seconds, self._labels)
+            metrics.inc("embed_executor_texts_total", len(texts), self._labels)
+
+        future.add_done_callback(_done)
+        return future
+
+    def _release(self):
+        self._update_pending(-1)
+        self._slots.release()
+
+    def _update_pending(self, delta: int):
+        with self._lock:
+            self._pending += delta
+            pending = self._pending
+        # pending은 실행 중 + 대기 중, queue_depth는 워커를 기다리는 chunk 수
+        metrics.set_gauge("embed_executor_pending", pending, self._labels)
+        metrics.set_gauge("embed_executor_queue_depth", max(0, pending - self.workers), self._labels)
+
+    def stats(self) -> dict:
+        return {"kind": self.kind, "workers": self.workers, "pending": self._pending, "queueSize": self.queue_size}
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+def create_pooled_encoder(backend: str = settings.EMBEDDING_BACKEND, model_name: str = settings.EMBEDDING_MODEL_NAME,
+                          kind: str = settings.EMBED_EXECUTOR, workers: int = 0) -> Encoder:
+    """
+    EMBED_EXECUTOR 설정에 맞게 인코더를 만들어 워커 풀로 감쌉니다. inline이면 인코더를 그대로 반환합니다.
+    """
+    if kind not in EXECUTOR_KINDS:
+        raise ValueError(f"지원하지 않는 임베딩 실행기입니다: {kind}")
+    if kind == "inline":
+        return create_encoder(backend, model_name)
+
+    workers = resolve_workers(workers or settings.EMBED_WORKERS)
+    threads = resolve_threads(workers)
+    # ONNX 세션은 만들 때 스레드 풀을 띄우므로 워커당 스레드 수를 세션 옵션으로 넘김
+    # process 모드는 자식 프로세스마다 모델을 로드하므로 부모에서는 로드하지 않음
+    encoder = create_encoder(backend, model_name, threads=threads) if kind == "thread" else None
+    return PooledEncoder(
+        encoder,
+        kind=kind,
+        workers=workers,
+        queue_size=settings.EMBED_QUEUE_SIZE,
+        queue_timeout=settings.EMBED_QUEUE_TIMEOUT_SECONDS,
+        chunk_size=max(1, settings.EMBED_MAX_BATCH),
+        threads=threads,
+        backend=backend,
+        model_name=model_name,
+    )
@@ -0,0 +1,78 @@
+# app/core/hedging.py
+
+import asyncio
+import collections
+import time
+from typing import Any, Awaitable, Callable, Optional
+import numpy as np
+from app.core.metrics import metrics
+
+class Hedger:
+    """
+    느린 꼬리 지연(p99)을 줄이기 위한 헤지 요청 실행기입니다.
+    첫 시도가 최근 지연 시간의 percentile 값 안에 끝나지 않으면 같은 요청을 한 번 더 보내고,
+    먼저 성공한 결과를 사용합니다. 추가 요청 수는 전체 요청의 budget_ratio 비율을 넘지 않습니다.
+    """
+
+    def __init__(self, name: str, percentile: float, budget_ratio: float,
+                 min_samples: int = 20, window: int = 500):
+        self.name = name
+        self.percentile = percentile
+        self.budget_ratio = budget_ratio
+        self.min_samples = min_samples
+        self.calls = 0
+        self.hedges = 0
+        self._latencies = collections.deque(maxlen=window)
+
+    @property
+    def enabled(self) -> bool:
+        return self.percentile > 0 and self.budget_ratio > 0
+
+    def delay(self) -> Optional[float]:
+        """
+        헤지 요청을 보내기까지 기다릴 시간입니다. 표본이 부족하면 None(헤지하지 않음)을 반환합니다.
+        """
+        if len(self._latencies) < self.min_samples:
+            return None
+        return float(np.percentile(self._latencies, self.percentile))
+
+    def _has_budget(self) -> bool:
+        return self.hedges < self.budget_ratio * self.calls
+
+    async def run(self, func: Callable[[], Awaitable[Any]], timeout: Optional[float] = None) -> Any:
+        """
+        func()를 실행하고, 필요하면 한 번 더 실행해 먼저 성공한 결과를 반환합니다.
+        timeout은 헤지 대기 시간의 상한입니다. (마감 시간이 헤지 시점보다 짧으면 헤지하지 않음)
+        """
+        self.calls += 1
+        labels = {"hedger": self.name}
+        start = time.perf_counter()
+        delay = self.delay() if self.enabled else None
+
+        tasks = [asyncio.ensure_future(func())]
+        try:
+            if delay is not None and (timeout is None or delay < timeout):
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done and self._has_budget():
+                    self.hedges += 1
+                    metrics.inc("hedge_requests_total", labels=labels)
+                    tasks.append(asyncio.ensure_future(func()))
+
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    if len(tasks) > 1 and task is tasks[1]:
+                        metrics.inc("hedge_wins_total", labels=labels)
+                    self._latencies.append(time.perf_counter() - start)
+                    return task.result()
+            raise error
+        finally:
+            # 진 쪽 요청이나 호출자가 취소된 경우 남은 요청을 정리
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
@@ -0,0 +1,229 @@
+# app/core/http_client.py
+
+import asyncio
+import time
+import httpx
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+from app.core.config import settings
+from app.core.deadline import Deadline, DeadlineExceeded
+from app.core.metrics import metrics
+from app.core.rate_limit import RETRYABLE_STATUS, UpstreamRateLimiter, backoff_delay, estimate_tokens, parse_retry_after
+
+class UpstreamClient:
+    """
+    업스트림 호스트 하나(OpenAI, Perplexity 등)에 대한 비동기 HTTP 클라이언트입니다.
+    keep-alive 커넥션 풀을 공유하고, 호스트별로 RPM/TPM과 적응형 동시 요청 수를 제한합니다.
+    429와 일시적인 오류는 Retry-After와 지터 백오프를 지켜 retry_deadline초 안에서 재시도합니다.
+    """
+
+    def __init__(self, name: str, base_url: str, max_concurrency: int,
+                 max_connections: int, timeout: float, connect_timeout: float,
+                 rpm: float = 0, tpm: float = 0, max_retries: int = 0,
+                 retry_deadline: float = 0, backoff_base: float = 0.5):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_retries = max_retries
+        self.retry_deadline = retry_deadline
+        self.backoff_base = backoff_base
+        self.limiter = UpstreamRateLimiter(name, rpm=rpm, tpm=tpm, max_concurrency=max_concurrency)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._in_flight = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    async def post_json(self, path: str, headers: Dict[str, str], payload: dict,
+                        timeout: Optional[float] = None, deadline: Optional[Deadline] = None) -> dict:
+        """
+        deadline을 주면 대기열 대기와 재시도를 포함한 전체 호출이 마감 시간 안에 끝나야 하며,
+        넘기면 DeadlineExceeded가 발생합니다.
+        """
+        retry_deadline = time.monotonic() + self.retry_deadline
+        if deadline is not None:
+            retry_deadline = min(retry_deadline, deadline.expires_at)
+        attempt = 0
+        while True:
+            try:
+                return await self._with_deadline(self._post_once(path, headers, payload, timeout), deadline)
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, retry_deadline)
+                if delay is None:
+                    raise
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _post_once(self, path: str, headers: Dict[str, str], payload: dict, timeout: Optional[float]) -> dict:
+        async with self._request(payload):
+            kwargs = {} if timeout is None else {"timeout": timeout}
+            response = await self.client.post(path, headers=headers, json=payload, **kwargs)
+            response.raise_for_status()
+            data = response.json()
+        if isinstance(data, dict):
+            self.record_usage(payload.get("model"), data.get("usage"))
+        return data
+
+    def record_usage(self, model: Optional[str], usage: Optional[dict]):
+        """
+        응답의 usage 필드(프롬프트/완성 토큰 수)를 upstream_tokens_total 지표로 남깁니다.
+        """
+        if not usage:
+            return
+        labels = {"upstream": self.name, "model": model or "unknown"}
+        for kind in ("prompt", "completion"):
+            tokens = usage.get(f"{kind}_tokens")
+            if tokens:
+                metrics.inc("upstream_tokens_total", tokens, {**labels, "kind": kind})
+
+    async def _with_deadline(self, coro, deadline: Optional[Deadline]):
+        if deadline is None:
+            return await coro
+        if deadline.expired:
+            coro.close()
+            metrics.inc("upstream_deadline_exceeded_total", labels={"upstream": self.name})
+            raise DeadlineExceeded(f"{self.name} 호출 전에 마감 시간이 지났습니다.")
+        try:
+            return await asyncio.wait_for(coro, timeout=deadline.remaining())
+        except asyncio.TimeoutError:
+            metrics.inc("upstream_deadline_exceeded_total", labels={"upstream": self.name})
+            raise DeadlineExceeded(f"{self.name} 호출이 마감 시간({deadline.seconds}s) 안에 끝나지 않았습니다.")
+
+    async def stream_lines(self, path: str, headers: Dict[str, str], payload: dict,
+                           timeout: Optional[float] = None, deadline: Optional[Deadline] = None) -> AsyncIterator[str]:
+        """
+        스트리밍 응답(SSE 등)을 줄 단위로 읽어 yield 합니다.
+        첫 줄을 받기 전에 난 오류만 재시도하며, 이미 전달한 내용이 있으면 그대로 예외를 올립니다.
+        deadline을 주면 연결과 각 줄을 기다리는 시간이 남은 시간으로 제한되며, 넘기면 DeadlineExceeded가 발생합니다.
+        """
+        retry_deadline = time.monotonic() + self.retry_deadline
+        if deadline is not None:
+            retry_deadline = min(retry_deadline, deadline.expires_at)
+        attempt = 0
+        while True:
+            started = False
+            try:
+                if deadline is not None and deadline.expired:
+                    metrics.inc("upstream_deadline_exceeded_total", labels={"upstream": self.name})
+                    raise DeadlineExceeded(f"{self.name} 호출 전에 마감 시간이 지났습니다.")
+                async with self._request(payload):
+                    request_timeout = timeout if deadline is None else deadline.timeout(timeout or self.timeout)
+                    kwargs = {} if request_timeout is None else {"timeout": request_timeout}
+                    async with self.client.stream("POST", path, headers=headers, json=payload, **kwargs) as response:
+                        response.raise_for_status()
+                        lines = response.aiter_lines()
+                        while True:
+                            try:
+                                line = await self._with_deadline(lines.__anext__(), deadline)
+                            except StopAsyncIteration:
+                                break
+                            started = True
+                            yield line
+                return
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                delay = None if started else self._retry_delay(e, attempt, retry_deadline)
+                if delay is None:
+                    raise
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def _request(self, payload: dict):
+        labels = {"upstream": self.name}
+        async with self.limiter.slot(estimate_tokens(payload)):
+            self._in_flight += 1
+            metrics.set_gauge("upstream_in_flight", self._in_flight, labels)
+            start = time.perf_counter()
+            try:
+                yield
+                self.limiter.on_success()
+            except Exception:
+                metrics.inc("upstream_errors_total", labels=labels)
+                raise
+            finally:
+                metrics.observe("upstream_request_seconds", time.perf_counter() - start, labels)
+                self._in_flight -= 1
+                metrics.set_gauge("upstream_in_flight", self._in_flight, labels)
+
+    def _retry_delay(self, error: Exception, attempt: int, deadline: float) -> Optional[float]:
+        """
+        재시도할 오류이면 다음 시도까지 기다릴 시간(초)을, 아니면 None을 반환합니다.
+        """
+        retry_after = None
+        if isinstance(error, httpx.HTTPStatusError):
+            status = error.response.status_code
+            if status not in RETRYABLE_STATUS:
+                return None
+            if status in (429, 503):
+                retry_after = parse_retry_after(error.response.headers.get("Retry-After"))
+                self.limiter.on_throttle(retry_after)
+        elif not isinstance(error, httpx.TransportError):
+            return None
+
+        if attempt >= self.max_retries:
+            return None
+        delay = max(backoff_delay(attempt, self.backoff_base), retry_after or 0)
+        if time.monotonic() + delay > deadline:
+            return None
+        metrics.inc("upstream_retries_total", labels={"upstream": self.name})
+        print(f"⚠️ {self.name} 요청 재시도 {attempt + 1}/{self.max_retries} ({delay:.1f}s 후): {error}")
+        return delay
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+_clients: Dict[str, UpstreamClient] = {}
+
+def _build_client(name: str) -> UpstreamClient:
+    if name == "openai":
+        base_url, max_concurrency = settings.OPENAI_BASE_URL, settings.OPENAI_MAX_CONCURRENCY
+        rpm, tpm = settings.OPENAI_RPM, settings.OPENAI_TPM
+    elif name == "perplexity":
+        base_url, max_concurrency = settings.PERPLEXITY_BASE_URL, settings.PERPLEXITY_MAX_CONCURRENCY
+        rpm, tpm = settings.PERPLEXITY_RPM, settings.PERPLEXITY_TPM
+    else:
+        raise ValueError(f"알 수 없는 업스트림입니다: {name}")
+
+    return UpstreamClient(
+        name=name,
+        base_url=base_url,
+        max_concurrency=max_concurrency,
+        max_connections=settings.UPSTREAM_MAX_CONNECTIONS,
+        timeout=settings.UPSTREAM_TIMEOUT_SECONDS,
+        connect_timeout=settings.UPSTREAM_CONNECT_TIMEOUT_SECONDS,
+        rpm=rpm,
+        tpm=tpm,
+        max_retries=settings.UPSTREAM_MAX_RETRIES,
+        retry_deadline=settings.UPSTREAM_RETRY_DEADLINE_SECONDS,
+        backoff_base=settings.UPSTREAM_BACKOFF_BASE_SECONDS,
+    )
+
+def get_upstream(name: str) -> UpstreamClient:
+    client = _clients.get(name)
+    if client is None:
+        client = _clients[name] = _build_client(name)
+    return client
+
+async def close_upstreams():
+    for client in list(_clients.values()):
+        await client.aclose()
+    _clients.clear()
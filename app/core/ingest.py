@@ -0,0 +1,259 @@
+# app/core/ingest.py
+
+import hashlib
+import os
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Iterator, List, Optional
+from app.core.config import settings
+from app.core.dedup import (COMBINATION_FIELD, DEDUP_STATE_FILE, DUPLICATE_COUNT_FIELD, MERGED_FIELDS, DedupReport,
+                            DedupState, dedup_rows, merged_field)
+from app.core.embedding_backends import encoder_cache_name
+from app.core.lexical_index import LEXICAL_FILE
+from app.core.vector_backends import NumpyBackend, current_snapshot, mark_ingested, save_lexical_index, save_numpy_index
+
+CSV_COLUMNS = ["기업명", "경력", "직무", "질문"]
+
+class IngestReport:
+    def __init__(self):
+        self.rows = 0
+        self.added = 0
+        self.skipped = 0
+        self.removed = 0
+        self.invalid = 0
+        self.duplicates = 0
+        self.embedded = 0
+        self.cache_hits = 0
+        self.seconds = 0.0
+        self.dedup: Optional[DedupReport] = None
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    @property
+    def embedded_per_second(self) -> float:
+        return self.embedded / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "added": self.added,
+            "skipped": self.skipped,
+            "removed": self.removed,
+            "invalid": self.invalid,
+            "duplicates": self.duplicates,
+            "embedded": self.embedded,
+            "cache_hits": self.cache_hits,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "embedded_per_second": round(self.embedded_per_second, 1),
+            "dedup": self.dedup.as_dict() if self.dedup else None,
+        }
+
+    def __str__(self):
+        text = (
+            f"읽은 행 {self.rows}, 추가 {self.added}, 변경 없음 {self.skipped}, 삭제 {self.removed}, "
+            f"중복 {self.duplicates}, 빈 질문 {self.invalid}, 임베딩 캐시 적중 {self.cache_hits} "
+            f"({self.seconds:.1f}초, {self.rows_per_second:.0f}행/초, 임베딩 {self.embedded_per_second:.0f}건/초)"
+        )
+        if self.dedup:
+            text += f"\n   중복 제거: {self.dedup}"
+        return text
+
+# 중복 제거로 합쳐진 행에만 있는 메타데이터 필드
+DEDUP_COLUMNS = [merged_field(field) for field in MERGED_FIELDS] + [COMBINATION_FIELD, DUPLICATE_COUNT_FIELD]
+
+def dedup_state(directory: str, threshold: float, load: bool = True) -> DedupState:
+    """
+    저장소 디렉터리에 함께 두는 중복 제거 상태입니다. 임베딩 모델이 바뀌면 이전 상태는 쓰지 않습니다.
+    """
+    model_name = encoder_cache_name(settings.EMBEDDING_BACKEND, settings.EMBEDDING_MODEL_NAME)
+    return DedupState(os.path.join(directory, DEDUP_STATE_FILE), model_name, threshold, load=load)
+
+def row_id(row: Dict[str, str]) -> str:
+    """
+    (질문, 기업명, 경력, 직무) 내용으로 만든 해시입니다. 내용이 같으면 같은 id가 됩니다.
+    중복 제거로 합쳐진 행은 합쳐진 메타데이터도 포함하므로, 클러스터가 바뀌면 다시 저장됩니다.
+    """
+    columns = ["질문", "기업명", "경력", "직무"] + [column for column in DEDUP_COLUMNS if row.get(column)]
+    key = "\x1f".join(str(row.get(column, "")).strip() for column in columns)
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+def format_document(row: Dict[str, str]):
+    content = f"{row['질문']} [기업명: {row['기업명']}, 경력: {row['경력']}, 직무: {row['직무']}]"
+    metadata = {"기업명": row["기업명"], "경력": row["경력"], "직무": row["직무"]}
+    metadata.update({column: row[column] for column in DEDUP_COLUMNS if row.get(column)})
+    return content, metadata
+
+def iter_csv_rows(csv_filename: str, chunksize: int = 500) -> Iterator[Dict[str, str]]:
+    """
+    CSV를 chunksize 행씩 읽어 한 행씩 dict로 반환합니다.
+    """
+    for chunk in pd.read_csv(csv_filename, chunksize=chunksize, dtype=str, keep_default_na=False):
+        for values in chunk[CSV_COLUMNS].itertuples(index=False, name=None):
+            yield dict(zip(CSV_COLUMNS, values))
+
+class _Pending:
+    """
+    새로 임베딩할 행을 모아 batch_size마다 한 번에 임베딩하고 저장합니다.
+    """
+
+    def __init__(self, embedder, batch_size: int, flush):
+        self.embedder = embedder
+        self.batch_size = batch_size
+        self._flush = flush
+        self.ids: List[str] = []
+        self.contents: List[str] = []
+        self.metadatas: List[dict] = []
+
+    def add(self, doc_id: str, content: str, metadata: dict, report: IngestReport):
+        self.ids.append(doc_id)
+        self.contents.append(content)
+        self.metadatas.append(metadata)
+        if len(self.ids) >= self.batch_size:
+            self.flush(report)
+
+    def flush(self, report: IngestReport):
+        if not self.ids:
+            return
+        embeddings = self.embedder.encode(self.contents)
+        self._flush(self.ids, embeddings, self.contents, self.metadatas)
+        report.embedded += len(self.ids)
+        report.added += len(self.ids)
+        self.ids, self.contents, self.metadatas = [], [], []
+
+def ingest(csv_filename: str = "dataset_question.csv", backend: str = settings.VECTOR_BACKEND,
+           embedder=None, batch_size: int = 64, chunksize: int = 500, dedup: bool = settings.DEDUP_ENABLED,
+           dedup_threshold: float = settings.DEDUP_SIMILARITY_THRESHOLD) -> IngestReport:
+    """
+    CSV를 스트리밍으로 읽어 새로 생기거나 바뀐 행만 임베딩해 저장소에 반영하고,
+    CSV에서 사라진 행은 저장소에서 삭제합니다.
+    dedup이 True이면 CSV 전체를 읽어 중복 질문을 대표 행 하나로 합친 뒤 반영합니다. (app.core.dedup)
+    유사 중복 비교는 저장소에 남겨 둔 상태를 이어 쓰므로 지난 ingest 이후 새로 생긴 질문만 임베딩합니다.
+    """
+    if not os.path.exists(csv_filename):
+        raise FileNotFoundError(f"{csv_filename} 파일이 없습니다.")
+
+    if embedder is None:
+        from app.core.vector_utils import create_embedder
+        embedder = create_embedder(settings.EMBEDDING_MODEL_NAME)
+
+    cache = getattr(embedder, "cache", None)
+    hits_before = sum(cache.hits.values()) if cache else 0
+
+    if backend not in ("chroma", "numpy"):
+        raise ValueError(f"지원하지 않는 벡터 백엔드입니다: {backend}")
+
+    start = time.perf_counter()
+    report = IngestReport()
+    rows = _valid_rows(csv_filename, chunksize, report)
+    state = None
+    if dedup:
+        state = dedup_state(settings.CHROMA_DB_PATH if backend == "chroma" else settings.NUMPY_INDEX_DIR, dedup_threshold)
+        rows, report.dedup = dedup_rows(list(rows), embedder, threshold=dedup_threshold, state=state)
+
+    if backend == "chroma":
+        _ingest_chroma(rows, embedder, batch_size, report)
+    else:
+        _ingest_numpy(rows, embedder, batch_size, report)
+    # 저장소 반영이 끝난 뒤에만 저장해야 중간에 실패해도 다음 ingest가 같은 결과를 다시 반영함
+    if state is not None:
+        state.save()
+    report.seconds = time.perf_counter() - start
+
+    if cache:
+        report.cache_hits = sum(cache.hits.values()) - hits_before
+    return report
+
+def _valid_rows(csv_filename: str, chunksize: int, report: IngestReport) -> Iterator[Dict[str, str]]:
+    for row in iter_csv_rows(csv_filename, chunksize):
+        report.rows += 1
+        if not row["질문"].strip():
+            report.invalid += 1
+            continue
+        yield row
+
+def _scan(rows: Iterable[Dict[str, str]], existing, report: IngestReport, on_new, on_existing=None):
+    seen = set()
+    for row in rows:
+        doc_id = row_id(row)
+        if doc_id in seen:
+            report.duplicates += 1
+            continue
+        seen.add(doc_id)
+
+        if doc_id in existing:
+            report.skipped += 1
+            if on_existing is not None:
+                on_existing(doc_id)
+            continue
+
+        content, metadata = format_document(row)
+        on_new(doc_id, content, metadata)
+    return seen
+
+def _ingest_chroma(rows: Iterable[Dict[str, str]], embedder, batch_size: int, report: IngestReport):
+    from langchain_community.vectorstores import Chroma
+
+    # 기존 컬렉션에 upsert/delete 하므로 ingest 중에도 검색이 가능
+    collection = Chroma(persist_directory=settings.CHROMA_DB_PATH, embedding_function=embedder)._collection
+    existing = set(collection.get(include=[])["ids"])
+
+    def upsert(ids, embeddings, contents, metadatas):
+        collection.upsert(ids=ids, embeddings=np.asarray(embeddings).tolist(), documents=contents, metadatas=metadatas)
+
+    pending = _Pending(embedder, batch_size, upsert)
+    seen = _scan(rows, existing, report,
+                 lambda doc_id, content, metadata: pending.add(doc_id, content, metadata, report))
+    pending.flush(report)
+
+    removed = list(existing - seen)
+    for i in range(0, len(removed), batch_size):
+        collection.delete(ids=removed[i:i + batch_size])
+    report.removed = len(removed)
+
+    # 문자 n-gram 검색 색인도 함께 갱신 (하이브리드 검색용)
+    if report.added or report.removed or not os.path.exists(os.path.join(settings.CHROMA_DB_PATH, LEXICAL_FILE)):
+        stored = collection.get(include=["documents"])
+        save_lexical_index(settings.CHROMA_DB_PATH, stored["documents"], stored["ids"])
+        mark_ingested(settings.CHROMA_DB_PATH)
+
+def _ingest_numpy(rows: Iterable[Dict[str, str]], embedder, batch_size: int, report: IngestReport):
+    index_dir = settings.NUMPY_INDEX_DIR
+
+    # 현재 스냅샷은 그대로 두고 새 스냅샷을 만든 뒤 CURRENT만 교체
+    old: Optional[NumpyBackend] = NumpyBackend(index_dir) if current_snapshot(index_dir) else None
+    old_rows = {doc_id: i for i, doc_id in enumerate(old.ids)} if old else {}
+
+    ids: List[str] = []
+    contents: List[str] = []
+    metadatas: List[dict] = []
+    vectors: List[np.ndarray] = []
+
+    def keep(doc_id):
+        row = old_rows[doc_id]
+        ids.append(doc_id)
+        contents.append(old.documents[row])
+        metadatas.append(old.metadatas[row])
+        vectors.append(np.asarray(old.embeddings[row:row + 1]))
+
+    def append(new_ids, embeddings, new_contents, new_metadatas):
+        ids.extend(new_ids)
+        contents.extend(new_contents)
+        metadatas.extend(new_metadatas)
+        vectors.append(np.asarray(embeddings, dtype=np.float32))
+
+    pending = _Pending(embedder, batch_size, append)
+    seen = _scan(rows, old_rows, report,
+                 lambda doc_id, content, metadata: pending.add(doc_id, content, metadata, report),
+                 on_existing=keep)
+    pending.flush(report)
+    report.removed = len(set(old_rows) - seen)
+
+    # 모든 행이 삭제되었어도 빈 스냅샷을 저장해야 삭제된 행이 검색되지 않음
+    if report.added or report.removed or (old is None and contents):
+        dim = old.embeddings.shape[1] if old is not None else 0
+        embeddings = np.concatenate(vectors) if vectors else np.empty((0, dim), dtype=np.float32)
+        save_numpy_index(index_dir, embeddings, contents, metadatas, settings.EMBEDDING_MODEL_NAME, ids=ids)
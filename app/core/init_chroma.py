@@ -1,45 +1,93 @@
 # app/core/init_chroma.py
 
+import argparse
 import os
 import pandas as pd
 import shutil
-from sentence_transformers import SentenceTransformer
 from langchain_community.vectorstores import Chroma
 from langchain.docstore.document import Document
+from app.core.config import settings
+from app.core.dedup import dedup_rows
+from app.core.ingest import dedup_state, format_document, ingest, row_id
+from app.core.vector_backends import mark_ingested, save_lexical_index, save_numpy_index
+from app.core.vector_utils import create_embedder
 
-class LangChainSentenceTransformer:
-    def __init__(self, model_name):
-        self.model = SentenceTransformer(model_name)
-
-    def embed_documents(self, texts):
-        return self.model.encode(texts, show_progress_bar=True).tolist()
-
-    def embed_query(self, text):
-        return self.model.encode([text])[0]
-
-def init_db(csv_filename="dataset_question.csv", persist_directory="./db"):
+def init_db(csv_filename="dataset_question.csv", persist_directory="./db", backend="chroma",
+            index_dir=settings.NUMPY_INDEX_DIR, dedup=settings.DEDUP_ENABLED,
+            dedup_threshold=settings.DEDUP_SIMILARITY_THRESHOLD):
+    """
+    기존 저장소를 지우고 CSV 전체를 다시 임베딩합니다. 평소에는 증분 ingest를 사용하세요.
+    """
     if not os.path.exists(csv_filename):
         raise FileNotFoundError(f"{csv_filename} 파일이 없습니다.")
     
-    df = pd.read_csv(csv_filename)
+    df = pd.read_csv(csv_filename, dtype=str, keep_default_na=False)
+
+    rows = [
+        row
+        for row in df.to_dict("records")
+        if row["질문"].strip() != ""
+    ]
 
+    # 임베딩 캐시를 거치므로 이미 계산한 문장은 다시 인코딩하지 않음
+    embedder = create_embedder(settings.EMBEDDING_MODEL_NAME, show_progress_bar=True)
+
+    # 이전 상태를 무시하고 전체를 다시 묶은 뒤, 이후 증분 ingest가 이어 쓸 수 있도록 저장
+    state = None
+    if dedup:
+        state = dedup_state(index_dir if backend == "numpy" else persist_directory, dedup_threshold, load=False)
+        rows, report = dedup_rows(rows, embedder, threshold=dedup_threshold, state=state)
+        print(f"✅ 중복 제거: {report}")
+
+    ids = list(dict.fromkeys(row_id(row) for row in rows))
+    rows = list({row_id(row): row for row in rows}.values())
     documents = [
-        Document(
-            page_content=f"{row['질문']} [기업명: {row['기업명']}, 경력: {row['경력']}, 직무: {row['직무']}]",
-            metadata={"기업명": row["기업명"], "경력": row["경력"], "직무": row["직무"]}
-        )
-        for _, row in df.iterrows()
-        if pd.notna(row["질문"]) and row["질문"].strip() != ""
+        Document(page_content=content, metadata=metadata)
+        for content, metadata in map(format_document, rows)
     ]
 
-    embedder = LangChainSentenceTransformer("paraphrase-multilingual-MiniLM-L12-v2")
+    if backend == "numpy":
+        contents = [doc.page_content for doc in documents]
+        embeddings = embedder.encode(contents)
+        save_numpy_index(index_dir, embeddings, contents, [doc.metadata for doc in documents],
+                         settings.EMBEDDING_MODEL_NAME, ids=ids)
+        if state is not None:
+            state.save()
+        print(f"✅ NumPy 인덱스 생성 완료 ({index_dir}). 총 문서 수: {len(documents)}")
+        return
 
     if os.path.exists(persist_directory):
         shutil.rmtree(persist_directory)
     
-    db = Chroma.from_documents(documents, embedder, persist_directory=persist_directory)
+    db = Chroma.from_documents(documents, embedder, ids=ids, persist_directory=persist_directory)
+    stored = db._collection.get(include=["documents"])
+    save_lexical_index(persist_directory, stored["documents"], stored["ids"])
+    if state is not None:
+        state.save()
+    mark_ingested(persist_directory)
     print(f"✅ DB 초기화 완료. 총 문서 수: {len(documents)}")
 
-# CLI 실행용
+    cache = getattr(embedder, "cache", None)
+    if cache:
+        print(f"   임베딩 캐시: {cache.stats()}")
+
+# CLI 실행용 (python -m app.core.init_chroma)
 if __name__ == "__main__":
-    init_db()
+    parser = argparse.ArgumentParser(description="면접 질문 벡터 DB 초기화")
+    parser.add_argument("--csv", default="dataset_question.csv")
+    parser.add_argument("--backend", choices=["chroma", "numpy"], default=settings.VECTOR_BACKEND)
+    parser.add_argument("--rebuild", action="store_true", help="기존 저장소를 지우고 전체를 다시 임베딩")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--no-dedup", action="store_true", help="중복 질문을 합치지 않고 그대로 반영")
+    parser.add_argument("--dedup-threshold", type=float, default=settings.DEDUP_SIMILARITY_THRESHOLD,
+                        help="같은 질문으로 볼 코사인 유사도 (1이면 완전 중복만 제거)")
+    args = parser.parse_args()
+    dedup = settings.DEDUP_ENABLED and not args.no_dedup
+
+    if args.rebuild:
+        init_db(csv_filename=args.csv, persist_directory=settings.CHROMA_DB_PATH, backend=args.backend,
+                dedup=dedup, dedup_threshold=args.dedup_threshold)
+    else:
+        report = ingest(csv_filename=args.csv, backend=args.backend, batch_size=args.batch_size,
+                        dedup=dedup, dedup_threshold=args.dedup_threshold)
+        print(f"✅ 증분 반영 완료 ({args.backend}). {report}")
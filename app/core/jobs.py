@@ -0,0 +1,309 @@
+# app/core/jobs.py
+
+import asyncio
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from app.core.config import settings
+from app.core.deadline import Deadline
+from app.core.metrics import metrics
+
+# 다른 워커가 실행 중인 작업을 롱 폴링할 때 저장소를 다시 읽는 간격(초)
+STORE_POLL_SECONDS = 0.5
+
+class QueueFullError(Exception):
+    """
+    작업 대기열이 가득 차 새 작업을 받을 수 없을 때 발생합니다. retry_after는 다시 시도할 때까지의 권장 대기 시간(초)입니다.
+    """
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"작업 대기열이 가득 찼습니다. {retry_after}초 후 다시 시도해주세요.")
+        self.retry_after = retry_after
+
+class Job:
+    def __init__(self, kind: str, func: Callable[..., Awaitable[Any]], kwargs: Dict[str, Any]):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = "queued"  # queued | running | done | failed
+        self.result = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._func = func
+        self._kwargs = kwargs
+        self._done = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def as_dict(self) -> dict:
+        return {
+            "jobId": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "createdAt": self.created_at,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+        }
+
+class SQLiteJobStore:
+    """
+    작업 상태를 로컬 SQLite 파일에 기록합니다. 작업은 접수한 워커에서 실행되고,
+    같은 파일을 여는 다른 uvicorn 워커는 이 기록으로 상태와 결과를 조회합니다.
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, data TEXT NOT NULL, finished_at REAL)"
+        )
+        self._conn.commit()
+
+    def save(self, job: dict):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (id, data, finished_at) VALUES (?, ?, ?)",
+                (job["jobId"], json.dumps(job, ensure_ascii=False), job["finishedAt"]),
+            )
+            self._conn.commit()
+
+    def load(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def delete_finished_before(self, when: float) -> int:
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM jobs WHERE finished_at < ?", (when,)).rowcount
+            self._conn.commit()
+        return deleted
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class JobManager:
+    """
+    오래 걸리는 분석 요청을 대기열에 넣고 정해진 수의 워커가 순서대로 실행합니다.
+    대기열이 가득 차면 QueueFullError로 거절하고, 끝난 작업은 ttl초 뒤 정리합니다.
+    작업마다 실행을 시작한 때부터 timeout초의 Deadline을 주어, 느린 업스트림이 워커를 오래 붙잡지 않도록 합니다.
+    store가 있으면 상태를 함께 기록해 다른 uvicorn 워커에서도 조회할 수 있습니다.
+    """
+
+    def __init__(self, name: str, workers: int, queue_size: int, ttl: float, timeout: float,
+                 store: Optional[SQLiteJobStore] = None):
+        self.name = name
+        self.workers = workers
+        self.queue_size = queue_size
+        self.ttl = ttl
+        self.timeout = timeout
+        self.store = store
+        self.jobs: Dict[str, Job] = {}
+        self.running = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        # 대기열 길이로 Retry-After를 계산할 때 쓰는 최근 실행 시간 (지수 이동 평균)
+        self._avg_run_seconds = 1.0
+
+    @property
+    def started(self) -> bool:
+        return bool(self._tasks)
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self):
+        if self.started:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._cleanup()))
+        self._update_gauges()
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+        # 실행되지 못한 작업도 다른 워커에서 조회할 때 끝난 것으로 보이도록 기록
+        for job in self.jobs.values():
+            if not job.finished:
+                job.status = "failed"
+                job.error = "서버 종료로 작업이 취소되었습니다."
+                job.finished_at = time.time()
+                await self._persist(job)
+
+    async def submit(self, kind: str, func: Callable[..., Awaitable[Any]], **kwargs) -> Job:
+        if not self.started:
+            raise RuntimeError("작업 관리자가 시작되지 않았습니다.")
+
+        job = Job(kind, func, kwargs)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            metrics.inc("jobs_rejected_total", labels={"manager": self.name, "kind": kind})
+            raise QueueFullError(self.retry_after())
+
+        self.jobs[job.id] = job
+        metrics.inc("jobs_submitted_total", labels={"manager": self.name, "kind": kind})
+        self._update_gauges()
+        await self._persist(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    async def lookup(self, job_id: str, wait: float = 0) -> Optional[dict]:
+        """
+        작업 상태를 반환합니다. 이 워커의 작업이 아니면 저장소에서 읽고, wait초 동안 끝나기를 기다립니다. (롱 폴링용)
+        """
+        job = self.jobs.get(job_id)
+        if job is not None:
+            await self.wait(job, wait)
+            return job.as_dict()
+        if self.store is None:
+            return None
+
+        until = time.monotonic() + wait
+        while True:
+            data = await asyncio.to_thread(self.store.load, job_id)
+            remaining = until - time.monotonic()
+            if data is None or data["status"] in ("done", "failed") or remaining <= 0:
+                return data
+            await asyncio.sleep(min(STORE_POLL_SECONDS, remaining))
+
+    async def wait(self, job: Job, timeout: float) -> Job:
+        """
+        작업이 끝나거나 timeout초가 지날 때까지 기다립니다. (롱 폴링용)
+        """
+        if timeout > 0 and not job.finished:
+            try:
+                await asyncio.wait_for(job._done.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        return job
+
+    def retry_after(self) -> int:
+        # 앞선 작업들이 모두 빠지는 데 걸릴 예상 시간
+        return max(1, math.ceil((self.depth + self.running) * self._avg_run_seconds / max(1, self.workers)))
+
+    def stats(self) -> dict:
+        counts: Dict[str, int] = {}
+        for job in self.jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "name": self.name,
+            "workers": self.workers,
+            "queue_depth": self.depth,
+            "queue_size": self.queue_size,
+            "running": self.running,
+            "jobs": counts,
+            "avg_run_seconds": round(self._avg_run_seconds, 3),
+        }
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job):
+        labels = {"manager": self.name, "kind": job.kind}
+        job.status = "running"
+        job.started_at = time.time()
+        metrics.observe("job_queue_wait_seconds", job.started_at - job.created_at, labels)
+        self.running += 1
+        self._update_gauges()
+        await self._persist(job)
+
+        start = time.perf_counter()
+        try:
+            # 서비스 함수는 Deadline으로 업스트림 호출을 줄이고, wait_for는 그래도 끝나지 않을 때 작업을 끊음
+            job._kwargs["deadline"] = Deadline(self.timeout)
+            job.result = await asyncio.wait_for(job._func(**job._kwargs), timeout=self.timeout)
+            job.status = "done"
+        except asyncio.TimeoutError:
+            print(f"❌ {job.kind} 작업 시간 초과 ({job.id})")
+            job.status = "failed"
+            job.error = f"작업 마감 시간({self.timeout}s)이 지났습니다."
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.error = "서버 종료로 작업이 취소되었습니다."
+            raise
+        except Exception as e:
+            print(f"❌ {job.kind} 작업 실패 ({job.id}): {e}")
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            seconds = time.perf_counter() - start
+            self._avg_run_seconds = 0.8 * self._avg_run_seconds + 0.2 * seconds
+            job.finished_at = time.time()
+            job._func = job._kwargs = None
+            job._done.set()
+            self.running -= 1
+            metrics.observe("job_run_seconds", seconds, labels)
+            metrics.inc("jobs_finished_total", labels={**labels, "status": job.status})
+            self._update_gauges()
+        await self._persist(job)
+
+    async def _persist(self, job: Job):
+        if self.store is None:
+            return
+        try:
+            await asyncio.to_thread(self.store.save, job.as_dict())
+        except Exception as e:
+            print(f"⚠️ 작업 상태 저장 실패 ({job.id}): {e}")
+
+    async def _cleanup(self):
+        while True:
+            await asyncio.sleep(min(self.ttl, 60))
+            now = time.time()
+            expired = [job_id for job_id, job in self.jobs.items() if job.finished and now - job.finished_at > self.ttl]
+            for job_id in expired:
+                del self.jobs[job_id]
+            if self.store is not None:
+                await asyncio.to_thread(self.store.delete_finished_before, now - self.ttl)
+            if expired:
+                metrics.inc("jobs_expired_total", len(expired), labels={"manager": self.name})
+                self._update_gauges()
+
+    def _update_gauges(self):
+        labels = {"manager": self.name}
+        metrics.set_gauge("jobs_queue_depth", self.depth, labels)
+        metrics.set_gauge("jobs_running", self.running, labels)
+        metrics.set_gauge("jobs_stored", len(self.jobs), labels)
+
+def _build_job_store() -> Optional[SQLiteJobStore]:
+    if settings.JOB_STORE == "sqlite":
+        return SQLiteJobStore(settings.JOB_STORE_PATH)
+    if settings.JOB_STORE == "memory":
+        return None
+    raise ValueError(f"지원하지 않는 작업 저장소입니다: {settings.JOB_STORE}")
+
+job_manager = JobManager(
+    "interview",
+    workers=settings.JOB_WORKERS,
+    queue_size=settings.JOB_QUEUE_SIZE,
+    ttl=settings.JOB_TTL_SECONDS,
+    timeout=settings.JOB_TIMEOUT_SECONDS,
+    store=_build_job_store(),
+)
@@ -0,0 +1,55 @@
+# app/core/loop_lag.py
+
+import asyncio
+import collections
+import time
+import numpy as np
+from app.core.config import settings
+from app.core.metrics import metrics
+
+class LoopLagMonitor:
+    """
+    이벤트 루프 지연을 잽니다. interval마다 sleep한 뒤 예정보다 늦게 깨어난 시간을 기록하므로
+    루프를 막는 동기 코드(임베딩, 큰 JSON 처리 등)가 있으면 값이 커집니다.
+    """
+
+    def __init__(self, interval: float, window: int = 4096):
+        self.interval = interval
+        self.samples = collections.deque(maxlen=window)
+        self._task = None
+
+    def start(self):
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - start - self.interval)
+            self.samples.append(lag)
+            metrics.observe("event_loop_lag_seconds", lag)
+
+    def stats(self, reset: bool = False) -> dict:
+        values = np.asarray(self.samples, dtype=np.float64) * 1000
+        if reset:
+            self.samples.clear()
+        if not len(values):
+            return {"samples": 0}
+        return {
+            "samples": len(values),
+            "p50_ms": round(float(np.percentile(values, 50)), 2),
+            "p99_ms": round(float(np.percentile(values, 99)), 2),
+            "max_ms": round(float(values.max()), 2),
+        }
+
+loop_lag = LoopLagMonitor(settings.LOOP_LAG_INTERVAL_SECONDS)
@@ -0,0 +1,180 @@
+# app/core/metadata_index.py
+
+import difflib
+import re
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from app.core.dedup import COMBINATION_FIELD, MERGED_FIELDS, merged_field, split_combinations, split_merged
+from app.core.normalize import normalize_query
+
+# API 필터 이름 -> 데이터셋 메타데이터 필드
+FILTER_FIELDS = {
+    "company": "기업명",
+    "career": "경력",
+    "position": "직무",
+}
+
+# 경력/직무처럼 짧은 라벨은 부분 일치로 볼 최소 길이 비율(짧은 단어 / 긴 단어)을 둠
+# "개발자" -> "앱개발자"(0.75)는 맞추고 "경력" -> "경력무관"(0.5)은 거름. 기업명은 "삼성" -> "삼성전자"처럼 비율 없이 맞춤
+MIN_SUBSTRING_OVERLAP = 0.6
+OVERLAP_RATIO_FIELDS = ("경력", "직무")
+
+# 영문으로 입력한 기업명을 데이터셋 표기로 바꿈 (예: "LG" -> "엘지" -> "엘지전자㈜")
+COMPANY_ALIASES = {
+    "lg": "엘지",
+    "samsung": "삼성",
+    "hyundai": "현대",
+    "naver": "네이버",
+    "kakao": "카카오",
+}
+
+_WORD = re.compile(r"\w+")
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall(text)
+
+class MetadataIndex:
+    """
+    메타데이터 값 -> 행 번호 목록의 역색인입니다.
+    필터 값은 정규화 후 일치, 단어 단위 일치, 부분 일치, 유사 문자열 순서로 실제 값에 대응시킵니다.
+    (예: "현대모비스" -> "현대모비스㈜", "삼성" -> "삼성전자㈜", "연구개발" -> "인성면접 - 연구개발", "개발자" -> "일반면접 - 앱개발자")
+    중복 제거로 합쳐진 행은 "<필드>목록"의 값들로도 찾을 수 있으며, 필드 여러 개로 거르면
+    합쳐진 행들에 실제로 있던 조합("조합목록")만 맞춰집니다. (예: A사 신입 + B사 경력이 합쳐진 행은 "A사 경력"에 걸리지 않음)
+    """
+
+    def __init__(self, metadatas: List[dict]):
+        self.size = len(metadatas)
+        self.postings: Dict[str, Dict[str, np.ndarray]] = {}
+        self._normalized: Dict[str, Dict[str, List[str]]] = {}
+        # 값 -> 그 값을 포함하는 "<필드>목록" 문자열들 (Chroma where 조건용)
+        self._merged: Dict[str, Dict[str, List[str]]] = {}
+        # 행 번호 -> 합쳐진 행들의 (기업명, 경력, 직무) 조합
+        self.combinations: Dict[int, List[Tuple[str, ...]]] = {}
+        # "조합목록" 문자열 -> 조합 (Chroma where 조건용)
+        self._combination_values: Dict[str, List[Tuple[str, ...]]] = {}
+
+        for row, meta in enumerate(metadatas):
+            value = meta.get(COMBINATION_FIELD)
+            if isinstance(value, str) and value:
+                self.combinations[row] = self._combination_values.setdefault(value, split_combinations(value))
+
+        for field in FILTER_FIELDS.values():
+            rows: Dict[str, List[int]] = {}
+            merged_values: Dict[str, List[str]] = {}
+            for row, meta in enumerate(metadatas):
+                values = [meta.get(field)]
+                merged = meta.get(merged_field(field))
+                if isinstance(merged, str):
+                    for value in split_merged(merged):
+                        values.append(value)
+                        if merged not in merged_values.setdefault(value, []):
+                            merged_values[value].append(merged)
+                for value in dict.fromkeys(values):
+                    if isinstance(value, str) and value:
+                        rows.setdefault(value, []).append(row)
+
+            self.postings[field] = {value: np.asarray(ids, dtype=np.int64) for value, ids in rows.items()}
+            normalized: Dict[str, List[str]] = {}
+            for value in rows:
+                normalized.setdefault(normalize_query(value), []).append(value)
+            self._normalized[field] = normalized
+            self._merged[field] = merged_values
+
+    def resolve(self, name: str, value: str) -> List[str]:
+        field = FILTER_FIELDS[name]
+        normalized = self._normalized.get(field, {})
+        key = normalize_query(value)
+        if not key:
+            return []
+        if field == "기업명":
+            key = " ".join(COMPANY_ALIASES.get(word, word) for word in key.split(" "))
+
+        # 1. 정규화 후 일치
+        if key in normalized:
+            return list(normalized[key])
+
+        # 2. 단어 단위 일치 (한쪽의 단어가 모두 다른 쪽에 있음, 예: "연구개발" -> "인성면접 - 연구개발")
+        key_words = set(_words(key))
+        words = {norm: set(_words(norm)) for norm in normalized}
+        matched = [
+            raw for norm, raws in normalized.items()
+            if words[norm] and key_words and (key_words <= words[norm] or words[norm] <= key_words)
+            for raw in raws
+        ]
+        if matched:
+            return matched
+
+        # 3. 단어 안의 부분 일치 (예: "삼성" -> "삼성전자㈜", 경력/직무는 짧은 쪽이 긴 쪽의 MIN_SUBSTRING_OVERLAP 이상일 때만)
+        min_overlap = MIN_SUBSTRING_OVERLAP if field in OVERLAP_RATIO_FIELDS else 0.0
+        matched = [
+            raw for norm, raws in normalized.items()
+            if any(_overlaps(a, b, min_overlap) for a in key_words for b in words[norm])
+            for raw in raws
+        ]
+        if matched:
+            return matched
+
+        # 4. 유사 문자열
+        close = difflib.get_close_matches(key, list(normalized), n=3, cutoff=0.75)
+        return [raw for norm in close for raw in normalized[norm]]
+
+    def resolve_filters(self, filters: Optional[Dict[str, str]]) -> Dict[str, List[str]]:
+        """
+        {"company": "현대모비스"} 같은 필터를 {"기업명": ["현대모비스㈜"]} 형태로 바꿉니다.
+        """
+        return {
+            FILTER_FIELDS[name]: self.resolve(name, value)
+            for name, value in (filters or {}).items()
+            if value
+        }
+
+    def unresolved(self, filters: Optional[Dict[str, str]]) -> List[str]:
+        """
+        값이 있지만 데이터셋의 어떤 값에도 대응되지 않는 필터 이름들입니다.
+        """
+        return [name for name, value in (filters or {}).items() if value and not self.resolve(name, value)]
+
+    def merged_values(self, field: str, values: List[str]) -> List[str]:
+        return list(dict.fromkeys(merged for value in values for merged in self._merged.get(field, {}).get(value, [])))
+
+    def combination_values(self, resolved: Dict[str, List[str]]) -> List[str]:
+        """
+        resolve_filters 결과의 모든 필드를 한 조합 안에서 만족하는 "조합목록" 문자열들입니다.
+        """
+        return [value for value, combinations in self._combination_values.items() if _any_match(combinations, resolved)]
+
+    def candidates(self, filters: Optional[Dict[str, str]]) -> Optional[np.ndarray]:
+        """
+        필터를 모두 만족하는 행 번호를 정렬된 배열로 반환합니다. 필터가 없으면 None입니다.
+        """
+        resolved = self.resolve_filters(filters)
+        if not resolved:
+            return None
+
+        rows = None
+        for field, values in resolved.items():
+            postings = [self.postings[field][value] for value in values]
+            field_rows = np.unique(np.concatenate(postings)) if postings else np.empty(0, dtype=np.int64)
+            rows = field_rows if rows is None else np.intersect1d(rows, field_rows, assume_unique=True)
+
+        # 필드마다 따로 맞춘 합쳐진 행은 실제로 있던 조합으로 다시 확인
+        if len(resolved) > 1 and self.combinations:
+            keep = [row not in self.combinations or _any_match(self.combinations[row], resolved) for row in rows.tolist()]
+            rows = rows[np.asarray(keep, dtype=bool)]
+        return rows
+
+def _overlaps(a: str, b: str, min_overlap: float) -> bool:
+    short, long = (a, b) if len(a) <= len(b) else (b, a)
+    return short in long and len(short) / len(long) >= min_overlap
+
+def _any_match(combinations: List[Tuple[str, ...]], resolved: Dict[str, List[str]]) -> bool:
+    positions = {field: i for i, field in enumerate(MERGED_FIELDS)}
+    return any(
+        all(combination[positions[field]] in values for field, values in resolved.items())
+        for combination in combinations
+    )
+
+def filter_key(filters: Optional[Dict[str, str]]) -> str:
+    if not filters:
+        return ""
+    return "|".join(f"{name}={normalize_query(value)}" for name, value in sorted(filters.items()) if value)
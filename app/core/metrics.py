@@ -0,0 +1,155 @@
+# app/core/metrics.py
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# 타이밍 히스토그램 구간 경계(초) - 임베딩(ms 단위)부터 GPT 호출(수십 초)까지
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _label_key(labels: Optional[Dict[str, str]]) -> LabelKey:
+    if not labels:
+        return ()
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+class Metrics:
+    """
+    프로세스 전역 카운터/게이지/타이밍 수집기입니다.
+    타이밍은 count/sum/min/max와 함께 히스토그램 구간별 개수를 기록하며, /metrics에서 Prometheus 형식으로 내보냅니다.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        self._gauges: Dict[Tuple[str, LabelKey], float] = {}
+        self._timings: Dict[Tuple[str, LabelKey], Dict[str, float]] = {}
+        self._histograms: Dict[Tuple[str, LabelKey], List[int]] = {}
+
+    def inc(self, name: str, value: float = 1, labels: Optional[Dict[str, str]] = None):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name: str, seconds: float, labels: Optional[Dict[str, str]] = None):
+        key = (name, _label_key(labels))
+        with self._lock:
+            stat = self._timings.get(key)
+            if stat is None:
+                stat = {"count": 0, "sum": 0.0, "min": seconds, "max": seconds, "last": seconds}
+                self._timings[key] = stat
+            stat["count"] += 1
+            stat["sum"] += seconds
+            stat["min"] = min(stat["min"], seconds)
+            stat["max"] = max(stat["max"], seconds)
+            stat["last"] = seconds
+            counts = self._histograms.get(key)
+            if counts is None:
+                counts = self._histograms[key] = [0] * (len(self.buckets) + 1)
+            counts[bisect.bisect_left(self.buckets, seconds)] += 1
+
+    @contextmanager
+    def timer(self, name: str, labels: Optional[Dict[str, str]] = None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, labels)
+
+    def snapshot(self) -> Dict[str, list]:
+        def _render(store):
+            return [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(store.items())
+            ]
+
+        with self._lock:
+            return {
+                "counters": _render(self._counters),
+                "gauges": _render(self._gauges),
+                "timings": _render({k: dict(v) for k, v in self._timings.items()}),
+            }
+
+    def hit_ratios(self) -> List[dict]:
+        """
+        *_hits_total / *_misses_total 카운터 쌍으로 캐시 적중률을 계산합니다.
+        임베딩 캐시처럼 적중에만 있는 tier 라벨은 합쳐서 계산합니다.
+        """
+        hits: Dict[Tuple[str, LabelKey], float] = {}
+        misses: Dict[Tuple[str, LabelKey], float] = {}
+        with self._lock:
+            for (name, labels), value in self._counters.items():
+                for suffix, store in (("_hits_total", hits), ("_misses_total", misses)):
+                    if name.endswith(suffix):
+                        key = (name[:-len(suffix)], tuple(item for item in labels if item[0] != "tier"))
+                        store[key] = store.get(key, 0) + value
+
+        ratios = []
+        for key in sorted(set(hits) | set(misses)):
+            total = hits.get(key, 0) + misses.get(key, 0)
+            if total:
+                source, labels = key
+                ratios.append({"name": "cache_hit_ratio", "labels": {"source": source, **dict(labels)},
+                               "value": hits.get(key, 0) / total})
+        return ratios
+
+    def render_prometheus(self) -> str:
+        """
+        Prometheus 텍스트 형식(0.0.4)으로 모든 지표를 내보냅니다.
+        """
+        lines: List[str] = []
+
+        def _sample(name: str, labels: LabelKey, value: float, extra: Tuple[Tuple[str, str], ...] = ()):
+            items = labels + extra
+            rendered = ",".join(f'{k}="{_escape(v)}"' for k, v in items)
+            lines.append(f"{name}{{{rendered}}} {_number(value)}" if items else f"{name} {_number(value)}")
+
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+            timings = sorted((key, dict(stat), list(self._histograms[key])) for key, stat in self._timings.items())
+
+        for kind, store in (("counter", counters), ("gauge", gauges)):
+            typed = set()
+            for (name, labels), value in store:
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f"# TYPE {name} {kind}")
+                _sample(name, labels, value)
+
+        ratios = self.hit_ratios()
+        if ratios:
+            lines.append("# TYPE cache_hit_ratio gauge")
+        for ratio in ratios:
+            _sample(ratio["name"], _label_key(ratio["labels"]), ratio["value"])
+
+        typed = set()
+        for (name, labels), stat, counts in timings:
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} histogram")
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                _sample(f"{name}_bucket", labels, cumulative, (("le", _number(bound)),))
+            _sample(f"{name}_bucket", labels, stat["count"], (("le", "+Inf"),))
+            _sample(f"{name}_sum", labels, stat["sum"])
+            _sample(f"{name}_count", labels, stat["count"])
+        return "\n".join(lines) + "\n"
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _number(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+metrics = Metrics()
@@ -0,0 +1,106 @@
+# app/core/microbatch.py
+
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, List
+from app.core.metrics import metrics
+
+class MicroBatcher:
+    """
+    여러 스레드에서 거의 동시에 들어온 단건 요청을 모아 한 번에 처리합니다.
+    첫 요청이 들어온 뒤 window 초 동안(또는 max_batch개가 찰 때까지) 기다렸다가
+    fn(items)을 한 번 호출하고, 결과를 각 요청에 순서대로 나눠 줍니다.
+    max_in_flight가 1보다 크면 최대 그 수만큼의 배치를 동시에 처리하고, 모두 처리 중이면
+    다음 배치를 더 모으면서 기다립니다.
+    """
+
+    def __init__(self, name: str, fn: Callable[[List[Any]], List[Any]], max_batch: int, window: float,
+                 max_in_flight: int = 1):
+        self.name = name
+        self.fn = fn
+        self.max_batch = max_batch
+        self.window = window
+        self.max_in_flight = max(1, max_in_flight)
+        self._queue: "queue.Queue" = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+        self._executor = None
+
+    def submit(self, item: Any) -> Any:
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((item, future))
+        return future.result()
+
+    def close(self):
+        with self._lock:
+            if self._worker is not None:
+                self._queue.put(None)
+                self._worker.join()
+                self._worker = None
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    if self.max_in_flight > 1:
+                        self._executor = ThreadPoolExecutor(self.max_in_flight, thread_name_prefix=f"microbatch-{self.name}")
+                    self._worker = threading.Thread(target=self._run, name=f"microbatch-{self.name}", daemon=True)
+                    self._worker.start()
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            batch = [first]
+            deadline = time.perf_counter() + self.window
+            stop = False
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stop = True
+                    break
+                batch.append(entry)
+
+            self._dispatch(batch)
+            if stop:
+                return
+
+    def _dispatch(self, batch):
+        if self._executor is None:
+            self._process(batch)
+            return
+        # 처리 중인 배치가 max_in_flight개면 자리가 날 때까지 기다림 (그동안 들어온 요청은 다음 배치로 모임)
+        self._slots.acquire()
+        try:
+            self._executor.submit(self._process, batch).add_done_callback(lambda _: self._slots.release())
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _process(self, batch):
+        labels = {"batcher": self.name}
+        metrics.inc("microbatch_batches_total", labels=labels)
+        metrics.inc("microbatch_items_total", len(batch), labels=labels)
+        try:
+            results = self.fn([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
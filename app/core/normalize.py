@@ -0,0 +1,23 @@
+# app/core/normalize.py
+
+import re
+import unicodedata
+
+_WHITESPACE = re.compile(r"\s+")
+# 회사명 표기 차이 (㈜ 는 NFKC 정규화 후 "(주)"가 됨)
+_COMPANY_SUFFIXES = re.compile(r"\(주\)|주식회사")
+
+def normalize_query(text: str) -> str:
+    """
+    캐시 키 등으로 쓰기 위해 공백, 대소문자, ㈜/(주)/주식회사 표기 차이를 없앤 문자열을 반환합니다.
+    """
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    text = _COMPANY_SUFFIXES.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+def normalize_text(text: str) -> str:
+    """
+    임베딩 결과가 달라지지 않는 범위(유니코드 NFC, 공백)만 정규화합니다.
+    """
+    text = unicodedata.normalize("NFC", text or "")
+    return _WHITESPACE.sub(" ", text).strip()
@@ -0,0 +1,159 @@
+# app/core/rate_limit.py
+
+import asyncio
+import email.utils
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+from app.core.metrics import metrics
+from app.core.tokens import count_tokens
+
+# 재시도해도 되는 업스트림 응답 코드
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+def estimate_tokens(payload: dict) -> int:
+    """
+    요청이 소비할 토큰 수를 어림합니다. (프롬프트 길이 + max_tokens)
+    """
+    tokens = sum(count_tokens(str(message.get("content", ""))) + 4 for message in payload.get("messages", []))
+    return tokens + int(payload.get("max_tokens") or 0)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Retry-After 헤더(초 또는 HTTP 날짜)를 대기 시간(초)으로 바꿉니다.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def backoff_delay(attempt: int, base: float, cap: float = 30.0) -> float:
+    # full jitter: 0 ~ base * 2^attempt 사이에서 무작위로 골라 재시도가 한꺼번에 몰리지 않게 함
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+class TokenBucket:
+    """
+    분당 rate_per_minute만큼 채워지는 토큰 버킷입니다. rate가 0 이하이면 제한하지 않습니다.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1) -> float:
+        """
+        amount만큼 토큰을 꺼낼 수 있을 때까지 기다리고, 기다린 시간(초)을 반환합니다.
+        """
+        if not self.enabled:
+            return 0.0
+        # 버킷보다 큰 요청은 가득 찼을 때 바로 통과시켜 영원히 기다리지 않게 함
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+class AdaptiveLimiter:
+    """
+    AIMD 방식의 동시 요청 수 제한기입니다.
+    성공하면 한도를 천천히 늘리고(limit 건 성공마다 +1), 스로틀링(429 등)을 받으면 절반으로 줄입니다.
+    """
+
+    def __init__(self, name: str, initial: int, min_limit: int = 1, max_limit: Optional[int] = None):
+        self.name = name
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit or initial)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.in_flight = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self):
+        self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        self._export()
+
+    def on_throttle(self):
+        self.limit = max(self.min_limit, self.limit / 2)
+        self._export()
+
+    def _export(self):
+        metrics.set_gauge("ratelimit_concurrency_limit", int(self.limit), {"upstream": self.name})
+
+class UpstreamRateLimiter:
+    """
+    업스트림 호스트 하나에 대한 요청 제한입니다.
+    분당 요청 수(RPM)와 분당 토큰 수(TPM) 토큰 버킷, AIMD 동시 요청 제한, Retry-After 일시 정지를 함께 적용합니다.
+    """
+
+    def __init__(self, name: str, rpm: float, tpm: float, max_concurrency: int, min_concurrency: int = 1):
+        self.name = name
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.concurrency = AdaptiveLimiter(name, max_concurrency, min_limit=min_concurrency, max_limit=max_concurrency)
+        self._paused_until = 0.0
+
+    @asynccontextmanager
+    async def slot(self, tokens: int = 0):
+        """
+        요청 하나를 보낼 수 있을 때까지 기다린 뒤 진입합니다. 기다린 시간은 ratelimit_queue_wait_seconds로 기록됩니다.
+        """
+        labels = {"upstream": self.name}
+        start = time.perf_counter()
+
+        pause = self._paused_until - time.monotonic()
+        if pause > 0:
+            await asyncio.sleep(pause)
+        await self.requests.acquire(1)
+        await self.tokens.acquire(tokens)
+        await self.concurrency.acquire()
+        metrics.observe("ratelimit_queue_wait_seconds", time.perf_counter() - start, labels)
+        try:
+            yield
+        finally:
+            await self.concurrency.release()
+
+    def on_success(self):
+        self.concurrency.on_success()
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        """
+        429 등 스로틀링 응답을 받으면 동시 요청 한도를 줄이고, Retry-After 동안 새 요청을 멈춥니다.
+        """
+        metrics.inc("ratelimit_throttled_total", labels={"upstream": self.name})
+        self.concurrency.on_throttle()
+        if retry_after:
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
@@ -0,0 +1,132 @@
+# app/core/response_cache.py
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import metrics
+
+class MemoryStore:
+    """
+    프로세스 내부 LRU 저장소입니다. 워커끼리는 공유되지 않습니다.
+    적중/미스 지표는 ResponseCache가 gpt_cache_*로 남기므로 내부 TTLCache의 지표는 끕니다.
+    """
+
+    blocking = False
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(name="gpt_response", maxsize=maxsize, ttl=ttl, record_metrics=False)
+
+    def get(self, key: str) -> Optional[str]:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: str, ttl: float):
+        self._cache.set(key, value, ttl=ttl)
+
+class SQLiteStore:
+    """
+    로컬 SQLite 파일 저장소입니다. 같은 파일을 여는 여러 uvicorn 워커가 결과를 공유합니다.
+    """
+
+    blocking = True
+
+    def __init__(self, path: str, maxsize: int):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, used_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE responses SET used_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return row[0]
+
+    def set(self, key: str, value: str, ttl: float):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at, used_at) VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl, now),
+            )
+            # 만료된 항목과 오래 사용하지 않은 항목을 정리하여 maxsize 유지
+            self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                "DELETE FROM responses WHERE key NOT IN (SELECT key FROM responses ORDER BY used_at DESC LIMIT ?)",
+                (self.maxsize,),
+            )
+            self._conn.commit()
+
+class ResponseCache:
+    """
+    GPT 분석 결과 캐시입니다. (엔드포인트, 모델, 완성된 프롬프트, 샘플링 파라미터)의 해시를 키로 사용하며,
+    GPT_CACHE_ENDPOINTS에 지정한 엔드포인트에만 적용됩니다.
+    """
+
+    def __init__(self, store, ttl: float, endpoints):
+        self.store = store
+        self.ttl = ttl
+        self.endpoints = set(endpoints)
+
+    def enabled(self, endpoint: Optional[str]) -> bool:
+        return endpoint is not None and endpoint in self.endpoints
+
+    @staticmethod
+    def key(endpoint: str, payload: dict) -> str:
+        body = {"endpoint": endpoint, **{k: v for k, v in payload.items() if k != "stream"}}
+        encoded = json.dumps(body, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    async def get(self, endpoint: str, key: str) -> Optional[str]:
+        value = await self._call(self.store.get, key)
+        name = "gpt_cache_hits_total" if value is not None else "gpt_cache_misses_total"
+        metrics.inc(name, labels={"endpoint": endpoint})
+        return value
+
+    async def set(self, key: str, value: str):
+        await self._call(self.store.set, key, value, self.ttl)
+
+    async def _call(self, func, *args):
+        if self.store.blocking:
+            return await asyncio.to_thread(func, *args)
+        return func(*args)
+
+def bypass_requested(header: Optional[str]) -> bool:
+    """
+    X-Cache-Bypass 헤더 값이 1/true/yes이면 캐시를 건너뛰고 새로 호출합니다.
+    """
+    return header is not None and header.strip().lower() in ("1", "true", "yes")
+
+def _build_response_cache() -> ResponseCache:
+    endpoints = [name.strip() for name in settings.GPT_CACHE_ENDPOINTS.split(",") if name.strip()]
+    if settings.GPT_CACHE_STORE == "sqlite":
+        store = SQLiteStore(settings.GPT_CACHE_PATH, settings.GPT_CACHE_MAXSIZE)
+    elif settings.GPT_CACHE_STORE == "memory":
+        store = MemoryStore(settings.GPT_CACHE_MAXSIZE, settings.GPT_CACHE_TTL_SECONDS)
+    else:
+        raise ValueError(f"지원하지 않는 GPT 캐시 저장소입니다: {settings.GPT_CACHE_STORE}")
+    return ResponseCache(store, settings.GPT_CACHE_TTL_SECONDS, endpoints)
+
+response_cache = _build_response_cache()
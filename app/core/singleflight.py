@@ -0,0 +1,83 @@
+# app/core/singleflight.py
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict
+from app.core.metrics import metrics
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 호출을 하나의 업스트림 호출로 합칩니다.
+    먼저 들어온 호출만 실제로 실행되고, 나머지는 그 결과를 그대로 공유합니다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._sync_calls: Dict[str, _Call] = {}
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._tasks.get(key)
+        if task is None:
+            self._record(coalesced=False)
+            # 먼저 호출한 쪽이 취소되어도 공유 작업은 계속 진행되도록 별도 태스크로 실행
+            task = asyncio.ensure_future(func())
+            self._tasks[key] = task
+            task.add_done_callback(lambda t: self._finish_task(key, t))
+        else:
+            self._record(coalesced=True)
+        return await asyncio.shield(task)
+
+    def do_sync(self, key: str, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._sync_calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._sync_calls[key] = _Call()
+        self._record(coalesced=not leader)
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._sync_calls[key]
+            call.event.set()
+
+    def stats(self) -> dict:
+        return {"name": self.name, "calls": self.calls, "coalesced": self.coalesced}
+
+    def _record(self, coalesced: bool):
+        labels = {"flight": self.name}
+        with self._lock:
+            if coalesced:
+                self.coalesced += 1
+            else:
+                self.calls += 1
+        name = "singleflight_coalesced_total" if coalesced else "singleflight_calls_total"
+        metrics.inc(name, labels=labels)
+
+    def _finish_task(self, key: str, task: asyncio.Task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # 기다리는 쪽이 모두 취소된 경우에도 예외가 "never retrieved" 경고로 남지 않도록 소비
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,28 @@
+# app/core/sse.py
+
+import json
+from typing import List, Optional
+
+def sse_event(data, event: Optional[str] = None) -> str:
+    """
+    Server-Sent Events 형식의 메시지 하나를 만듭니다. data는 JSON으로 직렬화됩니다.
+    """
+    message = f"event: {event}\n" if event else ""
+    return message + f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+class LineBuffer:
+    """
+    토큰 단위로 들어오는 텍스트를 모아 줄바꿈이 완성된 줄만 돌려줍니다.
+    """
+
+    def __init__(self):
+        self._pending = ""
+
+    def feed(self, text: str) -> List[str]:
+        self._pending += text
+        *lines, self._pending = self._pending.split("\n")
+        return lines
+
+    def flush(self) -> List[str]:
+        rest, self._pending = self._pending, ""
+        return [rest] if rest else []
@@ -0,0 +1,81 @@
+# app/core/startup.py
+
+import asyncio
+import time
+from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.metrics import metrics
+
+WARMUP_MODES = ("background", "blocking", "lazy")
+
+class StartupState:
+    """
+    프로세스 시작 후 검색 엔진(임베딩 모델 + 벡터 저장소) 워밍업 상태입니다.
+    background는 서버를 먼저 띄우고 워밍업을 백그라운드에서 진행하며, 끝나면 /readyz가 200으로 바뀝니다.
+    blocking은 워밍업이 끝난 뒤 요청을 받고, lazy는 워밍업 없이 첫 검색 때 로드합니다.
+    lazy는 트래픽을 받아야 로드되므로 시작 과정(lifespan)이 끝나면 준비 완료로 보고, 엔진 로드 여부는 engine 값으로만 알려줍니다.
+    """
+
+    def __init__(self, mode: str):
+        if mode not in WARMUP_MODES:
+            raise ValueError(f"지원하지 않는 워밍업 모드입니다: {mode}")
+        self.mode = mode
+        self.started_at = time.monotonic()
+        self.ready_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        self._engine = None
+
+    @property
+    def ready(self) -> bool:
+        # 워밍업이 실패했어도 이후 첫 검색에서 엔진이 로드되면 준비 완료
+        if self.ready_at is None and self._engine is not None and self._engine.started:
+            self._mark_ready()
+        return self.ready_at is not None
+
+    async def start(self, engine):
+        self._engine = engine
+        if self.mode == "lazy":
+            # lifespan의 마지막 단계이므로 여기서 준비 완료 (로드는 첫 검색 때)
+            self._mark_ready()
+        elif self.mode == "blocking":
+            await self._warmup(engine)
+        else:
+            self._task = asyncio.create_task(self._warmup(engine))
+
+    async def wait(self):
+        # 종료 시 스레드에서 진행 중인 워밍업이 끝날 때까지 기다린 뒤 엔진을 정리
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _warmup(self, engine):
+        start = time.perf_counter()
+        try:
+            await run_in_threadpool(engine.start)
+        except Exception as e:
+            self.error = str(e)
+            metrics.inc("startup_warmup_failures_total")
+            print(f"❌ 검색 엔진 워밍업 실패: {e}")
+            if self.mode == "blocking":
+                raise
+            return
+        metrics.observe("startup_warmup_seconds", time.perf_counter() - start)
+        self._mark_ready()
+
+    def _mark_ready(self):
+        self.ready_at = time.monotonic()
+        metrics.set_gauge("startup_ready", 1)
+        metrics.observe("startup_ready_seconds", self.ready_at - self.started_at)
+
+    def status(self) -> dict:
+        return {
+            "status": "ready" if self.ready else ("failed" if self.error else "warming_up"),
+            "mode": self.mode,
+            "engine": "loaded" if self._engine is not None and self._engine.started else "not_loaded",
+            "uptimeSeconds": round(time.monotonic() - self.started_at, 3),
+            "readyAfterSeconds": round(self.ready_at - self.started_at, 3) if self.ready else None,
+            "error": self.error,
+        }
+
+startup_state = StartupState(settings.STARTUP_WARMUP)
@@ -0,0 +1,52 @@
+# app/core/tokens.py
+
+import math
+from app.core.config import settings
+
+_encoding = None
+
+def _get_encoding():
+    # tiktoken이 설치되어 있으면 모델 토크나이저로 정확히 세고, 없으면 어림값을 사용
+    global _encoding
+    if _encoding is None:
+        _encoding = False
+        if settings.TOKENIZER == "tiktoken":
+            try:
+                import tiktoken
+            except ImportError:
+                return None
+            try:
+                _encoding = tiktoken.get_encoding(settings.TOKENIZER_ENCODING)
+            except Exception as e:
+                print(f"❌ tiktoken 로드 실패, 어림 토큰 수를 사용합니다: {e}")
+    return _encoding or None
+
+def _char_cost(ch: str) -> float:
+    # 영문은 약 4글자당 1토큰, 한글 등 비 ASCII 문자는 글자당 1토큰
+    return 0.25 if ord(ch) < 128 else 1.0
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return math.ceil(sum(_char_cost(ch) for ch in text))
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """
+    앞에서부터 max_tokens 토큰까지만 남깁니다.
+    """
+    if max_tokens <= 0:
+        return ""
+    encoding = _get_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text)
+        return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+
+    cost = 0.0
+    for i, ch in enumerate(text):
+        cost += _char_cost(ch)
+        if cost > max_tokens:
+            return text[:i]
+    return text
@@ -0,0 +1,99 @@
+# app/core/tracing.py
+
+import contextvars
+import re
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+from starlette.datastructures import MutableHeaders
+from app.core.config import settings
+from app.core.metrics import metrics
+
+_TOKEN_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+
+class Trace:
+    """
+    요청 하나에서 거친 단계(span)들의 소요 시간 목록입니다.
+    asyncio.gather나 run_in_threadpool로 나뉜 작업도 같은 Trace에 기록됩니다.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.spans: List[Tuple[str, float]] = []
+
+    def add(self, name: str, seconds: float):
+        self.spans.append((name, seconds))
+
+    def server_timing(self) -> str:
+        # 같은 이름의 단계는 합치고(예: 자기소개서 일괄 분석의 gpt), 횟수를 desc로 표시
+        totals: Dict[str, List[float]] = {}
+        for name, seconds in self.spans:
+            totals.setdefault(_TOKEN_CHARS.sub("_", name), []).append(seconds)
+        parts = [
+            f"{name};dur={sum(values) * 1000:.1f}" + (f';desc="x{len(values)}"' if len(values) > 1 else "")
+            for name, values in totals.items()
+        ]
+        parts.append(f"total;dur={(time.perf_counter() - self.start) * 1000:.1f}")
+        return ", ".join(parts)
+
+_current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("trace", default=None)
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+def add_timing(name: str, seconds: float):
+    """
+    이미 다른 지표로 기록한 소요 시간을 현재 요청의 Server-Timing에만 더합니다.
+    """
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(name, seconds)
+
+@contextmanager
+def span(name: str, labels: Optional[Dict[str, str]] = None):
+    """
+    블록의 소요 시간을 span_seconds{span=name} 히스토그램과 현재 요청의 Server-Timing에 기록합니다.
+    async 함수 안에서도 await를 감싸 그대로 사용할 수 있습니다.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        metrics.observe("span_seconds", seconds, {"span": name, **(labels or {})})
+        add_timing(name, seconds)
+
+class TraceMiddleware:
+    """
+    요청마다 Trace를 만들고, 라우트별 http_request_seconds를 기록하며 응답에 Server-Timing 헤더를 붙입니다.
+    스트리밍 응답은 헤더를 먼저 보내므로 첫 바이트 전까지 끝난 단계만 헤더에 포함됩니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace()
+        token = _current_trace.set(trace)
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if settings.SERVER_TIMING_ENABLED:
+                    MutableHeaders(scope=message).append("Server-Timing", trace.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_trace.reset(token)
+            # 경로 변수 대신 라우트 경로 템플릿으로 묶어 라벨 수가 늘어나지 않도록 함
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            labels = {"method": scope["method"], "route": route, "status": str(status)}
+            metrics.observe("http_request_seconds", time.perf_counter() - trace.start, labels)
@@ -0,0 +1,371 @@
+# app/core/vector_backends.py
+
+import json
+import os
+import shutil
+import time
+import uuid
+import numpy as np
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+from app.core.config import settings
+from app.core.dedup import COMBINATION_FIELD, merged_field
+from app.core.lexical_index import LEXICAL_FILE, LexicalIndex, mmr, rrf_fuse
+from app.core.metadata_index import MetadataIndex
+
+EMBEDDINGS_FILE = "embeddings.npy"
+METADATA_FILE = "metadata.json"
+# 현재 사용 중인 스냅샷 디렉터리 이름을 담은 파일
+CURRENT_FILE = "CURRENT"
+# Chroma 저장소를 ingest로 바꿀 때마다 새 값으로 교체하는 파일 (실행 중인 서버가 다시 열도록)
+INGEST_MARKER_FILE = "INGESTED"
+# 교체 직후 이전 스냅샷을 읽던 워커를 위해 남겨둘 스냅샷 수
+KEEP_SNAPSHOTS = 2
+
+class VectorBackend(ABC):
+    """
+    검색 엔진이 사용하는 벡터 저장소 인터페이스입니다.
+    search는 (질의 수, 차원) 행렬을 받아 질의마다 상위 k개의 문서를 반환합니다.
+    filters가 주어지면 메타데이터 역색인으로 후보를 먼저 좁힌 뒤 벡터 점수를 계산합니다.
+    queries(질의 원문)가 주어지고 RETRIEVAL_MODE가 hybrid이면 문자 n-gram BM25 순위를 벡터 순위와
+    RRF로 합치고, diversify가 True이면 MMR로 서로 비슷한 문서를 걸러냅니다.
+    """
+
+    name = "base"
+    index: MetadataIndex = None
+    lexical: LexicalIndex = None
+
+    @abstractmethod
+    def search(self, vectors: np.ndarray, k: int, filters: Optional[Dict[str, str]] = None,
+               queries: Optional[List[str]] = None, diversify: bool = False) -> List[List[dict]]:
+        ...
+
+    def _hybrid(self, queries: Optional[List[str]]) -> bool:
+        return settings.RETRIEVAL_MODE == "hybrid" and queries is not None and self.lexical is not None
+
+    @abstractmethod
+    def __len__(self):
+        ...
+
+    def is_stale(self) -> bool:
+        """
+        외부(ingest 등)에서 저장소가 교체되어 다시 열어야 하면 True를 반환합니다.
+        """
+        return False
+
+    def close(self):
+        pass
+
+class ChromaBackend(VectorBackend):
+    name = "chroma"
+
+    def __init__(self, persist_directory: str, embedding_function):
+        from langchain_community.vectorstores import Chroma
+
+        self.persist_directory = persist_directory
+        self.version = ingest_version(persist_directory)
+        self.db = Chroma(persist_directory=persist_directory, embedding_function=embedding_function)
+        stored = self.db._collection.get(include=["metadatas", "documents"])
+        self.ids = stored["ids"]
+        self.index = MetadataIndex(stored["metadatas"])
+        self.lexical = load_lexical_index(persist_directory, stored["documents"], self.ids)
+
+    def search(self, vectors: np.ndarray, k: int, filters: Optional[Dict[str, str]] = None,
+               queries: Optional[List[str]] = None, diversify: bool = False) -> List[List[dict]]:
+        where = None
+        resolved = self.index.resolve_filters(filters)
+        if resolved:
+            if not all(resolved.values()):
+                return [[] for _ in range(len(vectors))]
+            conditions = [{field: {"$in": values}} for field, values in resolved.items()]
+            if len(conditions) == 1:
+                # 중복 제거로 합쳐진 행은 "<필드>목록"에 값이 들어 있음
+                field, values = next(iter(resolved.items()))
+                merged = self.index.merged_values(field, values)
+                where = {"$or": [conditions[0], {merged_field(field): {"$in": merged}}]} if merged else conditions[0]
+            else:
+                # 필드가 여러 개이면 합쳐진 행은 실제로 있던 조합("조합목록")으로만 맞춤
+                where = {"$and": conditions}
+                combinations = self.index.combination_values(resolved)
+                if combinations:
+                    where = {"$or": [where, {COMBINATION_FIELD: {"$in": combinations}}]}
+
+        hybrid = self._hybrid(queries)
+        rerank = hybrid or diversify
+        include = ["documents", "metadatas", "distances"] + (["embeddings"] if rerank else [])
+        result = self.db._collection.query(
+            query_embeddings=vectors.tolist(),
+            n_results=k * settings.RETRIEVAL_FETCH_MULTIPLIER if rerank else k,
+            where=where,
+            include=include,
+        )
+
+        # 점수는 클수록 유사하도록 거리 값을 변환
+        if not rerank:
+            return [
+                [
+                    {"content": doc, "metadata": meta, "score": 1.0 / (1.0 + dist)}
+                    for doc, meta, dist in zip(docs, metas, dists)
+                ]
+                for docs, metas, dists in zip(result["documents"], result["metadatas"], result["distances"])
+            ]
+
+        rows = self.index.candidates(filters)
+        results = []
+        for i, vector in enumerate(np.asarray(vectors, dtype=np.float32)):
+            hits = {
+                doc_id: (doc, meta, np.asarray(embedding, dtype=np.float32))
+                for doc_id, doc, meta, embedding in zip(
+                    result["ids"][i], result["documents"][i], result["metadatas"][i], result["embeddings"][i]
+                )
+            }
+            rankings = [result["ids"][i]]
+            if hybrid:
+                lexical_top = self.lexical.top(queries[i], k * settings.RETRIEVAL_FETCH_MULTIPLIER, rows)
+                rankings.append([self.ids[row] for row in lexical_top])
+            fused = rrf_fuse(rankings, settings.RRF_K)
+
+            # 문자 검색으로만 찾은 문서는 내용과 임베딩을 따로 가져옴
+            missing = [doc_id for doc_id, _ in fused if doc_id not in hits]
+            if missing:
+                extra = self.db._collection.get(ids=missing, include=["documents", "metadatas", "embeddings"])
+                for doc_id, doc, meta, embedding in zip(extra["ids"], extra["documents"], extra["metadatas"], extra["embeddings"]):
+                    hits[doc_id] = (doc, meta, np.asarray(embedding, dtype=np.float32))
+
+            fused = [(doc_id, score) for doc_id, score in fused if doc_id in hits]
+            embeddings = np.stack([hits[doc_id][2] for doc_id, _ in fused]) if fused else np.empty((0, len(vector)))
+            order = _rerank_order(normalize_rows(embeddings), np.asarray([score for _, score in fused]), k, diversify)
+
+            docs = []
+            for position in order:
+                doc, meta, embedding = hits[fused[position][0]]
+                # Chroma 기본 거리(L2 제곱)와 같은 방식으로 점수 계산
+                dist = float(((embedding - vector) ** 2).sum())
+                docs.append({"content": doc, "metadata": meta, "score": 1.0 / (1.0 + dist)})
+            results.append(docs)
+        return results
+
+    def __len__(self):
+        return self.db._collection.count()
+
+    def is_stale(self) -> bool:
+        # 컬렉션은 제자리에서 바뀌므로 ingest가 남긴 표시로 메타데이터/문자 색인을 다시 만들지 판단
+        return ingest_version(self.persist_directory) != self.version
+
+    def close(self):
+        self.db = None
+
+class NumpyBackend(VectorBackend):
+    """
+    정규화된 float32 임베딩 행렬(.npy)을 메모리 맵으로 열어 내적으로 검색합니다.
+    여러 uvicorn 워커가 같은 파일을 열면 페이지 캐시의 한 벌을 공유합니다.
+    인덱스는 스냅샷 디렉터리 단위로 저장되고 CURRENT 파일이 현재 스냅샷을 가리킵니다.
+    """
+
+    name = "numpy"
+
+    def __init__(self, index_dir: str):
+        self.index_dir = index_dir
+        self.snapshot = current_snapshot(index_dir)
+        if self.snapshot is None:
+            raise FileNotFoundError(f"{index_dir}에 NumPy 인덱스가 없습니다. init_chroma로 먼저 생성해주세요.")
+
+        snapshot_dir = os.path.join(index_dir, self.snapshot)
+        self.embeddings = np.load(os.path.join(snapshot_dir, EMBEDDINGS_FILE), mmap_mode="r")
+        with open(os.path.join(snapshot_dir, METADATA_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+
+        self.model_name = meta["model"]
+        self.documents = meta["documents"]
+        self.ids = meta.get("ids") or [str(i) for i in range(len(self.documents))]
+        self.metadatas = _decode_columns(meta["columns"], len(self.documents))
+        self.index = MetadataIndex(self.metadatas)
+        self.lexical = load_lexical_index(snapshot_dir, self.documents, self.ids)
+
+    def search(self, vectors: np.ndarray, k: int, filters: Optional[Dict[str, str]] = None,
+               queries: Optional[List[str]] = None, diversify: bool = False) -> List[List[dict]]:
+        query_vectors = normalize_rows(np.asarray(vectors, dtype=np.float32))
+
+        # 메모리 맵 전체와 내적한 뒤 필터 후보 행의 점수만 남김
+        # (embeddings[rows]로 후보 행을 고르면 요청마다 메모리 맵의 해당 행 전체가 복사됨)
+        rows = self.index.candidates(filters)
+        scores = query_vectors @ self.embeddings.T
+        if rows is not None:
+            scores = scores[:, rows]
+        k = min(k, scores.shape[1])
+        if k == 0:
+            return [[] for _ in range(len(query_vectors))]
+
+        hybrid = self._hybrid(queries)
+        if hybrid or diversify:
+            return self._rerank_search(scores, rows, k, queries if hybrid else None, diversify)
+
+        # 전체 정렬 대신 argpartition으로 상위 k개만 고른 뒤 그 안에서 정렬
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for row_scores, row_top in zip(scores, top):
+            order = row_top[np.argsort(-row_scores[row_top])]
+            ids = order if rows is None else rows[order]
+            results.append([self._doc(i, score) for i, score in zip(ids, row_scores[order])])
+        return results
+
+    def _rerank_search(self, scores: np.ndarray, rows: Optional[np.ndarray], k: int,
+                       queries: Optional[List[str]], diversify: bool) -> List[List[dict]]:
+        fetch_k = min(scores.shape[1], k * settings.RETRIEVAL_FETCH_MULTIPLIER)
+        results = []
+        for i, row_scores in enumerate(scores):
+            # 후보 행(rows) 안에서의 위치 기준으로 벡터/문자 순위를 만든 뒤 RRF로 합침
+            top = np.argpartition(-row_scores, fetch_k - 1)[:fetch_k]
+            rankings = [top[np.argsort(-row_scores[top])].tolist()]
+            if queries is not None:
+                lexical_top = self.lexical.top(queries[i], fetch_k, rows)
+                rankings.append((lexical_top if rows is None else np.searchsorted(rows, lexical_top)).tolist())
+            fused = rrf_fuse(rankings, settings.RRF_K)
+
+            positions = np.asarray([position for position, _ in fused], dtype=np.int64)
+            # MMR에 필요한 후보(fetch_k개)의 벡터만 메모리 맵에서 읽음
+            candidates = self.embeddings[positions if rows is None else rows[positions]]
+            order = positions[_rerank_order(candidates, np.asarray([score for _, score in fused]), k, diversify)]
+            ids = order if rows is None else rows[order]
+            results.append([self._doc(row, score) for row, score in zip(ids, row_scores[order])])
+        return results
+
+    def __len__(self):
+        return len(self.documents)
+
+    def is_stale(self) -> bool:
+        return current_snapshot(self.index_dir) != self.snapshot
+
+    def close(self):
+        self.embeddings = None
+
+    def _doc(self, row: int, score: float) -> dict:
+        return {"content": self.documents[row], "metadata": self.metadatas[row], "score": float(score)}
+
+def _rerank_order(embeddings: np.ndarray, fused_scores: np.ndarray, k: int, diversify: bool) -> List[int]:
+    # RRF 순서대로 k개를 고르거나, diversify이면 MMR로 서로 비슷한 후보를 건너뜀
+    if diversify:
+        return mmr(np.asarray(embeddings, dtype=np.float32), fused_scores, k, settings.MMR_LAMBDA)
+    return list(range(min(k, len(fused_scores))))
+
+def load_lexical_index(directory: str, documents: List[str], ids: List[str]) -> LexicalIndex:
+    """
+    ingest 때 저장한 문자 n-gram 색인을 불러옵니다. 없거나 문서 목록과 맞지 않으면 새로 만듭니다.
+    """
+    path = os.path.join(directory, LEXICAL_FILE)
+    if os.path.exists(path):
+        lexical = LexicalIndex.load(path)
+        if lexical.ids == list(ids):
+            return lexical
+    return LexicalIndex.build(documents, ids=list(ids))
+
+def save_lexical_index(directory: str, documents: List[str], ids: List[str]) -> LexicalIndex:
+    lexical = LexicalIndex.build(documents, ids=list(ids))
+    lexical.save(os.path.join(directory, LEXICAL_FILE))
+    return lexical
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+def ingest_version(directory: str) -> Optional[str]:
+    try:
+        with open(os.path.join(directory, INGEST_MARKER_FILE), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def mark_ingested(directory: str):
+    """
+    Chroma 저장소를 바꾼 뒤 호출합니다. 실행 중인 서버는 INDEX_RELOAD_INTERVAL_SECONDS 주기로 이 값을 확인해 다시 엽니다.
+    """
+    marker = os.path.join(directory, INGEST_MARKER_FILE)
+    with open(marker + ".tmp", "w", encoding="utf-8") as f:
+        f.write(uuid.uuid4().hex)
+    os.replace(marker + ".tmp", marker)
+
+def current_snapshot(index_dir: str) -> Optional[str]:
+    try:
+        with open(os.path.join(index_dir, CURRENT_FILE), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def save_numpy_index(index_dir: str, embeddings: np.ndarray, documents: List[str],
+                     metadatas: List[dict], model_name: str, ids: Optional[List[str]] = None) -> str:
+    """
+    임베딩 행렬과 문서/메타데이터를 새 스냅샷 디렉터리에 저장하고 CURRENT를 교체합니다.
+    메타데이터는 필드별로 고유 값 목록과 코드 배열만 저장하여 작게 유지합니다.
+    기존 스냅샷은 교체 전까지 그대로 남아 있으므로 저장 중에도 검색이 가능합니다.
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    embeddings = normalize_rows(embeddings.reshape(len(documents), embeddings.shape[-1] if embeddings.ndim == 2 else -1))
+    meta = {
+        "model": model_name,
+        "dim": int(embeddings.shape[1]),
+        "ids": ids,
+        "documents": documents,
+        "columns": _encode_columns(metadatas),
+    }
+
+    # 이름 순서가 생성 순서와 같도록 나노초 타임스탬프 사용
+    snapshot = f"snapshot-{time.time_ns():020d}-{uuid.uuid4().hex[:6]}"
+    snapshot_dir = os.path.join(index_dir, snapshot)
+    os.makedirs(snapshot_dir)
+    with open(os.path.join(snapshot_dir, EMBEDDINGS_FILE), "wb") as f:
+        np.save(f, embeddings)
+    with open(os.path.join(snapshot_dir, METADATA_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    save_lexical_index(snapshot_dir, documents, ids or [str(i) for i in range(len(documents))])
+
+    # CURRENT 교체는 원자적이므로 읽는 쪽은 이전 또는 새 스냅샷 중 하나만 보게 됨
+    current_tmp = os.path.join(index_dir, CURRENT_FILE + ".tmp")
+    with open(current_tmp, "w", encoding="utf-8") as f:
+        f.write(snapshot)
+    os.replace(current_tmp, os.path.join(index_dir, CURRENT_FILE))
+
+    _prune_snapshots(index_dir, snapshot)
+    return snapshot
+
+def _prune_snapshots(index_dir: str, current: str):
+    snapshots = sorted(name for name in os.listdir(index_dir) if name.startswith("snapshot-"))
+    for name in snapshots[:-KEEP_SNAPSHOTS]:
+        if name == current:
+            continue
+        shutil.rmtree(os.path.join(index_dir, name), ignore_errors=True)
+
+def _encode_columns(metadatas: List[dict]) -> dict:
+    fields = []
+    for meta in metadatas:
+        for field in meta:
+            if field not in fields:
+                fields.append(field)
+
+    columns = {}
+    for field in fields:
+        values, codes, lookup = [], [], {}
+        for meta in metadatas:
+            value = meta.get(field)
+            if value not in lookup:
+                lookup[value] = len(values)
+                values.append(value)
+            codes.append(lookup[value])
+        columns[field] = {"values": values, "codes": codes}
+    return columns
+
+def _decode_columns(columns: dict, size: int) -> List[dict]:
+    metadatas = [{} for _ in range(size)]
+    for field, column in columns.items():
+        values = column["values"]
+        for meta, code in zip(metadatas, column["codes"]):
+            if values[code] is not None:
+                meta[field] = values[code]
+    return metadatas
+
+def create_backend(kind: str, embedding_function=None) -> VectorBackend:
+    if kind == "chroma":
+        return ChromaBackend(settings.CHROMA_DB_PATH, embedding_function)
+    if kind == "numpy":
+        return NumpyBackend(settings.NUMPY_INDEX_DIR)
+    raise ValueError(f"지원하지 않는 벡터 백엔드입니다: {kind}")
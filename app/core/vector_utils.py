@@ -1,19 +1,238 @@
 # app/core/vector_utils.py
 
-from sentence_transformers import SentenceTransformer
-from langchain_community.vectorstores import Chroma
+import threading
+import time
+import numpy as np
+from typing import Dict, List, Optional
 from app.core.config import settings
+from app.core.embedding_backends import Encoder, create_encoder, encoder_cache_name
+from app.core.embedding_cache import CachedEmbedder, EmbeddingCache
+from app.core.embedding_executor import create_pooled_encoder, resolve_workers
+from app.core.metadata_index import filter_key
+from app.core.metrics import metrics
+from app.core.microbatch import MicroBatcher
+from app.core.tracing import add_timing, span
+from app.core.vector_backends import VectorBackend, create_backend
+
+WARMUP_TEXT = "워밍업용 문장입니다."
+
+class LangChainSentenceTransformer(Encoder):
+    backend = "torch"
+
+    def __init__(self, model_name, show_progress_bar=False):
+        # torch는 이 백엔드를 쓸 때만 불러옴
+        from sentence_transformers import SentenceTransformer
 
-class LangChainSentenceTransformer:
-    def __init__(self, model_name):
         self.model = SentenceTransformer(model_name)
+        self.show_progress_bar = show_progress_bar
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(self.model.encode(texts, show_progress_bar=self.show_progress_bar), dtype=np.float32)
+
+_embedding_cache = None
+
+def get_embedding_cache() -> EmbeddingCache:
+    global _embedding_cache
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache(
+            memory_size=settings.EMBED_CACHE_MEMORY_SIZE,
+            path=settings.EMBED_CACHE_PATH or None,
+        )
+    return _embedding_cache
+
+def create_embedder(model_name: str = settings.EMBEDDING_MODEL_NAME, show_progress_bar: bool = False,
+                    executor: str = "inline"):
+    """
+    EMBEDDING_BACKEND(torch | onnx)에 맞는 임베더를 만들고, 임베딩 캐시가 켜져 있으면 캐시를 앞에 둡니다.
+    init_chroma(ingest)와 검색 엔진이 같은 캐시를 공유합니다.
+    executor가 thread/process이면 encode를 전용 워커 풀에서 실행합니다. (캐시에 없는 문장만 풀로 보냄)
+    """
+    if executor == "inline":
+        embedder = create_encoder(settings.EMBEDDING_BACKEND, model_name, show_progress_bar=show_progress_bar)
+    else:
+        embedder = create_pooled_encoder(settings.EMBEDDING_BACKEND, model_name, kind=executor)
+    if settings.EMBED_CACHE_MEMORY_SIZE <= 0 and not settings.EMBED_CACHE_PATH:
+        return embedder
+    return CachedEmbedder(embedder, encoder_cache_name(settings.EMBEDDING_BACKEND, model_name), get_embedding_cache())
+
+class RetrievalEngine:
+    """
+    임베딩 모델과 벡터 저장소를 프로세스 당 한 번만 생성해 재사용하는 검색 엔진입니다.
+    FastAPI 시작 시 start()로 모델 로드와 워밍업을 하고, 종료 시 shutdown()을 호출합니다.
+    저장소는 VECTOR_BACKEND 설정에 따라 Chroma 또는 NumPy 백엔드를 사용합니다.
+    """
+
+    def __init__(self, model_name: str, backend_kind: str):
+        self.model_name = model_name
+        self.backend_kind = backend_kind
+        self.embedder = None
+        self.backend: VectorBackend = None
+        self._lock = threading.Lock()
+        self._last_stale_check = 0.0
+        self.executor = settings.EMBED_EXECUTOR
+        # 동시에 들어온 단건 검색어를 모아 한 번의 encode로 처리
+        # 임베딩 워커 풀을 쓰면 워커 수만큼의 배치를 동시에 encode
+        self._batcher = MicroBatcher(
+            "embed_query",
+            self._encode_batch,
+            max_batch=settings.EMBED_MAX_BATCH,
+            window=settings.EMBED_BATCH_WINDOW_MS / 1000,
+            max_in_flight=1 if self.executor == "inline" else resolve_workers(),
+        )
+
+    @property
+    def started(self) -> bool:
+        return self.backend is not None
+
+    @property
+    def pool(self):
+        # 임베딩 워커 풀 (inline이면 None)
+        encoder = getattr(self.embedder, "embedder", self.embedder)
+        return encoder if hasattr(encoder, "stats") and hasattr(encoder, "close") else None
+
+    @property
+    def db(self):
+        # Chroma 백엔드일 때의 LangChain 저장소 (하위 호환용)
+        return getattr(self.backend, "db", None)
+
+    def start(self):
+        with self._lock:
+            if self.started:
+                return
+
+            # 1. 모델 로드 + 저장소 열기 (콜드 스타트)
+            start = time.perf_counter()
+            embedder = create_embedder(self.model_name, executor=self.executor)
+            backend = create_backend(self.backend_kind, embedding_function=embedder)
+            metrics.observe("retrieval_engine_load_seconds", time.perf_counter() - start)
+
+            # 2. 첫 인코딩은 콜드, 두 번째 인코딩은 웜 지연 시간으로 기록
+            start = time.perf_counter()
+            embedder.embed_query(WARMUP_TEXT)
+            metrics.observe("retrieval_embed_seconds", time.perf_counter() - start, {"phase": "cold"})
+
+            start = time.perf_counter()
+            embedder.embed_query(WARMUP_TEXT)
+            metrics.observe("retrieval_embed_seconds", time.perf_counter() - start, {"phase": "warm"})
+
+            self.embedder = embedder
+            self.backend = backend
+            print(f"✅ 검색 엔진 준비 완료 ({self.model_name}/{settings.EMBEDDING_BACKEND}/{self.executor}, {backend.name}, 문서 수: {len(backend)})")
+
+    def shutdown(self):
+        self._batcher.close()
+        with self._lock:
+            if self.backend is not None:
+                self.backend.close()
+            pool = self.pool
+            if pool is not None:
+                pool.close()
+            self.embedder = None
+            self.backend = None
+
+    def reload(self):
+        """
+        ingest로 저장소가 교체되었을 때 임베딩 모델은 그대로 두고 저장소만 다시 엽니다.
+        기존 백엔드를 사용 중인 검색은 그대로 끝까지 진행됩니다.
+        """
+        backend = create_backend(self.backend_kind, embedding_function=self.embedder)
+        with self._lock:
+            self.backend = backend
+        metrics.inc("retrieval_reloads_total", labels={"backend": backend.name})
+        print(f"🔄 검색 저장소 다시 열기 완료 (문서 수: {len(backend)})")
+
+    def _reload_if_stale(self):
+        now = time.monotonic()
+        if now - self._last_stale_check < settings.INDEX_RELOAD_INTERVAL_SECONDS:
+            return
+        self._last_stale_check = now
+        if self.backend.is_stale():
+            self.reload()
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        if not self.started:
+            self.start()
+
+        start = time.perf_counter()
+        vectors = self.embedder.encode(texts)
+        metrics.observe("retrieval_encode_seconds", time.perf_counter() - start)
+        return vectors
+
+    def _encode_batch(self, texts: List[str]) -> List[np.ndarray]:
+        return list(self.encode(texts))
+
+    def similarity_search(self, query: str, k: int = 3, filters: Optional[Dict[str, str]] = None,
+                          diversify: bool = False) -> List[dict]:
+        with span("embed"):
+            vector = self._batcher.submit(query) if self._batcher.window > 0 else self.encode([query])[0]
+        return self.search_by_vectors(np.asarray([vector]), k=k, filters=filters, queries=[query], diversify=diversify)[0]
+
+    def similarity_search_batch(self, queries: List[str], k: int = 3,
+                                filters: Optional[List[Optional[Dict[str, str]]]] = None,
+                                diversify: bool = False) -> List[List[dict]]:
+        """
+        여러 검색어를 한 번의 encode로 임베딩하고, 같은 필터끼리 묶어 한 번에 검색합니다.
+        filters는 검색어마다 하나씩 지정하며 생략하면 모두 필터 없이 검색합니다.
+        """
+        if not queries:
+            return []
+        with span("embed"):
+            vectors = self.encode(queries)
+        filters = filters or [None] * len(queries)
+
+        groups: Dict[str, List[int]] = {}
+        for i, query_filters in enumerate(filters):
+            groups.setdefault(filter_key(query_filters), []).append(i)
+
+        results: List[List[dict]] = [[] for _ in queries]
+        for rows in groups.values():
+            group_results = self.search_by_vectors(vectors[rows], k=k, filters=filters[rows[0]],
+                                                   queries=[queries[i] for i in rows], diversify=diversify)
+            for i, result in zip(rows, group_results):
+                results[i] = result
+        return results
+
+    def unresolved_filters(self, filters: Optional[Dict[str, str]]) -> List[str]:
+        """
+        데이터셋의 어떤 값에도 대응되지 않는 필터 이름들입니다. (빈 결과를 정상 응답처럼 돌려주지 않기 위해 사용)
+        """
+        if not filters:
+            return []
+        if not self.started:
+            self.start()
+        self._reload_if_stale()
+        return self.backend.index.unresolved(filters)
+
+    def search_by_vectors(self, vectors: np.ndarray, k: int = 3, filters: Optional[Dict[str, str]] = None,
+                          queries: Optional[List[str]] = None, diversify: bool = False) -> List[List[dict]]:
+        """
+        queries(검색어 원문)를 주면 RETRIEVAL_MODE가 hybrid일 때 문자 n-gram 검색 결과와 합쳐 순위를 매깁니다.
+        """
+        if not self.started:
+            self.start()
+        self._reload_if_stale()
+
+        start = time.perf_counter()
+        results = self.backend.search(vectors, k=k, filters=filters, queries=queries, diversify=diversify)
+        seconds = time.perf_counter() - start
+        labels = {"backend": self.backend.name, "mode": settings.RETRIEVAL_MODE if queries else "vector"}
+        metrics.observe("retrieval_search_seconds", seconds, labels)
+        add_timing("vector_search", seconds)
+        return results
 
-    def embed_documents(self, texts):
-        return self.model.encode(texts, show_progress_bar=False).tolist()
+_engine = None
+_engine_lock = threading.Lock()
 
-    def embed_query(self, text):
-        return self.model.encode([text])[0].tolist()
+def get_retrieval_engine() -> RetrievalEngine:
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = RetrievalEngine(settings.EMBEDDING_MODEL_NAME, settings.VECTOR_BACKEND)
+    return _engine
 
 def get_chroma_db():
-    embedding_function = LangChainSentenceTransformer("paraphrase-multilingual-MiniLM-L12-v2")
-    return Chroma(persist_directory="./db", embedding_function=embedding_function)
\ No newline at end of file
+    engine = get_retrieval_engine()
+    if not engine.started:
+        engine.start()
+    return engine.db
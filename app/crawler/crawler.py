@@ -0,0 +1,191 @@
+# app/crawler/crawler.py
+
+import csv
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Tuple
+from app.core.config import settings
+from app.core.ingest import CSV_COLUMNS, iter_csv_rows, row_id
+from app.crawler.fetchers import Fetcher
+from app.crawler.parser import parse_review_page
+
+class CrawlReport:
+    def __init__(self):
+        self.pages = 0
+        self.resumed = 0
+        self.failed: List[int] = []
+        self.rows = 0
+        self.written = 0
+        self.seconds = 0.0
+
+    @property
+    def duplicates(self) -> int:
+        return self.rows - self.written
+
+    def as_dict(self) -> dict:
+        return {
+            "pages": self.pages,
+            "resumed": self.resumed,
+            "failed": self.failed,
+            "rows": self.rows,
+            "written": self.written,
+            "duplicates": self.duplicates,
+            "seconds": round(self.seconds, 3),
+        }
+
+    def __str__(self):
+        failed = f", 실패 {len(self.failed)}({', '.join(map(str, self.failed))})" if self.failed else ""
+        return (
+            f"페이지 {self.pages} (이전 실행에서 완료 {self.resumed}{failed}), 질문 {self.rows}, "
+            f"새로 저장 {self.written}, 이미 있는 질문 {self.duplicates} ({self.seconds:.1f}초)"
+        )
+
+class Checkpoint:
+    """
+    수집을 마친 페이지 URL을 JSON 파일에 기록합니다. 중단 후 다시 실행하면 기록된 페이지는 건너뜁니다.
+    페이지의 행을 CSV에 쓴 뒤에 기록하므로, 그 사이에 중단되면 해당 페이지만 다시 가져옵니다. (중복은 CsvSink가 거름)
+    실패 없이 모든 페이지를 마치면 지워지므로, 다음 실행은 새 질문을 찾아 처음부터 다시 가져옵니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.pages: Dict[str, dict] = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.pages = json.load(f).get("pages", {})
+
+    def done(self, url: str) -> bool:
+        return url in self.pages
+
+    def clear(self):
+        self.pages = {}
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def mark(self, url: str, rows: int, written: int):
+        self.pages[url] = {"rows": rows, "written": written, "at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # 쓰는 도중 중단되어도 이전 체크포인트가 남도록 임시 파일에 쓴 뒤 교체
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"pages": self.pages}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
+
+class CsvSink:
+    """
+    CSV에 행을 이어 쓰며, 파일에 이미 있거나 이번 실행에서 쓴 행(row_id 기준)은 건너뜁니다.
+    페이지마다 디스크에 flush하므로 중단되어도 쓴 행은 남습니다.
+    """
+
+    def __init__(self, filename: str):
+        exists = os.path.exists(filename) and os.path.getsize(filename) > 0
+        self.seen = {row_id(row) for row in iter_csv_rows(filename)} if exists else set()
+        self._file = open(filename, mode="a" if exists else "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file, quotechar='"', quoting=csv.QUOTE_ALL)
+        if not exists:
+            self._writer.writerow(CSV_COLUMNS)
+
+    def write(self, rows: Iterable[Dict[str, str]]) -> int:
+        written = 0
+        for row in rows:
+            doc_id = row_id(row)
+            if doc_id in self.seen:
+                continue
+            self.seen.add(doc_id)
+            self._writer.writerow([row[column] for column in CSV_COLUMNS])
+            written += 1
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return written
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def parse_pages(spec: str) -> List[int]:
+    """
+    "1-12", "1,3,5-7" 형태의 페이지 목록을 펼칩니다.
+    """
+    pages = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start, _, end = part.partition("-")
+        pages.extend(range(int(start), int(end or start) + 1))
+    return list(dict.fromkeys(pages))
+
+def _fetch_page(fetcher: Fetcher, url: str, retries: int) -> Tuple[str, List[Tuple[str, str, str]]]:
+    # 워커 스레드에서 HTML을 가져와 페이지 전체를 한 번에 파싱
+    for attempt in range(retries + 1):
+        try:
+            return parse_review_page(fetcher.fetch(url))
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            if attempt == retries:
+                raise
+            print(f"⚠️ 페이지 가져오기 실패, 재시도 {attempt + 1}/{retries}: {url} ({e})")
+            time.sleep(attempt + 1)
+
+def crawl(pages: List[int], fetcher: Fetcher, output_file: str = "dataset_question.csv",
+          checkpoint_path: str = settings.CRAWLER_CHECKPOINT_PATH, concurrency: int = settings.CRAWLER_CONCURRENCY,
+          url_template: str = settings.CRAWLER_URL_TEMPLATE, retries: int = 2, fresh: bool = False) -> CrawlReport:
+    """
+    pages의 목록 페이지를 최대 concurrency개씩 동시에 가져와 파싱하고, 끝난 페이지부터 CSV에 새 행만 이어 씁니다.
+    체크포인트에 기록된 페이지는 건너뛰며, 실패한 페이지는 기록하지 않으므로 다시 실행하면 이어서 가져옵니다.
+    fresh가 True이면 이전 체크포인트를 무시하고 모든 페이지를 가져옵니다.
+    """
+    start = time.perf_counter()
+    report = CrawlReport()
+    checkpoint = Checkpoint(checkpoint_path)
+    if fresh:
+        checkpoint.clear()
+
+    targets = [(page, url_template.format(page=page)) for page in pages]
+    report.pages = len(targets)
+    todo = [(page, url) for page, url in targets if not checkpoint.done(url)]
+    report.resumed = len(targets) - len(todo)
+
+    with CsvSink(output_file) as sink, ThreadPoolExecutor(max(1, concurrency), thread_name_prefix="crawler") as pool:
+        futures = {pool.submit(_fetch_page, fetcher, url, retries): (page, url) for page, url in todo}
+        # CSV와 체크포인트는 이 스레드에서만 씀
+        for future in as_completed(futures):
+            page, url = futures[future]
+            try:
+                company, items = future.result()
+            except Exception as e:
+                report.failed.append(page)
+                print(f"❌ {page}페이지 크롤링 실패: {e}")
+                continue
+
+            if not company:
+                # 페이지 구조가 달라 기업명을 찾지 못하면 완료로 기록하지 않음
+                report.failed.append(page)
+                print(f"⚠️ {page}페이지에서 기업명을 찾지 못했습니다: {url}")
+                continue
+
+            rows = [dict(zip(CSV_COLUMNS, (company, career, position, question)))
+                    for career, position, question in items if question]
+            written = sink.write(rows)
+            checkpoint.mark(url, len(rows), written)
+            report.rows += len(rows)
+            report.written += written
+            print(f"📄 {page}페이지 {company}: 질문 {len(rows)}개 중 새 질문 {written}개 저장")
+
+    # 이번 실행이 끝까지 성공했으면 체크포인트를 지워 다음 실행이 처음부터 새로 가져오도록 함
+    if not report.failed:
+        checkpoint.clear()
+
+    report.failed.sort()
+    report.seconds = time.perf_counter() - start
+    return report
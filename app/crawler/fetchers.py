@@ -0,0 +1,163 @@
+# app/crawler/fetchers.py
+
+import hashlib
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List
+from app.core.config import settings
+
+FIXTURE_INDEX_FILE = "index.json"
+
+def fixture_name(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:16] + ".html"
+
+class Fetcher(ABC):
+    """
+    URL의 HTML을 가져오는 인터페이스입니다. 여러 스레드에서 동시에 fetch를 호출합니다.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def fetch(self, url: str) -> str:
+        ...
+
+    def close(self):
+        pass
+
+class SeleniumFetcher(Fetcher):
+    """
+    스레드마다 Chrome 드라이버를 하나씩 띄워 페이지를 렌더링한 HTML을 반환합니다.
+    드라이버 수는 크롤러의 동시 실행 수를 넘지 않습니다.
+    """
+
+    name = "selenium"
+
+    def __init__(self, driver_path: str = settings.CHROMEDRIVER_PATH, headless: bool = True):
+        self.driver_path = driver_path
+        self.headless = headless
+        self._local = threading.local()
+        self._drivers: List = []
+        self._lock = threading.Lock()
+
+    def _driver(self):
+        driver = getattr(self._local, "driver", None)
+        if driver is None:
+            # selenium은 이 fetcher를 쓸 때만 불러옴
+            from selenium import webdriver
+            from selenium.webdriver.chrome.service import Service
+
+            options = webdriver.ChromeOptions()
+            if self.headless:
+                options.add_argument("--headless=new")
+            driver = webdriver.Chrome(service=Service(executable_path=self.driver_path), options=options)
+            self._local.driver = driver
+            with self._lock:
+                self._drivers.append(driver)
+        return driver
+
+    def fetch(self, url: str) -> str:
+        driver = self._driver()
+        driver.get(url)
+        return driver.page_source
+
+    def close(self):
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                print(f"⚠️ 크롬 드라이버 종료 실패: {e}")
+
+class HttpFetcher(Fetcher):
+    """
+    브라우저 없이 HTTP로 HTML을 가져옵니다. 서버에서 렌더링되는 페이지에만 사용할 수 있습니다.
+    """
+
+    name = "http"
+
+    def __init__(self, timeout: float = 30):
+        import httpx
+
+        self._client = httpx.Client(
+            timeout=timeout,
+            follow_redirects=True,
+            headers={"User-Agent": "Mozilla/5.0 (compatible; interview-question-crawler)"},
+        )
+
+    def fetch(self, url: str) -> str:
+        response = self._client.get(url)
+        response.raise_for_status()
+        return response.text
+
+    def close(self):
+        self._client.close()
+
+class FixtureFetcher(Fetcher):
+    """
+    저장해 둔 HTML 파일에서 페이지를 읽습니다. (오프라인 실행, 파서 확인용)
+    directory/index.json의 {url: 파일명}을 먼저 보고, 없으면 fixture_name(url) 파일을 읽습니다.
+    """
+
+    name = "fixture"
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        index_path = os.path.join(directory, FIXTURE_INDEX_FILE)
+        self.index: Dict[str, str] = {}
+        if os.path.exists(index_path):
+            with open(index_path, encoding="utf-8") as f:
+                self.index = json.load(f)
+
+    def fetch(self, url: str) -> str:
+        path = os.path.join(self.directory, self.index.get(url, fixture_name(url)))
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{url}에 해당하는 HTML 파일이 없습니다: {path}")
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+class RecordingFetcher(Fetcher):
+    """
+    다른 fetcher로 가져온 HTML을 FixtureFetcher가 읽을 수 있는 형태로 directory에 저장합니다.
+    """
+
+    def __init__(self, fetcher: Fetcher, directory: str):
+        self.fetcher = fetcher
+        self.directory = directory
+        self.name = fetcher.name
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def fetch(self, url: str) -> str:
+        html = self.fetcher.fetch(url)
+        name = fixture_name(url)
+        with open(os.path.join(self.directory, name), "w", encoding="utf-8") as f:
+            f.write(html)
+
+        with self._lock:
+            index_path = os.path.join(self.directory, FIXTURE_INDEX_FILE)
+            index = {}
+            if os.path.exists(index_path):
+                with open(index_path, encoding="utf-8") as f:
+                    index = json.load(f)
+            index[url] = name
+            with open(index_path, "w", encoding="utf-8") as f:
+                json.dump(index, f, ensure_ascii=False, indent=2)
+        return html
+
+    def close(self):
+        self.fetcher.close()
+
+def create_fetcher(kind: str = settings.CRAWLER_FETCHER, fixture_dir: str = "", headless: bool = True) -> Fetcher:
+    if kind == "selenium":
+        return SeleniumFetcher(headless=headless)
+    if kind == "http":
+        return HttpFetcher()
+    if kind == "fixture":
+        if not fixture_dir:
+            raise ValueError("fixture fetcher에는 HTML 파일 디렉터리가 필요합니다.")
+        return FixtureFetcher(fixture_dir)
+    raise ValueError(f"지원하지 않는 fetcher입니다: {kind}")
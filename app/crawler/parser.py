@@ -0,0 +1,114 @@
+# app/crawler/parser.py
+
+import re
+from html.parser import HTMLParser
+from typing import List, Optional, Tuple
+
+# 닫는 태그가 없는 요소
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+# 화면에 보이지 않는 텍스트 (Selenium의 .text와 맞춤)
+HIDDEN_TAGS = {"script", "style", "noscript", "template"}
+
+_WHITESPACE = re.compile(r"\s+")
+
+class Node:
+    __slots__ = ("tag", "attrs", "children")
+
+    def __init__(self, tag: str, attrs: dict):
+        self.tag = tag
+        self.attrs = attrs
+        self.children: list = []
+
+    def elements(self, tag: str) -> List["Node"]:
+        return [child for child in self.children if isinstance(child, Node) and child.tag == tag]
+
+    def child(self, tag: str, position: int = 1) -> Optional["Node"]:
+        # XPath처럼 같은 태그의 자식 중 position번째 (1부터)
+        matched = self.elements(tag)
+        return matched[position - 1] if len(matched) >= position else None
+
+    def path(self, *steps: Tuple[str, int]) -> Optional["Node"]:
+        node = self
+        for tag, position in steps:
+            node = node.child(tag, position) if node is not None else None
+        return node
+
+    def find_id(self, element_id: str) -> Optional["Node"]:
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.attrs.get("id") == element_id:
+                return node
+            stack.extend(reversed([child for child in node.children if isinstance(child, Node)]))
+        return None
+
+    @property
+    def text(self) -> str:
+        parts = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                parts.append(node)
+            elif node.tag not in HIDDEN_TAGS:
+                stack.extend(reversed(node.children))
+        return _WHITESPACE.sub(" ", "".join(parts)).strip()
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document", {})
+        self._stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, dict(attrs))
+        self._stack[-1].children.append(node)
+        if tag not in VOID_TAGS:
+            self._stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        self._stack[-1].children.append(Node(tag, dict(attrs)))
+
+    def handle_endtag(self, tag):
+        # 닫히지 않은 태그가 섞여 있어도 가장 가까운 같은 태그까지 닫음
+        for i in range(len(self._stack) - 1, 0, -1):
+            if self._stack[i].tag == tag:
+                del self._stack[i:]
+                return
+
+    def handle_data(self, data):
+        self._stack[-1].children.append(data)
+
+def build_tree(html: str) -> Node:
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+def parse_review_page(html: str) -> Tuple[str, List[Tuple[str, str, str]]]:
+    """
+    잡코리아 면접 후기 목록 페이지에서 기업명과 (경력, 직무, 질문) 목록을 한 번의 파싱으로 추출합니다.
+    기존 Selenium XPath와 같은 위치를 읽습니다.
+      - 기업명: //*[@id="container"]/div[2]/div[1]/div/h2/strong/a
+      - 항목:   //*[@id="container"]/div[2]/div[3]/ul/li[i]/div/span[1]/span[2], span[2], span[3]
+    """
+    container = build_tree(html).find_id("container")
+    main = container.child("div", 2) if container is not None else None
+    if main is None:
+        return "", []
+
+    company = main.path(("div", 1), ("div", 1), ("h2", 1), ("strong", 1), ("a", 1))
+    items = []
+    item_list = main.path(("div", 3), ("ul", 1))
+    for li in item_list.elements("li") if item_list is not None else []:
+        div = li.child("div")
+        if div is None:
+            continue
+        career = div.path(("span", 1), ("span", 2))
+        position = div.child("span", 2)
+        question = div.child("span", 3)
+        # 기존 크롤러처럼 필드가 하나라도 없으면 목록 항목이 아닌 것으로 봄
+        if career is None or position is None or question is None:
+            continue
+        items.append((career.text, position.text, question.text))
+    return (company.text if company is not None else ""), items
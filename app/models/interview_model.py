@@ -0,0 +1,34 @@
+# app/models/interview_model.py
+
+from pydantic import BaseModel, Field
+from typing import List
+from app.core.config import settings
+
+class ResumeRequest(BaseModel):
+    question: str
+    resume: str
+    company: str
+    position: str
+
+class ResumeItem(BaseModel):
+    question: str
+    resume: str
+
+class ResumeBatchRequest(BaseModel):
+    company: str
+    position: str
+    items: List[ResumeItem] = Field(..., min_length=1, max_length=settings.RESUME_BATCH_MAX_ITEMS)
+
+class AnswerAnalysisRequest(BaseModel):
+    question: str
+    answer: str
+    resume: str
+
+class FollowUpRequest(BaseModel):
+    question: str
+    answer: str
+
+class InterviewQasRequest(BaseModel):
+    company: str
+    position: str
+    resumeContent: str
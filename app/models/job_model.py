@@ -0,0 +1,18 @@
+# app/models/job_model.py
+
+from pydantic import BaseModel
+from typing import Any, Optional
+
+class JobSubmitResponse(BaseModel):
+    jobId: str
+    status: str
+
+class JobStatusResponse(BaseModel):
+    jobId: str
+    kind: str
+    status: str
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    createdAt: float
+    startedAt: Optional[float] = None
+    finishedAt: Optional[float] = None
@@ -1,7 +1,8 @@
 # app/models/search_model.py
 
-from pydantic import BaseModel
-from typing import List, Dict
+from pydantic import BaseModel, Field
+from typing import List, Dict, Optional
+from app.core.config import settings
 
 class PerplexityRequest(BaseModel):
     query: str
@@ -9,12 +10,33 @@ class PerplexityRequest(BaseModel):
 class PerplexityResponse(BaseModel):
     result: str
 
+class ChromaFilters(BaseModel):
+    company: Optional[str] = None
+    career: Optional[str] = None
+    position: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, str]:
+        return {name: value for name, value in self.model_dump(exclude_none=True).items() if value}
+
 class ChromaRequest(BaseModel):
     query: str
+    k: int = Field(3, ge=1, le=settings.SEARCH_MAX_K)
+    filters: Optional[ChromaFilters] = None
+    diversify: bool = False
+
+class ChromaBatchRequest(BaseModel):
+    queries: List[str] = Field(..., max_length=settings.SEARCH_MAX_BATCH_QUERIES)
+    k: int = Field(3, ge=1, le=settings.SEARCH_MAX_K)
+    filters: Optional[ChromaFilters] = None
+    diversify: bool = False
 
 class ChromaResult(BaseModel):
     content: str
     metadata: Dict[str, str]
+    score: Optional[float] = None
 
 class ChromaResponse(BaseModel):
-    results: List[ChromaResult]
\ No newline at end of file
+    results: List[ChromaResult]
+
+class ChromaBatchResponse(BaseModel):
+    results: List[List[ChromaResult]]
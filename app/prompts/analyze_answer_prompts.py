@@ -1,6 +1,20 @@
 # app/prompts/analyze_answer_prompts.py
 
+from app.core.config import settings
+from app.prompts.budget import Section, build_prompt, trim_extractive
+
 def analyze_answer_prompt(question: str, answer: str, resume: str) -> str:
+    # 자기소개서는 질문/답변과 관련된 문장 위주로 먼저 줄이고, 답변은 마지막에 줄임
+    sections = [
+        Section("resume", resume, settings.PROMPT_RESUME_TOKENS, priority=0, trim=trim_extractive,
+                query=f"{question} {answer}"),
+        Section("answer", answer, settings.PROMPT_ANSWER_TOKENS, priority=1, trim=trim_extractive, query=question),
+    ]
+    prompt, _ = build_prompt("analyze-answer", sections, settings.PROMPT_TOTAL_TOKENS,
+                             lambda texts: _render(question, texts["answer"], texts["resume"]))
+    return prompt
+
+def _render(question: str, answer: str, resume: str) -> str:
     return f"""
 질문: {question}
 답변: {answer}
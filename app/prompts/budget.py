@@ -0,0 +1,170 @@
+# app/prompts/budget.py
+
+import re
+from typing import Callable, Dict, List, Tuple
+from app.core.metrics import metrics
+from app.core.normalize import normalize_query
+from app.core.tokens import count_tokens, truncate_tokens
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?。])\s+|\n+")
+
+def trim_tail(text: str, budget: int, query: str = "") -> str:
+    """
+    앞에서부터 budget 토큰까지만 남깁니다.
+    """
+    trimmed = truncate_tokens(text, budget)
+    return trimmed if trimmed == text else trimmed.rstrip() + "…"
+
+def _bigrams(text: str) -> set:
+    text = normalize_query(text).replace(" ", "")
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+def trim_extractive(text: str, budget: int, query: str = "") -> str:
+    """
+    긴 글을 문장 단위로 요약합니다. 첫 문장은 항상 남기고, query(질문 등)와 겹치는 표현이 많거나
+    수치가 들어간 문장을 우선으로 budget 안에서 골라 원래 순서대로 이어 붙입니다.
+    """
+    sentences = [s.strip() for s in _SENTENCE_SPLIT.split(text) if s.strip()]
+    if len(sentences) <= 1:
+        return trim_tail(text, budget)
+
+    query_bigrams = _bigrams(query)
+
+    def score(sentence: str) -> float:
+        bigrams = _bigrams(sentence)
+        overlap = len(bigrams & query_bigrams) / (len(bigrams) or 1)
+        return overlap + (0.2 if re.search(r"\d", sentence) else 0.0)
+
+    costs = [count_tokens(s) + 1 for s in sentences]
+    if costs[0] > budget:
+        return trim_tail(sentences[0], budget)
+
+    chosen = {0}
+    used = costs[0]
+    for i in sorted(range(1, len(sentences)), key=lambda i: score(sentences[i]), reverse=True):
+        if used + costs[i] <= budget:
+            chosen.add(i)
+            used += costs[i]
+
+    picked = sorted(chosen)
+    parts = []
+    for prev, i in zip([None] + picked, picked):
+        if prev is not None and i != prev + 1:
+            parts.append("…")
+        parts.append(sentences[i])
+    return " ".join(parts)
+
+def trim_examples(text: str, budget: int, query: str = "") -> str:
+    """
+    빈 줄로 구분된 질문 예시 묶음("[기업: ...] 관련 질문들:" 헤더 + 질문 줄)을 줄입니다.
+    묶음 사이에 중복된 질문을 먼저 빼고, 각 묶음에서 번갈아 한 줄씩 budget 안에서 남깁니다.
+    """
+    groups: List[Tuple[str, List[str]]] = []
+    seen = set()
+    for block in text.split("\n\n"):
+        lines = [line for line in block.split("\n") if line.strip()]
+        if not lines:
+            continue
+        items = []
+        for line in lines[1:]:
+            key = normalize_query(line)
+            if key not in seen:
+                seen.add(key)
+                items.append(line)
+        groups.append((lines[0], items))
+
+    used = sum(count_tokens(header) + 1 for header, _ in groups)
+    kept: List[List[str]] = [[] for _ in groups]
+    for rank in range(max((len(items) for _, items in groups), default=0)):
+        for g, (_, items) in enumerate(groups):
+            if rank < len(items):
+                cost = count_tokens(items[rank]) + 1
+                if used + cost <= budget:
+                    kept[g].append(items[rank])
+                    used += cost
+
+    return "\n\n".join("\n".join([header] + lines) for (header, _), lines in zip(groups, kept))
+
+class Section:
+    """
+    프롬프트의 가변 구간 하나입니다.
+    budget을 넘으면 trim 함수로 줄이고, 전체 예산을 넘으면 priority가 낮은 구간부터 더 줄입니다.
+    """
+
+    def __init__(self, name: str, text: str, budget: int, priority: int = 0,
+                 trim: Callable[[str, int, str], str] = trim_tail, query: str = "", min_tokens: int = 0):
+        self.name = name
+        self.text = text or ""
+        self.budget = budget
+        self.priority = priority
+        self.trim = trim
+        self.query = query
+        self.min_tokens = min_tokens
+        self.original_tokens = count_tokens(self.text)
+        self.tokens = self.original_tokens
+
+    def fit(self, budget: int):
+        if self.tokens > budget:
+            self.text = self.trim(self.text, budget, self.query)
+            self.tokens = count_tokens(self.text)
+
+class TokenReport:
+    def __init__(self, prompt: str, sections: List[Section], total_tokens: int):
+        self.prompt = prompt
+        self.sections = {
+            section.name: {"tokens": section.tokens, "original": section.original_tokens, "budget": section.budget}
+            for section in sections
+        }
+        self.total_tokens = total_tokens
+
+    @property
+    def trimmed_tokens(self) -> int:
+        return sum(s["original"] - s["tokens"] for s in self.sections.values())
+
+    def as_dict(self) -> dict:
+        return {"prompt": self.prompt, "total_tokens": self.total_tokens, "sections": self.sections}
+
+    def __str__(self):
+        parts = ", ".join(
+            f"{name} {s['tokens']}" + (f"(←{s['original']})" if s["original"] != s["tokens"] else "")
+            for name, s in self.sections.items()
+        )
+        return f"🧮 {self.prompt} 프롬프트 토큰 {self.total_tokens} ({parts})"
+
+def fit_sections(sections: List[Section], total_budget: int) -> Dict[str, str]:
+    """
+    각 구간을 자신의 예산에 맞추고, 합계가 total_budget을 넘으면 priority가 낮은 구간부터 더 줄입니다.
+    구간 이름별로 줄인 텍스트를 반환합니다.
+    """
+    for section in sections:
+        section.fit(section.budget)
+
+    over = sum(section.tokens for section in sections) - total_budget
+    for section in sorted(sections, key=lambda s: s.priority):
+        if over <= 0:
+            break
+        before = section.tokens
+        section.fit(max(section.min_tokens, section.tokens - over))
+        over -= before - section.tokens
+
+    return {section.name: section.text for section in sections}
+
+def report_tokens(prompt_name: str, prompt: str, sections: List[Section]) -> TokenReport:
+    """
+    완성된 프롬프트의 토큰 수를 구간별로 기록합니다. (prompt_tokens_total, prompt_trimmed_tokens_total)
+    """
+    report = TokenReport(prompt_name, sections, count_tokens(prompt))
+    labels = {"prompt": prompt_name}
+    metrics.inc("prompt_requests_total", labels=labels)
+    metrics.inc("prompt_tokens_total", report.total_tokens, labels=labels)
+    for section in sections:
+        metrics.inc("prompt_section_tokens_total", section.tokens, labels={**labels, "section": section.name})
+    if report.trimmed_tokens:
+        metrics.inc("prompt_trimmed_tokens_total", report.trimmed_tokens, labels=labels)
+    return report
+
+def build_prompt(prompt_name: str, sections: List[Section], total_budget: int,
+                 render: Callable[[Dict[str, str]], str]) -> Tuple[str, TokenReport]:
+    texts = fit_sections(sections, total_budget)
+    prompt = render(texts)
+    return prompt, report_tokens(prompt_name, prompt, sections)
@@ -1,6 +1,21 @@
 # app/prompts/interview_qas_prompts.py
 
+from app.core.config import settings
+from app.prompts.budget import Section, build_prompt, trim_examples, trim_extractive
+
 def generate_interview_qas_prompt(pplx_content: str, resume_content: str, chroma_examples: str) -> str:
+    # 전체 예산을 넘으면 Chroma 질문 예시(중복 제거 후) → Perplexity 요약 → 자기소개서 순으로 줄임
+    sections = [
+        Section("chroma_examples", chroma_examples, settings.PROMPT_EXAMPLES_TOKENS, priority=0, trim=trim_examples),
+        Section("pplx_content", pplx_content, settings.PROMPT_SUMMARY_TOKENS, priority=1),
+        Section("resume_content", resume_content, settings.PROMPT_RESUME_TOKENS, priority=2, trim=trim_extractive,
+                query=pplx_content),
+    ]
+    prompt, _ = build_prompt("generate-qas", sections, settings.PROMPT_TOTAL_TOKENS,
+                             lambda texts: _render(texts["pplx_content"], texts["resume_content"], texts["chroma_examples"]))
+    return prompt
+
+def _render(pplx_content: str, resume_content: str, chroma_examples: str) -> str:
     return f"""
 Perplexity 검색 내용: {pplx_content}
 자기소개서 내용: {resume_content}
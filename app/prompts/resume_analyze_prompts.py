@@ -1,6 +1,19 @@
 # app/prompts/resume_analyze_prompts.py
 
+from app.core.config import settings
+from app.prompts.budget import Section, build_prompt, trim_extractive
+
 def generate_resume_analysis_prompt(question: str, resume: str, company: str, position: str, company_summary: str) -> str:
+    # 전체 예산을 넘으면 기업 요약을 먼저 줄이고, 그래도 넘으면 자기소개서 답변을 문장 단위로 요약
+    sections = [
+        Section("company_summary", company_summary, settings.PROMPT_SUMMARY_TOKENS, priority=0, query=position),
+        Section("resume", resume, settings.PROMPT_RESUME_TOKENS, priority=1, trim=trim_extractive, query=question),
+    ]
+    prompt, _ = build_prompt("analyze-resume", sections, settings.PROMPT_TOTAL_TOKENS,
+                             lambda texts: _render(question, texts["resume"], company, position, texts["company_summary"]))
+    return prompt
+
+def _render(question: str, resume: str, company: str, position: str, company_summary: str) -> str:
     return f"""
 다음은 {company}의 {position} 직무에 지원한 자기소개서 문항과 답변입니다.
 
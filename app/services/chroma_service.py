@@ -1,14 +1,51 @@
 # app/services/chroma_service.py
 
-from app.core.vector_utils import get_chroma_db
-
-def search_similar_questions(query: str):
-    db = get_chroma_db()
-    results = db.similarity_search(query, k=3)
-    return [
-        {
-            "content": doc.page_content,
-            "metadata": doc.metadata
-        }
-        for doc in results
-    ]
\ No newline at end of file
+from typing import Dict, List, Optional
+from app.core.metadata_index import filter_key
+from app.core.normalize import normalize_query
+from app.core.singleflight import SingleFlight
+from app.core.tracing import span
+from app.core.vector_utils import get_retrieval_engine
+
+# 동시에 들어온 같은 검색어는 한 번만 검색하고 결과를 공유
+search_flight = SingleFlight("chroma_search")
+
+def search_similar_questions(query: str, k: int = 3, filters: Optional[Dict[str, str]] = None,
+                             diversify: bool = False):
+    """
+    filters에는 company, career, position을 지정할 수 있으며, 해당 조건의 질문 중에서만 검색합니다.
+    diversify가 True이면 서로 비슷한 질문이 함께 나오지 않도록 MMR로 고릅니다.
+    """
+    key = f"{k}:{int(diversify)}:{normalize_query(query)}:{filter_key(filters)}"
+    with span("chroma_search"):
+        return search_flight.do_sync(
+            key, lambda: get_retrieval_engine().similarity_search(query, k=k, filters=filters, diversify=diversify)
+        )
+
+def search_similar_questions_batch(queries: List[str], k: int = 3,
+                                   filters: Optional[List[Optional[Dict[str, str]]]] = None,
+                                   diversify: bool = False):
+    """
+    여러 검색어를 한 번에 임베딩하고 검색하여, 입력 순서대로 결과 목록을 반환합니다.
+    filters는 검색어마다 하나씩 지정합니다.
+    """
+    filters = filters or [None] * len(queries)
+
+    # 정규화 기준으로 같은 검색어(+필터)는 한 번만 검색
+    unique = {}
+    keys = []
+    for query, query_filters in zip(queries, filters):
+        key = f"{normalize_query(query)}:{filter_key(query_filters)}"
+        unique.setdefault(key, (query, query_filters))
+        keys.append(key)
+    unique_keys = list(unique)
+
+    with span("chroma_search_batch"):
+        results = get_retrieval_engine().similarity_search_batch(
+            [unique[key][0] for key in unique_keys],
+            k=k,
+            filters=[unique[key][1] for key in unique_keys],
+            diversify=diversify,
+        )
+    by_key = dict(zip(unique_keys, results))
+    return [by_key[key] for key in keys]
@@ -1,17 +1,32 @@
 # app/services/gpt_service.py
 
+import json
 import os
-import requests
+import time
 from dotenv import load_dotenv
-from typing import Optional
+from typing import AsyncIterator, Optional
+from app.core.config import settings
+from app.core.deadline import Deadline, timeout_for
+from app.core.hedging import Hedger
+from app.core.http_client import get_upstream
+from app.core.metrics import metrics
+from app.core.response_cache import response_cache
+from app.core.tracing import add_timing, span
 
 # .env 로드
 load_dotenv()
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-def get_chat_response(prompt: str, model: str = "gpt-4o", mode: str = "text") -> Optional[str]:
-    url = "https://api.openai.com/v1/chat/completions"
+# 느린 GPT 응답에 대한 헤지 요청 (HEDGE_PERCENTILE이 0이면 사용 안 함)
+gpt_hedger = Hedger(
+    "openai",
+    percentile=settings.HEDGE_PERCENTILE,
+    budget_ratio=settings.HEDGE_BUDGET_RATIO,
+    min_samples=settings.HEDGE_MIN_SAMPLES,
+)
+
+def _build_request(prompt: str, model: str, stream: bool):
     headers = {
         "Content-Type": "application/json",
         "Authorization": f"Bearer {OPENAI_API_KEY}"
@@ -38,16 +53,83 @@ def get_chat_response(prompt: str, model: str = "gpt-4o", mode: str = "text") ->
         "max_tokens": 1000,
         "temperature": 0.7,
         "top_p": 0.9,
-        "stream": False
+        "stream": stream
     }
+    if stream:
+        # 스트리밍에서도 마지막 청크로 토큰 사용량(usage)을 받음
+        payload["stream_options"] = {"include_usage": True}
+    return headers, payload
 
-    try:
-        response = requests.post(url, headers=headers, json=payload)
-        response.raise_for_status()
+async def get_chat_response(prompt: str, model: str = "gpt-4o", mode: str = "text",
+                            endpoint: Optional[str] = None, bypass_cache: bool = False,
+                            deadline: Optional[Deadline] = None) -> Optional[str]:
+    """
+    endpoint가 GPT_CACHE_ENDPOINTS에 포함되면 같은 요청의 응답을 캐시에서 돌려줍니다.
+    bypass_cache가 True이면 캐시를 읽지 않고 새로 호출한 결과로 캐시를 갱신합니다.
+    deadline이 지나면 호출을 중단하고 None을 반환합니다.
+    """
+    headers, payload = _build_request(prompt, model, stream=False)
 
-        data = response.json()
-        return data["choices"][0]["message"]["content"]
+    use_cache = response_cache.enabled(endpoint)
+    if use_cache:
+        cache_key = response_cache.key(endpoint, payload)
+        if not bypass_cache:
+            cached = await response_cache.get(endpoint, cache_key)
+            if cached is not None:
+                return cached
+
+    try:
+        upstream = get_upstream("openai")
+        with span("gpt", {"model": model}):
+            data = await gpt_hedger.run(
+                lambda: upstream.post_json("/chat/completions", headers=headers, payload=payload, deadline=deadline),
+                timeout=timeout_for(deadline),
+            )
+        content = data["choices"][0]["message"]["content"]
 
     except Exception as e:
         print("❌ GPT API 호출 오류:", e)
         return None
+
+    if use_cache and content:
+        await response_cache.set(cache_key, content)
+    return content
+
+async def stream_chat_response(prompt: str, model: str = "gpt-4o",
+                               deadline: Optional[Deadline] = None) -> AsyncIterator[str]:
+    """
+    GPT 응답을 토큰(delta) 단위로 받아 순서대로 yield 합니다.
+    호출 중 오류가 나면 로그를 남기고 예외를 다시 던져, 호출한 쪽이 응답이 중간에 끊겼음을 알 수 있게 합니다.
+    deadline이 지나면 DeadlineExceeded로 스트림을 끊습니다.
+    """
+    headers, payload = _build_request(prompt, model, stream=True)
+    start = time.perf_counter()
+    first_token = True
+
+    try:
+        upstream = get_upstream("openai")
+        async for line in upstream.stream_lines("/chat/completions", headers=headers, payload=payload,
+                                               deadline=deadline):
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+
+            chunk = json.loads(data)
+            upstream.record_usage(model, chunk.get("usage"))
+            choices = chunk.get("choices") or []
+            delta = choices[0].get("delta", {}).get("content") if choices else None
+            if not delta:
+                continue
+
+            if first_token:
+                seconds = time.perf_counter() - start
+                metrics.observe("gpt_stream_first_token_seconds", seconds, {"model": model})
+                add_timing("gpt_first_token", seconds)
+                first_token = False
+            yield delta
+
+    except Exception as e:
+        print("❌ GPT 스트리밍 호출 오류:", e)
+        raise
@@ -0,0 +1,132 @@
+# app/services/interview_service.py
+
+import asyncio
+from typing import Dict, List, Optional
+from fastapi.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.deadline import Deadline, timeout_for
+from app.core.pipeline import Stage, run_stage_graph
+from app.services.chroma_service import search_similar_questions_batch
+from app.services.gpt_service import get_chat_response
+from app.services.perplexity_service import search_perplexity_summary, PERPLEXITY_FAILED
+from app.prompts.resume_analyze_prompts import generate_resume_analysis_prompt
+from app.prompts.interview_qas_prompts import generate_interview_qas_prompt
+
+RESUME_ANALYSIS_FAILED = {"feedback": ["GPT 분석에 실패했습니다."]}
+
+async def analyze_resume_item(question: str, resume: str, company: str, position: str,
+                              bypass_cache: bool = False, company_summary: Optional[str] = None,
+                              deadline: Optional[Deadline] = None) -> dict:
+    """
+    자기소개서 문항 하나를 분석합니다. (/interview/analyze-resume, 비동기 작업 API 공용)
+    company_summary를 주면 기업 정보 요약 검색을 건너뜁니다.
+    """
+    # 1. 기업 정보 요약 검색
+    if company_summary is None:
+        company_summary = await search_perplexity_summary(company, deadline=deadline)
+
+    # 2. 프롬프트 생성
+    prompt = generate_resume_analysis_prompt(
+        question=question,
+        resume=resume,
+        company=company,
+        position=position,
+        company_summary=company_summary
+    )
+
+    # 3. GPT 응답
+    response = await get_chat_response(prompt, model="gpt-4o", mode="text",
+                                       endpoint="analyze-resume", bypass_cache=bypass_cache, deadline=deadline)
+
+    if not response or not isinstance(response, str):
+        return dict(RESUME_ANALYSIS_FAILED)
+
+    # 4. 줄 단위 피드백 파싱
+    feedback = [line.strip() for line in response.split("\n") if line.strip()]
+    return {"feedback": feedback}
+
+async def analyze_resume_items(items: List[Dict[str, str]], company: str, position: str,
+                               bypass_cache: bool = False, deadline: Optional[Deadline] = None) -> List[dict]:
+    """
+    같은 기업/직무의 자기소개서 문항 여러 개를 분석하여 입력 순서대로 반환합니다.
+    기업 정보 요약은 한 번만 검색하고, 문항별 GPT 분석은 RESUME_BATCH_CONCURRENCY개까지 동시에 실행합니다.
+    한 문항이 실패해도 나머지 문항의 결과에는 영향을 주지 않습니다.
+    """
+    company_summary = await search_perplexity_summary(company, deadline=deadline)
+    semaphore = asyncio.Semaphore(settings.RESUME_BATCH_CONCURRENCY)
+
+    async def analyze(item):
+        async with semaphore:
+            try:
+                return await analyze_resume_item(
+                    question=item["question"],
+                    resume=item["resume"],
+                    company=company,
+                    position=position,
+                    bypass_cache=bypass_cache,
+                    company_summary=company_summary,
+                    deadline=deadline
+                )
+            except Exception as e:
+                print(f"❌ 자기소개서 문항 분석 실패: {e}")
+                return dict(RESUME_ANALYSIS_FAILED)
+
+    results = await asyncio.gather(*(analyze(item) for item in items))
+    return [{"question": item["question"], **result} for item, result in zip(items, results)]
+
+async def generate_qas(company: str, position: str, resume_content: str, bypass_cache: bool = False,
+                       deadline: Optional[Deadline] = None) -> dict:
+    """
+    기업/직무 정보와 자기소개서로 예상 면접 질문을 생성합니다. (/interview/generate-qas, 비동기 작업 API 공용)
+    """
+    search_query = f"{company} {position}"
+
+    # 1. Perplexity 요약 검색과 Chroma 기업/직무 질문 검색은 서로 독립적이므로 동시에 실행
+    async def pplx_summary():
+        return await search_perplexity_summary(search_query, deadline=deadline)
+
+    async def chroma_questions():
+        # 기업 질문은 기업명 메타데이터로 후보를 좁혀 직무와 가까운 질문을 찾고,
+        # 데이터셋에 없는 기업이면 기업명 텍스트 검색 결과를 사용 (한 번의 encode로 처리)
+        filtered, by_company, by_position = await run_in_threadpool(
+            search_similar_questions_batch,
+            [position, company, position],
+            3,
+            [{"company": company}, None, None],
+            settings.QAS_EXAMPLES_MMR,
+        )
+        return filtered or by_company, by_position
+
+    # 2. 검색 결과와 자기소개서 내용을 합쳐 프롬프트 생성
+    async def prompt(pplx_summary, chroma_questions):
+        company_questions, position_questions = chroma_questions or ([], [])
+        # 기업/직무 검색 결과에 같은 질문이 함께 나오면 한 번만 넣음
+        company_contents = {q["content"] for q in company_questions}
+        position_questions = [q for q in position_questions if q["content"] not in company_contents]
+        company_q_text = "\n".join([q["content"] for q in company_questions])
+        position_q_text = "\n".join([q["content"] for q in position_questions])
+
+        chroma_examples = f"[기업: {company}] 관련 질문들:\n{company_q_text}\n\n[직무: {position}] 관련 질문들:\n{position_q_text}"
+        return generate_interview_qas_prompt(pplx_summary, resume_content, chroma_examples)
+
+    # 3. GPT로 질문 생성
+    async def gpt(prompt):
+        return await get_chat_response(prompt, model="gpt-4o", mode="text",
+                                       endpoint="generate-qas", bypass_cache=bypass_cache, deadline=deadline)
+
+    # 단계별 타임아웃을 넘기면 대체 값으로 진행 (예: Perplexity가 느리면 Chroma 예시만 사용)
+    # 남은 마감 시간이 더 짧으면 그 시간을 단계 타임아웃으로 사용
+    results, _ = await run_stage_graph([
+        Stage("pplx_summary", pplx_summary, timeout=timeout_for(deadline, settings.PPLX_STAGE_TIMEOUT_SECONDS),
+              fallback=PERPLEXITY_FAILED),
+        Stage("chroma_questions", chroma_questions, timeout=timeout_for(deadline, settings.CHROMA_STAGE_TIMEOUT_SECONDS)),
+        Stage("prompt", prompt, deps=("pplx_summary", "chroma_questions")),
+        Stage("gpt", gpt, deps=("prompt",)),
+    ], pipeline="generate-qas")
+    response = results["gpt"]
+
+    if not response or not isinstance(response, str):
+        return {"message": "질문 생성 실패"}
+
+    questions = [line for line in response.split("\n") if line.strip()]
+    return {"questions": questions}
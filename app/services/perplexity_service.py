@@ -1,19 +1,64 @@
 # app/services/perplexity_service.py
 
 import os
-import requests
+from typing import Optional
 from dotenv import load_dotenv
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.deadline import Deadline, timeout_for
+from app.core.hedging import Hedger
+from app.core.http_client import get_upstream
+from app.core.normalize import normalize_query
+from app.core.singleflight import SingleFlight
+from app.core.tracing import span
 
 # .env 로드
 load_dotenv()
 
 PPLX_API_KEY = os.getenv("PPLX_API_KEY")
 
-def search_perplexity_summary(query: str) -> str:
+# 호출 실패 시 반환되는 문구
+PERPLEXITY_FAILED = "Perplexity 검색 실패"
+
+# 같은 기업/직무 문자열이 반복 조회되므로 요약 결과를 캐시
+summary_cache = TTLCache(
+    name="perplexity_summary",
+    maxsize=settings.PPLX_CACHE_MAXSIZE,
+    ttl=settings.PPLX_CACHE_TTL_SECONDS,
+    persist_path=settings.PPLX_CACHE_PATH or None,
+)
+
+# 동시에 들어온 같은 질의는 하나의 Perplexity 호출로 합침
+summary_flight = SingleFlight("perplexity_summary")
+
+# 느린 Perplexity 응답에 대한 헤지 요청 (HEDGE_PERCENTILE이 0이면 사용 안 함)
+summary_hedger = Hedger(
+    "perplexity",
+    percentile=settings.HEDGE_PERCENTILE,
+    budget_ratio=settings.HEDGE_BUDGET_RATIO,
+    min_samples=settings.HEDGE_MIN_SAMPLES,
+)
+
+async def search_perplexity_summary(query: str, deadline: Optional[Deadline] = None) -> str:
     """
     Perplexity API를 이용하여 기업과 직무 관련 요약 정보를 가져옵니다.
+    정규화된 질의 기준으로 캐시하며, 실패 문구는 캐시하지 않습니다.
+    같은 질의가 동시에 들어오면 먼저 호출한 요청의 deadline이 적용됩니다.
     """
-    url = "https://api.perplexity.ai/chat/completions"
+    key = normalize_query(query)
+    cached = summary_cache.get(key)
+    if cached is not None:
+        return cached
+
+    async def fetch():
+        summary = await _request_perplexity_summary(query, deadline)
+        if summary != PERPLEXITY_FAILED:
+            summary_cache.set(key, summary)
+        return summary
+
+    return await summary_flight.do(key, fetch)
+
+async def _request_perplexity_summary(query: str, deadline: Optional[Deadline] = None) -> str:
     headers = {
         "Content-Type": "application/json",
         "Authorization": f"Bearer {PPLX_API_KEY}",
@@ -43,11 +88,14 @@ def search_perplexity_summary(query: str) -> str:
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
-        response.raise_for_status()
-        data = response.json()
+        upstream = get_upstream("perplexity")
+        with span("perplexity"):
+            data = await summary_hedger.run(
+                lambda: upstream.post_json("/chat/completions", headers=headers, payload=payload, deadline=deadline),
+                timeout=timeout_for(deadline),
+            )
         return data["choices"][0]["message"]["content"]
 
     except Exception as e:
         print(f"❌ Perplexity API 호출 실패: {e}")
-        return "Perplexity 검색 실패"
+        return PERPLEXITY_FAILED
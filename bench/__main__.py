@@ -0,0 +1,130 @@
+# bench/__main__.py
+
+import argparse
+import json
+import sys
+import time
+from bench import load, micro, startup
+from bench.stats import print_table, report_comparison, save_results
+from bench.stub_upstream import BackgroundServer, LatencyModel, create_stub_app
+
+def _add_latency_args(parser, prefix: str, median_ms: float):
+    parser.add_argument(f"--{prefix}-median-ms", type=float, default=median_ms, help="스텁 응답 지연 중앙값(ms)")
+    parser.add_argument(f"--{prefix}-sigma", type=float, default=0.5, help="로그정규 지연 분포의 sigma")
+    parser.add_argument(f"--{prefix}-tail-rate", type=float, default=0.0, help="tail 지연을 더할 요청 비율")
+    parser.add_argument(f"--{prefix}-tail-ms", type=float, default=0.0, help="tail 요청에 더할 지연(ms)")
+    parser.add_argument(f"--{prefix}-error-rate", type=float, default=0.0, help="500으로 응답할 비율")
+    parser.add_argument(f"--{prefix}-throttle-rate", type=float, default=0.0, help="429로 응답할 비율")
+
+def _latency_model(args, prefix: str) -> LatencyModel:
+    prefix = prefix.replace("-", "_")
+    return LatencyModel(
+        median_ms=getattr(args, f"{prefix}_median_ms"),
+        sigma=getattr(args, f"{prefix}_sigma"),
+        tail_rate=getattr(args, f"{prefix}_tail_rate"),
+        tail_ms=getattr(args, f"{prefix}_tail_ms"),
+        error_rate=getattr(args, f"{prefix}_error_rate"),
+        throttle_rate=getattr(args, f"{prefix}_throttle_rate"),
+        seed=args.seed,
+    )
+
+def _finish(name: str, results: dict, args) -> int:
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        print(f"💾 기준값 저장: {save_results(name, results)}")
+    if args.compare and not report_comparison(name, results, args.threshold):
+        return 1
+    return 0
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench", description="오프라인 벤치마크와 부하 테스트")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def common(sub):
+        sub.add_argument("--csv", default="dataset_question.csv")
+        sub.add_argument("--seed", type=int, default=0)
+        sub.add_argument("--output", help="결과 JSON을 저장할 경로")
+        sub.add_argument("--save-baseline", action="store_true", help="결과를 bench/baselines에 기준값으로 저장")
+        sub.add_argument("--compare", action="store_true", help="저장된 기준값과 비교해 나빠졌으면 종료 코드 1")
+        sub.add_argument("--threshold", type=float, default=0.2, help="회귀로 볼 변화 비율 (기본 20%%)")
+        sub.add_argument("--embedding-backend", default="hash", help="hash | onnx | torch (hash는 모델 없이 실행)")
+
+    micro_parser = commands.add_parser("micro", help="임베딩, 인덱스 생성, 벡터 검색 마이크로 벤치마크")
+    common(micro_parser)
+    micro_parser.add_argument("--queries", type=int, default=500)
+    micro_parser.add_argument("--limit", type=int, default=0, help="사용할 최대 문서 수 (0이면 전체)")
+
+    load_parser = commands.add_parser("load", help="스텁 업스트림을 붙여 모든 라우트에 부하 테스트")
+    common(load_parser)
+    load_parser.add_argument("--requests", type=int, default=200, help="라우트당 요청 수")
+    load_parser.add_argument("--concurrency", type=int, default=16)
+    load_parser.add_argument("--warmup", type=int, default=10)
+    load_parser.add_argument("--routes", nargs="*", help="이 이름으로 시작하는 라우트만 실행 (예: chroma interview/follow-up)")
+    load_parser.add_argument("--workers", type=int, default=1, help="uvicorn 워커 수")
+    load_parser.add_argument("--use-cache", action="store_true", help="X-Cache-Bypass 없이 응답 캐시를 그대로 사용")
+    load_parser.add_argument("--server-log", action="store_true", help="앱 서버의 로그 출력을 표시")
+    load_parser.add_argument("--env", nargs="*", default=[], help="앱 서버에 넘길 환경 변수 (KEY=VALUE)")
+    _add_latency_args(load_parser, "openai", 300)
+    _add_latency_args(load_parser, "perplexity", 800)
+
+    startup_parser = commands.add_parser("startup", help="import 시간 프로파일과 liveness/readiness까지 걸리는 시간")
+    common(startup_parser)
+    startup_parser.add_argument("--import-budget", type=float, default=2.0, help="import main 허용 시간(초, 0이면 검사 안 함)")
+    startup_parser.add_argument("--ready-budget", type=float, default=30.0, help="/readyz가 200이 될 때까지 허용 시간(초)")
+    startup_parser.add_argument("--env", nargs="*", default=[], help="앱 서버에 넘길 환경 변수 (KEY=VALUE)")
+
+    stub_parser = commands.add_parser("stub", help="스텁 업스트림만 실행 (직접 띄운 서버와 함께 사용)")
+    stub_parser.add_argument("--port", type=int, default=8765)
+    stub_parser.add_argument("--seed", type=int, default=None)
+    _add_latency_args(stub_parser, "openai", 300)
+
+    args = parser.parse_args()
+
+    if args.command == "micro":
+        results = micro.run(args.csv, args.embedding_backend, queries=args.queries, limit=args.limit, seed=args.seed)
+        micro.print_results(results)
+        return _finish(f"micro-{args.embedding_backend}", results, args)
+
+    if args.command == "load":
+        results = load.run(
+            args.csv,
+            requests=args.requests,
+            concurrency=args.concurrency,
+            warmup=args.warmup,
+            routes=args.routes,
+            openai=_latency_model(args, "openai"),
+            perplexity=_latency_model(args, "perplexity"),
+            embedding_backend=args.embedding_backend,
+            workers=args.workers,
+            bypass_cache=not args.use_cache,
+            seed=args.seed,
+            extra_env=dict(item.split("=", 1) for item in args.env),
+            server_log=args.server_log,
+        )
+        print_table({name: row for name, row in results.items() if not name.startswith("_")})
+        print(f"🧠 앱 서버 RSS: {results['_server']['rss_mb']}MB")
+        return _finish(f"load-c{args.concurrency}", results, args)
+
+    if args.command == "startup":
+        results = startup.run(args.csv, args.embedding_backend, extra_env=dict(item.split("=", 1) for item in args.env))
+        startup.print_results(results)
+        violations = startup.check_budget(results, args.import_budget, args.ready_budget)
+        for violation in violations:
+            print(f"❌ {violation}")
+        status = _finish(f"startup-{args.embedding_backend}", results, args)
+        return 1 if violations else status
+
+    # stub: OPENAI_BASE_URL/PERPLEXITY_BASE_URL을 이 주소로 두고 서버를 직접 띄워 테스트
+    server = BackgroundServer(create_stub_app("stub", _latency_model(args, "openai")), args.port).start()
+    print(f"✅ 스텁 업스트림 실행 중: {server.url} (Ctrl+C로 종료)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
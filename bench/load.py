@@ -0,0 +1,222 @@
+# bench/load.py
+
+import asyncio
+import collections
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import httpx
+from typing import Callable, Dict, List, Optional
+from app.core.embedding_backends import create_encoder
+from bench.micro import build_index, load_rows
+from bench.stats import rss_mb, summarize
+from bench.stub_upstream import BackgroundServer, LatencyModel, create_stub_app
+
+RESUME_TEXT = (
+    "대학 시절 교내 동아리에서 재고 관리 프로그램을 만들면서 데이터 정합성 문제를 해결한 경험이 있습니다. "
+    "주문 100건 중 7건에서 재고 수량이 어긋나는 원인을 찾기 위해 로그를 분석했고, 트랜잭션 처리를 추가해 오류를 0건으로 줄였습니다. "
+    "이 경험으로 문제를 끝까지 추적하는 습관을 길렀고, 입사 후에도 현장의 데이터를 바탕으로 개선점을 찾겠습니다."
+)
+
+class Scenario:
+    """
+    부하를 걸 라우트 하나입니다. payload(rng, row)는 데이터셋의 한 행으로 요청 본문을 만듭니다.
+    """
+
+    def __init__(self, name: str, path: str, payload: Callable[[random.Random, dict], dict], stream: bool = False):
+        self.name = name
+        self.path = path
+        self.payload = payload
+        self.stream = stream
+
+def _question(row: dict) -> str:
+    return row["document"].split(" [기업명:")[0]
+
+SCENARIOS = [
+    Scenario("chroma/search", "/chroma/search",
+             lambda rng, row: {"query": _question(row), "k": 3}),
+    Scenario("chroma/search-batch", "/chroma/search-batch",
+             lambda rng, row: {"queries": [_question(row), row["position"]], "k": 3}),
+    Scenario("perplexity/summary", "/perplexity/summary",
+             lambda rng, row: {"query": f"{row['company']} {row['position']}"}),
+    Scenario("interview/analyze-resume", "/interview/analyze-resume",
+             lambda rng, row: {"question": "지원 동기를 작성해주세요.", "resume": RESUME_TEXT,
+                               "company": row["company"], "position": row["position"]}),
+    Scenario("interview/analyze-resume-batch", "/interview/analyze-resume-batch",
+             lambda rng, row: {"company": row["company"], "position": row["position"], "items": [
+                 {"question": "지원 동기를 작성해주세요.", "resume": RESUME_TEXT},
+                 {"question": "가장 어려웠던 경험을 작성해주세요.", "resume": RESUME_TEXT},
+             ]}),
+    Scenario("interview/analyze-resume/stream", "/interview/analyze-resume/stream",
+             lambda rng, row: {"question": "지원 동기를 작성해주세요.", "resume": RESUME_TEXT,
+                               "company": row["company"], "position": row["position"]}, stream=True),
+    Scenario("interview/analyze-answer", "/interview/analyze-answer",
+             lambda rng, row: {"question": _question(row), "answer": RESUME_TEXT, "resume": RESUME_TEXT}),
+    Scenario("interview/analyze-answer/stream", "/interview/analyze-answer/stream",
+             lambda rng, row: {"question": _question(row), "answer": RESUME_TEXT, "resume": RESUME_TEXT}, stream=True),
+    Scenario("interview/follow-up", "/interview/follow-up",
+             lambda rng, row: {"question": _question(row), "answer": RESUME_TEXT}),
+    Scenario("interview/follow-up/stream", "/interview/follow-up/stream",
+             lambda rng, row: {"question": _question(row), "answer": RESUME_TEXT}, stream=True),
+    Scenario("interview/generate-qas", "/interview/generate-qas",
+             lambda rng, row: {"company": row["company"], "position": row["position"], "resumeContent": RESUME_TEXT}),
+]
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+class AppServer:
+    """
+    bench.serve:app(main.app + 벤치마크 측정 엔드포인트)를 별도 uvicorn 프로세스로 실행합니다.
+    """
+
+    def __init__(self, port: int, env: Dict[str, str], workers: int = 1, log: bool = False):
+        self.url = f"http://127.0.0.1:{port}"
+        command = [sys.executable, "-m", "uvicorn", "bench.serve:app", "--host", "127.0.0.1", "--port", str(port),
+                   "--log-level", "warning", "--no-access-log"]
+        if workers > 1:
+            command += ["--workers", str(workers)]
+        # 앱의 요청별 로그는 기본적으로 숨김 (--server-log로 표시)
+        output = None if log else subprocess.DEVNULL
+        self.process = subprocess.Popen(command, env={**os.environ, **env}, stdout=output)
+
+    def wait_ready(self, timeout: float = 120):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"앱 서버가 종료되었습니다 (exit {self.process.returncode})")
+            try:
+                if httpx.get(f"{self.url}/readyz", timeout=1).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.2)
+        raise RuntimeError("앱 서버가 준비되지 않았습니다.")
+
+    def stop(self):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+async def _send(client: httpx.AsyncClient, scenario: Scenario, payload: dict, headers: dict) -> Optional[float]:
+    # 스트리밍이면 첫 바이트까지의 시간을 반환하고, 오류 응답이면 HTTPStatusError를 던짐
+    start = time.perf_counter()
+    if not scenario.stream:
+        response = await client.post(scenario.path, json=payload, headers=headers)
+        response.raise_for_status()
+        return None
+
+    first_byte = None
+    async with client.stream("POST", scenario.path, json=payload, headers=headers) as response:
+        response.raise_for_status()
+        async for _ in response.aiter_bytes():
+            if first_byte is None:
+                first_byte = time.perf_counter() - start
+    return first_byte
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, rows: List[dict], requests: int,
+                       concurrency: int, headers: dict, seed: int = 0) -> dict:
+    """
+    concurrency개의 작업자가 requests개의 요청을 나눠 보내고 지연 시간 분포와 처리량을 반환합니다.
+    """
+    rng = random.Random(seed)
+    payloads = [scenario.payload(rng, rng.choice(rows)) for _ in range(requests)]
+    latencies, first_bytes, errors = [], [], collections.Counter()
+    queue = iter(payloads)
+
+    async def worker():
+        for payload in queue:
+            start = time.perf_counter()
+            try:
+                first_byte = await _send(client, scenario, payload, headers)
+            except httpx.HTTPStatusError as e:
+                errors[str(e.response.status_code)] += 1
+                continue
+            except httpx.HTTPError as e:
+                errors[type(e).__name__] += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+            if first_byte is not None:
+                first_bytes.append(first_byte)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    summary = summarize(latencies, errors=sum(errors.values()), seconds=time.perf_counter() - start)
+    if errors:
+        summary["error_kinds"] = dict(errors)
+    if first_bytes:
+        summary["ttfb_p50_ms"] = summarize(first_bytes)["p50_ms"]
+        summary["ttfb_p95_ms"] = summarize(first_bytes)["p95_ms"]
+    return summary
+
+async def drive(url: str, rows: List[dict], scenarios: List[Scenario], requests: int, concurrency: int,
+                warmup: int, bypass_cache: bool, seed: int) -> Dict[str, dict]:
+    headers = {"X-Cache-Bypass": "true"} if bypass_cache else {}
+    limits = httpx.Limits(max_connections=concurrency * 2, max_keepalive_connections=concurrency * 2)
+    results = {}
+    async with httpx.AsyncClient(base_url=url, timeout=120, limits=limits) as client:
+        for scenario in scenarios:
+            if warmup:
+                await run_scenario(client, scenario, rows, warmup, min(concurrency, warmup), headers, seed=seed + 1)
+            await client.get("/__bench/stats", params={"reset": True})
+            result = await run_scenario(client, scenario, rows, requests, concurrency, headers, seed=seed)
+            server = (await client.get("/__bench/stats")).json()
+            result["loop_lag_p99_ms"] = server["loop_lag"].get("p99_ms")
+            result["loop_lag_max_ms"] = server["loop_lag"].get("max_ms")
+            result["server_rss_mb"] = server["rss_mb"]
+            results[scenario.name] = result
+            print(f"  {scenario.name}: p50 {result['p50_ms']}ms, p95 {result['p95_ms']}ms, "
+                  f"{result.get('throughput_rps')}rps, 오류 {result['errors']}")
+    return results
+
+def run(csv_filename: str = "dataset_question.csv", requests: int = 200, concurrency: int = 16, warmup: int = 10,
+        routes: Optional[List[str]] = None, openai: Optional[LatencyModel] = None, perplexity: Optional[LatencyModel] = None,
+        embedding_backend: str = "hash", workers: int = 1, bypass_cache: bool = True, seed: int = 0,
+        extra_env: Optional[Dict[str, str]] = None, server_log: bool = False) -> dict:
+    """
+    스텁 업스트림(OpenAI, Perplexity)과 앱 서버를 띄우고 모든 라우트에 차례로 부하를 겁니다.
+    embedding_backend가 hash이면 임시 NumPy 인덱스를 만들어 모델 없이 실행하고,
+    그 외에는 현재 .env의 저장소 설정(VECTOR_BACKEND 등)을 그대로 사용합니다.
+    """
+    scenarios = [s for s in SCENARIOS if not routes or any(s.name.startswith(r) for r in routes)]
+    _, documents, metadatas = load_rows(csv_filename)
+    rows = [{"document": d, "company": m["기업명"], "position": m["직무"]} for d, m in zip(documents, metadatas)]
+
+    openai = openai or LatencyModel(seed=seed)
+    perplexity = perplexity or LatencyModel(median_ms=800, seed=seed + 1)
+    stubs = [
+        BackgroundServer(create_stub_app("openai", openai), _free_port()).start(),
+        BackgroundServer(create_stub_app("perplexity", perplexity), _free_port()).start(),
+    ]
+    env = {
+        "OPENAI_BASE_URL": stubs[0].url,
+        "PERPLEXITY_BASE_URL": stubs[1].url,
+        "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "bench"),
+        "PERPLEXITY_API_KEY": os.environ.get("PERPLEXITY_API_KEY", "bench"),
+        "EMBEDDING_BACKEND": embedding_backend,
+    }
+
+    with tempfile.TemporaryDirectory(prefix="bench-load-") as tmp:
+        if embedding_backend == "hash":
+            build_index(tmp, csv_filename, create_encoder("hash"))
+            env.update({"VECTOR_BACKEND": "numpy", "NUMPY_INDEX_DIR": tmp, "EMBED_CACHE_PATH": ""})
+        env.update(extra_env or {})
+
+        server = AppServer(_free_port(), env, workers=workers, log=server_log)
+        try:
+            server.wait_ready()
+            results = asyncio.run(drive(server.url, rows, scenarios, requests, concurrency, warmup, bypass_cache, seed))
+            results["_server"] = {"rss_mb": rss_mb(server.process.pid)}
+        finally:
+            server.stop()
+            for stub in stubs:
+                stub.stop()
+    return results
@@ -0,0 +1,126 @@
+# bench/micro.py
+
+import random
+import tempfile
+import time
+import numpy as np
+from typing import Dict, List, Tuple
+from app.core.embedding_backends import create_encoder
+from app.core.ingest import format_document, iter_csv_rows, row_id
+from app.core.lexical_index import LexicalIndex
+from app.core.vector_backends import NumpyBackend, save_numpy_index
+from bench.stats import rss_mb, summarize
+
+def load_rows(csv_filename: str, limit: int = 0) -> Tuple[List[str], List[str], List[dict]]:
+    """
+    ingest와 같은 방식으로 CSV를 읽어 (id, 문서, 메타데이터) 목록을 만듭니다. 중복 행은 한 번만 남깁니다.
+    """
+    ids, documents, metadatas, seen = [], [], [], set()
+    for row in iter_csv_rows(csv_filename):
+        if not row["질문"].strip():
+            continue
+        doc_id = row_id(row)
+        if doc_id in seen:
+            continue
+        seen.add(doc_id)
+        content, metadata = format_document(row)
+        ids.append(doc_id)
+        documents.append(content)
+        metadatas.append(metadata)
+        if limit and len(ids) >= limit:
+            break
+    return ids, documents, metadatas
+
+def build_index(index_dir: str, csv_filename: str, encoder, batch_size: int = 64, limit: int = 0) -> dict:
+    """
+    CSV 전체를 임베딩해 index_dir에 NumPy 스냅샷(문자 n-gram 색인 포함)을 만들고 단계별 시간을 반환합니다.
+    """
+    ids, documents, metadatas = load_rows(csv_filename, limit)
+
+    start = time.perf_counter()
+    embeddings = np.concatenate([encoder.encode(documents[i:i + batch_size]) for i in range(0, len(documents), batch_size)])
+    embed_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    save_numpy_index(index_dir, embeddings, documents, metadatas, f"bench:{encoder.backend}", ids=ids)
+    save_seconds = time.perf_counter() - start
+    return {
+        "documents": len(documents),
+        "embed_seconds": round(embed_seconds, 3),
+        "embed_per_second": round(len(documents) / embed_seconds, 1) if embed_seconds else None,
+        "save_seconds": round(save_seconds, 3),
+    }
+
+def _time_each(func, items) -> List[float]:
+    latencies = []
+    for item in items:
+        start = time.perf_counter()
+        func(item)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+def bench_embedding(encoder, texts: List[str], batch_size: int = 64) -> dict:
+    single = _time_each(lambda text: encoder.encode([text]), texts[:200])
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        encoder.encode(texts[i:i + batch_size])
+    seconds = time.perf_counter() - start
+    return {
+        "single": summarize(single),
+        "batch_per_second": round(len(texts) / seconds, 1) if seconds else None,
+    }
+
+def bench_lexical_build(documents: List[str], ids: List[str]) -> dict:
+    start = time.perf_counter()
+    lexical = LexicalIndex.build(documents, ids=ids)
+    return {"build_seconds": round(time.perf_counter() - start, 3), "terms": len(lexical.terms)}
+
+def bench_search(backend: NumpyBackend, encoder, queries: List[str], companies: List[str], k: int = 5) -> Dict[str, dict]:
+    """
+    질의 벡터는 미리 구해 두고 저장소 검색 시간만 잽니다.
+    """
+    vectors = encoder.encode(queries)
+    cases = {
+        "vector": lambda i: backend.search(vectors[i:i + 1], k),
+        "hybrid": lambda i: backend.search(vectors[i:i + 1], k, queries=[queries[i]]),
+        "hybrid_mmr": lambda i: backend.search(vectors[i:i + 1], k, queries=[queries[i]], diversify=True),
+        "filtered": lambda i: backend.search(vectors[i:i + 1], k, filters={"company": companies[i]}),
+        "batch_32": lambda i: backend.search(vectors[:32], k, queries=queries[:32]),
+    }
+    results = {}
+    for name, search in cases.items():
+        search(0)
+        results[name] = summarize(_time_each(search, range(len(queries))))
+    return results
+
+def run(csv_filename: str = "dataset_question.csv", embedding_backend: str = "hash", queries: int = 500,
+        limit: int = 0, seed: int = 0) -> dict:
+    """
+    임베딩, 인덱스 생성, 벡터 검색 마이크로 벤치마크를 실행합니다. 인덱스는 임시 디렉터리에 만듭니다.
+    """
+    encoder = create_encoder(embedding_backend)
+    ids, documents, metadatas = load_rows(csv_filename, limit)
+    rng = random.Random(seed)
+    picked = [rng.randrange(len(documents)) for _ in range(queries)]
+    query_texts = [documents[i].split(" [기업명:")[0] for i in picked]
+    companies = [metadatas[i]["기업명"] for i in picked]
+
+    results = {"embedding": bench_embedding(encoder, documents)}
+    results["lexical"] = bench_lexical_build(documents, ids)
+    with tempfile.TemporaryDirectory(prefix="bench-index-") as index_dir:
+        results["index_build"] = build_index(index_dir, csv_filename, encoder, limit=limit)
+        backend = NumpyBackend(index_dir)
+        results["search"] = bench_search(backend, encoder, query_texts, companies)
+        backend.close()
+    results["rss_mb"] = rss_mb()
+    return results
+
+def print_results(results: dict):
+    embedding = results["embedding"]
+    print(f"📦 문서 수: {results['index_build']['documents']}, RSS: {results['rss_mb']}MB")
+    print(f"🔤 임베딩 단건 p50 {embedding['single']['p50_ms']}ms / p95 {embedding['single']['p95_ms']}ms, "
+          f"배치 {embedding['batch_per_second']}건/초")
+    print(f"🏗️ 인덱스 생성: 임베딩 {results['index_build']['embed_seconds']}초, "
+          f"저장(+문자 색인) {results['index_build']['save_seconds']}초, 문자 색인만 {results['lexical']['build_seconds']}초")
+    for name, row in results["search"].items():
+        print(f"🔍 검색 {name:<10} p50 {row['p50_ms']}ms / p95 {row['p95_ms']}ms / p99 {row['p99_ms']}ms")
@@ -0,0 +1,10 @@
+# bench/serve.py
+
+from app.core.loop_lag import loop_lag
+from bench.stats import rss_mb
+from main import app
+
+# main.app에 벤치마크용 측정 엔드포인트만 덧붙임 (이벤트 루프 지연은 앱의 lifespan에서 측정)
+@app.get("/__bench/stats", include_in_schema=False)
+async def bench_stats(reset: bool = False):
+    return {"loop_lag": loop_lag.stats(reset=reset), "rss_mb": rss_mb()}
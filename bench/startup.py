@@ -0,0 +1,119 @@
+# bench/startup.py
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import httpx
+from typing import Dict, List, Optional
+from app.core.embedding_backends import create_encoder
+from bench.load import _free_port
+from bench.micro import build_index
+
+# main을 import하는 것만으로 불러오면 안 되는 무거운 모듈 (워밍업이나 첫 사용 때 불러와야 함)
+HEAVY_MODULES = (
+    "torch", "sentence_transformers", "transformers", "chromadb", "langchain", "langchain_community",
+    "onnxruntime", "tokenizers", "pandas", "tiktoken",
+)
+
+def import_profile(module: str = "main", env: Optional[Dict[str, str]] = None) -> dict:
+    """
+    새 인터프리터에서 python -X importtime으로 module을 불러와 전체 import 시간과
+    최상위 패키지별 누적 시간, 무거운 모듈이 함께 불려왔는지를 반환합니다.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env={**os.environ, **(env or {})}, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{module} import 실패:\n{result.stderr[-2000:]}")
+
+    packages: Dict[str, int] = {}
+    total_us = 0
+    loaded: List[str] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = [part.strip() for part in line[len("import time:"):].split("|")]
+        if not self_us.isdigit():
+            continue
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + int(self_us)
+        loaded.append(name)
+        if name == module:
+            total_us = int(cumulative_us)
+
+    heavy = sorted({name.split(".")[0] for name in loaded if name.split(".")[0] in HEAVY_MODULES})
+    top = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:15]
+    return {
+        "import_seconds": round(total_us / 1e6, 3),
+        "modules": len(loaded),
+        "heavy_modules": heavy,
+        "top_packages_ms": {name: round(us / 1000, 1) for name, us in top},
+    }
+
+def readiness_profile(env: Dict[str, str], port: int, timeout: float = 300) -> dict:
+    """
+    uvicorn으로 main:app을 띄워 /healthz(liveness), /readyz(readiness)가 200이 될 때까지의 시간을 잽니다.
+    """
+    command = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+               "--log-level", "warning"]
+    start = time.perf_counter()
+    process = subprocess.Popen(command, env={**os.environ, **env}, stdout=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    timings = {}
+    try:
+        deadline = time.monotonic() + timeout
+        # lazy 모드는 두 검사가 같은 순간 200이 되므로 둘 다 잴 때까지 반복
+        while len(timings) < 2:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"{timeout}초 안에 준비되지 않았습니다: {timings}")
+            if process.poll() is not None:
+                raise RuntimeError(f"앱 서버가 종료되었습니다 (exit {process.returncode})")
+            for path, key in (("/healthz", "live_seconds"), ("/readyz", "ready_seconds")):
+                if key in timings:
+                    continue
+                try:
+                    if httpx.get(url + path, timeout=1).status_code == 200:
+                        timings[key] = round(time.perf_counter() - start, 3)
+                except httpx.HTTPError:
+                    pass
+            time.sleep(0.05)
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    return timings
+
+def run(csv_filename: str = "dataset_question.csv", embedding_backend: str = "hash", port: int = 0,
+        extra_env: Optional[Dict[str, str]] = None) -> dict:
+    env = {"EMBEDDING_BACKEND": embedding_backend, **(extra_env or {})}
+    with tempfile.TemporaryDirectory(prefix="bench-startup-") as tmp:
+        if embedding_backend == "hash":
+            build_index(tmp, csv_filename, create_encoder("hash"))
+            env.update({"VECTOR_BACKEND": "numpy", "NUMPY_INDEX_DIR": tmp, "EMBED_CACHE_PATH": ""})
+        results = import_profile("main", env)
+        results.update(readiness_profile(env, port or _free_port()))
+    return results
+
+def check_budget(results: dict, import_budget: float, ready_budget: float) -> List[str]:
+    """
+    시작 시간 예산을 넘었거나 무거운 모듈을 import 시점에 불러오면 위반 내용을 반환합니다.
+    """
+    violations = []
+    if import_budget and results["import_seconds"] > import_budget:
+        violations.append(f"import main {results['import_seconds']}초 > 예산 {import_budget}초")
+    if ready_budget and results.get("ready_seconds", 0) > ready_budget:
+        violations.append(f"readiness {results['ready_seconds']}초 > 예산 {ready_budget}초")
+    if results["heavy_modules"]:
+        violations.append(f"import 시점에 무거운 모듈을 불러옴: {', '.join(results['heavy_modules'])}")
+    return violations
+
+def print_results(results: dict):
+    print(f"📦 import main: {results['import_seconds']}초 (모듈 {results['modules']}개)")
+    for name, ms in results["top_packages_ms"].items():
+        print(f"   {name:<24} {ms:>8}ms")
+    print(f"💓 liveness(/healthz): {results.get('live_seconds')}초, readiness(/readyz): {results.get('ready_seconds')}초")
@@ -0,0 +1,109 @@
+# bench/stats.py
+
+import json
+import os
+import platform
+import time
+import numpy as np
+from typing import Dict, List, Optional
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+def summarize(latencies: List[float], errors: int = 0, seconds: Optional[float] = None) -> dict:
+    """
+    지연 시간(초) 목록을 p50/p95/p99(ms), 처리량으로 요약합니다.
+    """
+    values = np.asarray(latencies, dtype=np.float64) * 1000
+    summary = {
+        "count": len(latencies),
+        "errors": errors,
+        "p50_ms": round(float(np.percentile(values, 50)), 2) if len(values) else None,
+        "p95_ms": round(float(np.percentile(values, 95)), 2) if len(values) else None,
+        "p99_ms": round(float(np.percentile(values, 99)), 2) if len(values) else None,
+        "max_ms": round(float(values.max()), 2) if len(values) else None,
+    }
+    if seconds:
+        summary["throughput_rps"] = round(len(latencies) / seconds, 2)
+    return summary
+
+def rss_mb(pid: Optional[int] = None) -> Optional[float]:
+    # /proc이 없는 환경(macOS 등)에서는 None
+    try:
+        with open(f"/proc/{pid or 'self'}/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        return None
+    return None
+
+def save_results(name: str, results: dict, path: Optional[str] = None) -> str:
+    """
+    결과를 baselines/<name>.json(또는 path)에 저장합니다.
+    """
+    path = path or os.path.join(BASELINE_DIR, f"{name}.json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    payload = {
+        "name": name,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    return path
+
+def load_baseline(name: str, path: Optional[str] = None) -> Optional[dict]:
+    path = path or os.path.join(BASELINE_DIR, f"{name}.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+# 값이 클수록 좋은 지표 (그 외 *_ms, *_seconds, *_mb 등은 작을수록 좋음)
+HIGHER_IS_BETTER = ("throughput_rps", "per_second")
+
+def compare(results: dict, baseline: dict, threshold: float = 0.1, prefix: str = "") -> List[str]:
+    """
+    baseline 대비 threshold(기본 10%) 넘게 나빠진 지표를 찾아 설명 문자열 목록으로 반환합니다.
+    """
+    regressions = []
+    for key, value in results.items():
+        base = baseline.get(key)
+        name = f"{prefix}{key}"
+        if key in ("count", "errors", "error_kinds"):
+            continue
+        if isinstance(value, dict) and isinstance(base, dict):
+            regressions.extend(compare(value, base, threshold, prefix=f"{name}."))
+            continue
+        if not isinstance(value, (int, float)) or not isinstance(base, (int, float)) or not base:
+            continue
+        change = (value - base) / abs(base)
+        worse = change < -threshold if key.endswith(HIGHER_IS_BETTER) else change > threshold
+        if worse:
+            regressions.append(f"{name}: {base} → {value} ({change:+.0%})")
+    return regressions
+
+def report_comparison(name: str, results: dict, threshold: float, path: Optional[str] = None) -> bool:
+    """
+    저장된 기준값과 비교해 결과를 출력하고, 회귀가 없으면 True를 반환합니다.
+    """
+    baseline = load_baseline(name, path)
+    if baseline is None:
+        print(f"⚠️ {name} 기준값이 없습니다. --save-baseline으로 먼저 저장해주세요.")
+        return True
+    regressions = compare(results, baseline, threshold)
+    if not regressions:
+        print(f"✅ {name}: 기준값 대비 {threshold:.0%} 넘게 나빠진 지표가 없습니다.")
+        return True
+    print(f"❌ {name}: 기준값 대비 나빠진 지표 {len(regressions)}개")
+    for line in regressions:
+        print(f"   - {line}")
+    return False
+
+def print_table(rows: Dict[str, dict]):
+    columns = ["count", "errors", "p50_ms", "p95_ms", "p99_ms", "max_ms", "throughput_rps", "ttfb_p50_ms", "loop_lag_p99_ms"]
+    width = max([len(name) for name in rows] + [10])
+    print(f"{'':{width}}  " + "  ".join(f"{c:>15}" for c in columns))
+    for name, row in rows.items():
+        print(f"{name:{width}}  " + "  ".join(f"{str(row.get(c, '')):>15}" for c in columns))
@@ -0,0 +1,128 @@
+# bench/stub_upstream.py
+
+import asyncio
+import json
+import random
+import threading
+import time
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+STUB_ANSWER = (
+    "**질문 충실도**: 질문의 핵심 의도를 잘 파악했어요.\n"
+    "**논리적인 흐름**: 서론-본론-결론 구조가 자연스러워요.\n"
+    "**구체성**: 수치와 사례가 있어 설득력이 있어요.\n"
+    "**종합 피드백**: 전반적으로 완성도 높은 답변이에요."
+)
+
+class LatencyModel:
+    """
+    스텁 응답의 지연 시간과 오류 분포입니다.
+    지연은 중앙값 median_ms, 분산 sigma의 로그정규분포이며, tail_rate 비율의 요청은 tail_ms만큼 더 늦게 응답합니다.
+    error_rate 비율은 500, throttle_rate 비율은 429(Retry-After 포함)로 응답합니다.
+    """
+
+    def __init__(self, median_ms: float = 300, sigma: float = 0.5, tail_rate: float = 0.0, tail_ms: float = 0,
+                 error_rate: float = 0.0, throttle_rate: float = 0.0, token_ms: float = 5, seed: int = None):
+        self.median_ms = median_ms
+        self.sigma = sigma
+        self.tail_rate = tail_rate
+        self.tail_ms = tail_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.token_ms = token_ms
+        self._random = random.Random(seed)
+
+    def latency(self) -> float:
+        seconds = self.median_ms / 1000 * self._random.lognormvariate(0, self.sigma)
+        if self._random.random() < self.tail_rate:
+            seconds += self.tail_ms / 1000
+        return seconds
+
+    def outcome(self) -> int:
+        roll = self._random.random()
+        if roll < self.throttle_rate:
+            return 429
+        if roll < self.throttle_rate + self.error_rate:
+            return 500
+        return 200
+
+    def as_dict(self) -> dict:
+        return {
+            "median_ms": self.median_ms, "sigma": self.sigma, "tail_rate": self.tail_rate, "tail_ms": self.tail_ms,
+            "error_rate": self.error_rate, "throttle_rate": self.throttle_rate, "token_ms": self.token_ms,
+        }
+
+def create_stub_app(name: str, model: LatencyModel, answer: str = STUB_ANSWER) -> FastAPI:
+    """
+    OpenAI/Perplexity의 /chat/completions와 같은 형태로 응답하는 스텁 서버입니다.
+    """
+    app = FastAPI(title=f"{name} stub")
+    stats = {"requests": 0, "errors": 0, "throttled": 0, "streams": 0}
+
+    @app.post("/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        stats["requests"] += 1
+        await asyncio.sleep(model.latency())
+
+        status = model.outcome()
+        if status == 429:
+            stats["throttled"] += 1
+            return JSONResponse({"error": {"message": "rate limited"}}, status_code=429, headers={"Retry-After": "1"})
+        if status != 200:
+            stats["errors"] += 1
+            return JSONResponse({"error": {"message": "stub error"}}, status_code=status)
+
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in body.get("messages", []))
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": len(answer), "total_tokens": prompt_tokens + len(answer)}
+        if not body.get("stream"):
+            return {
+                "id": f"stub-{stats['requests']}",
+                "model": body.get("model"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": answer}, "finish_reason": "stop"}],
+                "usage": usage,
+            }
+
+        stats["streams"] += 1
+
+        async def events():
+            for i in range(0, len(answer), 4):
+                chunk = {"choices": [{"index": 0, "delta": {"content": answer[i:i + 4]}}]}
+                yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+                await asyncio.sleep(model.token_ms / 1000)
+            if (body.get("stream_options") or {}).get("include_usage"):
+                yield f"data: {json.dumps({'choices': [], 'usage': usage})}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/stats")
+    async def get_stats():
+        return {"name": name, "model": model.as_dict(), **stats}
+
+    return app
+
+class BackgroundServer:
+    """
+    uvicorn 서버를 별도 스레드의 이벤트 루프에서 실행합니다.
+    """
+
+    def __init__(self, app, port: int, host: str = "127.0.0.1"):
+        self.url = f"http://{host}:{port}"
+        self.server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning", access_log=False))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def start(self, timeout: float = 10) -> "BackgroundServer":
+        self.thread.start()
+        deadline = time.monotonic() + timeout
+        while not self.server.started:
+            if time.monotonic() > deadline or not self.thread.is_alive():
+                raise RuntimeError(f"스텁 서버를 시작하지 못했습니다: {self.url}")
+            time.sleep(0.05)
+        return self
+
+    def stop(self):
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
@@ -1,80 +1,41 @@
 # crolling_question.py
 
-import csv
-import os
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException
-from dotenv import load_dotenv
-
-# .env 불러오기
-load_dotenv()
-
-# .env에서 크롬 드라이버 경로 불러오기
-driver_path = os.getenv("CHROMEDRIVER_PATH")
-
-# WebDriver의 경로 설정
-service = Service(executable_path=driver_path)
-options = webdriver.ChromeOptions()
-driver = webdriver.Chrome(service=service, options=options)
-
-# 출력할 CSV 파일 경로
-output_file = "dataset_question.csv"
-
-# CSV 파일이 이미 존재하는지 확인
-# 파일이 존재하면 데이터가 추가되고, 없으면 새로 생성
-file_exists = os.path.exists(output_file)
-
-# CSV 파일 열기 (쓰기 또는 추가 모드)
-# 파일이 없을 경우 'w' 모드, 파일이 있을 경우 'a' 모드
-with open(output_file, mode="a" if file_exists else "w", newline="", encoding="utf-8") as file:
-    # 데이터를 큰따옴표로 감싸도록 설정
-    writer = csv.writer(file, quotechar='"', quoting=csv.QUOTE_ALL)
-    
-    # CSV 파일이 새로 생성된 경우에만 헤더 추가
-    if not file_exists:
-        writer.writerow(["기업명", "경력", "직무", "질문"])  # CSV 파일의 헤더 작성
-
-    for page_number in range(1, 13):
-
-        # 웹페이지 URL을 동적으로 생성하여 접속
-        web_url = f"https://www.jobkorea.co.kr/starter/Review/view?FavorCo_Stat=0&schTxt=LG&OrderBy=0&Page=1&C_Idx=8&Half_Year_Type_Code=0&Ctgr_Code=5&VPage={page_number}"
-        driver.get(web_url) # 해당 URL로 이동
-
-        # 회사명 크롤링
-        company_name = driver.find_element(By.XPATH, '//*[@id="container"]/div[2]/div[1]/div/h2/strong/a').text
-
-        # 각 질문 항목 크롤링
-        item_index = 1
-        while True:
-            try:
-                # 각 질문의 상세 정보 가져오기
-                # 경력 정보 크롤링 (예: 신입, 경력 등)
-                employment_type = driver.find_element(
-                    By.XPATH, f'//*[@id="container"]/div[2]/div[3]/ul/li[{item_index}]/div/span[1]/span[2]'
-                ).text
-                # 직무 정보 크롤링 (예: 개발, 디자인 등)
-                department = driver.find_element(
-                    By.XPATH, f'//*[@id="container"]/div[2]/div[3]/ul/li[{item_index}]/div/span[2]'
-                ).text
-                # 질문 내용 크롤링
-                question = driver.find_element(
-                    By.XPATH, f'//*[@id="container"]/div[2]/div[3]/ul/li[{item_index}]/div/span[3]'
-                ).text
-
-                # 크롤링된 데이터를 CSV 파일에 작성
-                writer.writerow([company_name, employment_type, department, question])
-                print(f"{company_name},{employment_type},{department},{question}")
-                
-                # 다음 질문 항목으로 이동
-                item_index += 1
-            except NoSuchElementException:
-                # 더 이상 항목이 없으면 반복문 종료
-                break
-
-# WebDriver 종료
-driver.quit()
-
-# 작업 완료 메시지 출력
-print(f"크롤링 완료! 데이터가 '{output_file}'에 저장되었습니다.")
\ No newline at end of file
+import argparse
+from app.core.config import settings
+from app.core.ingest import ingest
+from app.crawler.crawler import crawl, parse_pages
+from app.crawler.fetchers import RecordingFetcher, create_fetcher
+
+# CLI 실행용 (python crolling_question.py) - 크롤링 로직은 app/crawler에 있음
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="잡코리아 면접 질문 크롤링")
+    parser.add_argument("--pages", default="1-12", help='가져올 목록 페이지 (예: "1-12", "1,3,5-7")')
+    parser.add_argument("--output", default="dataset_question.csv")
+    parser.add_argument("--fetcher", choices=["selenium", "http", "fixture"], default=settings.CRAWLER_FETCHER)
+    parser.add_argument("--fixture-dir", default="", help="fixture fetcher가 읽을 HTML 파일 디렉터리")
+    parser.add_argument("--save-html", default="", help="가져온 HTML을 fixture로 저장할 디렉터리")
+    parser.add_argument("--show-browser", action="store_true", help="selenium 브라우저 창을 띄워서 실행")
+    parser.add_argument("--concurrency", type=int, default=settings.CRAWLER_CONCURRENCY)
+    parser.add_argument("--checkpoint", default=settings.CRAWLER_CHECKPOINT_PATH, help="비우면 체크포인트를 쓰지 않음")
+    parser.add_argument("--fresh", action="store_true", help="이전 실행의 체크포인트를 무시하고 모든 페이지를 다시 가져옴")
+    parser.add_argument("--url-template", default=settings.CRAWLER_URL_TEMPLATE, help="{page}가 페이지 번호로 바뀜")
+    parser.add_argument("--no-ingest", action="store_true", help="새 질문을 벡터 저장소에 반영하지 않음")
+    parser.add_argument("--backend", choices=["chroma", "numpy"], default=settings.VECTOR_BACKEND)
+    args = parser.parse_args()
+
+    fetcher = create_fetcher(args.fetcher, fixture_dir=args.fixture_dir, headless=not args.show_browser)
+    if args.save_html:
+        fetcher = RecordingFetcher(fetcher, args.save_html)
+    try:
+        report = crawl(parse_pages(args.pages), fetcher, output_file=args.output, checkpoint_path=args.checkpoint,
+                       concurrency=args.concurrency, url_template=args.url_template, fresh=args.fresh)
+    finally:
+        fetcher.close()
+
+    # 작업 완료 메시지 출력
+    print(f"크롤링 완료! 데이터가 '{args.output}'에 저장되었습니다. {report}")
+
+    # 새 질문만 증분 ingest로 벡터 저장소에 반영
+    if report.written and not args.no_ingest:
+        ingest_report = ingest(csv_filename=args.output, backend=args.backend)
+        print(f"✅ 증분 반영 완료 ({args.backend}). {ingest_report}")
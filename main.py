@@ -1,11 +1,47 @@
 # main.py
 
-from fastapi import FastAPI
-from app.api import perplexity, chroma
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from app.api import perplexity, chroma, health, jobs, metrics
 from app.api.interview import route as interview_route
+from app.core.embedding_executor import EmbeddingQueueFullError
+from app.core.http_client import close_upstreams
+from app.core.jobs import job_manager
+from app.core.loop_lag import loop_lag
+from app.core.startup import startup_state
+from app.core.tracing import TraceMiddleware
+from app.core.vector_utils import get_retrieval_engine
+from app.services.perplexity_service import summary_cache
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 임베딩 모델과 벡터 저장소는 한 번만 로드하여 모든 라우터가 공유
+    # STARTUP_WARMUP=background(기본)이면 서버를 먼저 띄우고 로드가 끝나면 /readyz가 200이 됨
+    engine = get_retrieval_engine()
+    await job_manager.start()
+    loop_lag.start()
+    await startup_state.start(engine)
+    yield
+    await startup_state.wait()
+    await loop_lag.stop()
+    await job_manager.stop()
+    await close_upstreams()
+    summary_cache.close()
+    engine.shutdown()
 
+app = FastAPI(lifespan=lifespan)
+# 요청별 단계 소요 시간 기록 + Server-Timing 헤더
+app.add_middleware(TraceMiddleware)
+
+@app.exception_handler(EmbeddingQueueFullError)
+async def embedding_queue_full_handler(request: Request, exc: EmbeddingQueueFullError):
+    # 임베딩 워커 풀이 밀려 있으면 잠시 후 다시 요청하도록 503 반환
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+app.include_router(health.router)
 app.include_router(perplexity.router, prefix="/perplexity")
 app.include_router(chroma.router, prefix="/chroma")
-app.include_router(interview_route.router, prefix="/interview")
\ No newline at end of file
+app.include_router(interview_route.router, prefix="/interview")
+app.include_router(jobs.router, prefix="/jobs")
+app.include_router(metrics.router, prefix="/metrics")
@@ -0,0 +1,44 @@
+# tests/test_metadata_index.py
+
+import pytest
+from app.core.metadata_index import MetadataIndex
+
+METADATAS = [
+    {"기업명": "현대모비스㈜", "경력": "신입", "직무": "일반면접 - 앱개발자"},
+    {"기업명": "삼성전자㈜", "경력": "경력무관", "직무": "인성면접 - 연구개발"},
+    {"기업명": "엘지전자㈜", "경력": "인턴", "직무": "일반면접"},
+    {"기업명": "(주)카카오", "경력": "신입", "직무": "일반면접 - 웹개발자"},
+    {"기업명": "현대자동차㈜", "경력": "신입", "직무": "임원면접 - R&D(연구개발)"},
+]
+
+@pytest.fixture
+def index():
+    return MetadataIndex(METADATAS)
+
+@pytest.mark.parametrize("name, value, expected", [
+    ("company", "현대모비스", ["현대모비스㈜"]),
+    ("company", "삼성", ["삼성전자㈜"]),
+    ("company", "엘지", ["엘지전자㈜"]),
+    ("company", "LG", ["엘지전자㈜"]),
+    ("company", "카카오", ["(주)카카오"]),
+    ("career", "신입", ["신입"]),
+    ("position", "연구개발", ["인성면접 - 연구개발", "임원면접 - R&D(연구개발)"]),
+])
+def test_resolve(index, name, value, expected):
+    assert sorted(index.resolve(name, value)) == sorted(expected)
+
+def test_company_prefix_matches_every_company(index):
+    assert sorted(index.resolve("company", "현대")) == ["현대모비스㈜", "현대자동차㈜"]
+
+def test_position_substring_inside_word(index):
+    assert sorted(index.resolve("position", "개발자")) == ["일반면접 - 앱개발자", "일반면접 - 웹개발자"]
+
+def test_short_career_label_does_not_match_longer_label(index):
+    assert index.resolve("career", "경력") == []
+
+def test_unresolved_reports_only_filters_without_values(index):
+    assert index.unresolved({"company": "삼성", "career": "경력", "position": ""}) == ["career"]
+
+def test_candidates_intersects_fields(index):
+    assert index.candidates({"company": "현대", "career": "신입"}).tolist() == [0, 4]
+    assert index.candidates(None) is None